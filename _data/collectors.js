@@ -11,6 +11,9 @@
 //   for pages 2+ of the per-collector event feed (STREAM-03). Loaded ONLY when
 //   ELEVENTY_RUN_MODE === 'build' (npm run build / CI deploy); returns [] in serve, watch,
 //   and vitest so HMR stays sub-100ms (Pitfall 6 / RESEARCH Open Q1).
+//   When the pipeline ran with EVENT_PAGES_LAYOUT=sharded, the descriptors come from
+//   collector_event_pages.index.json instead, and each descriptor's `events` is a lazy
+//   getter that parses that collector's collector-event-pages/NNNNN.json on first use.
 //
 // Pitfall #8: this module reads only .json files — never columnar store files —
 // so Eleventy's HMR stays fast. Asserted by src/tests/data-collectors.test.ts.
@@ -40,9 +43,44 @@ const collectorsArray = existsSync(collectorsPath)
 // in CI, so a clean-checkout `npm run build` without S3 must degrade to [] rather
 // than ENOENT-crash.
 const collectorEventPagesPath = join(dataDir, 'collector_event_pages.json');
+const collectorEventPagesIndexPath = join(dataDir, 'collector_event_pages.index.json');
+
+// Sharded layout (collectors_events_export.py, EVENT_PAGES_LAYOUT=sharded): the same
+// {login, page_num, total_pages, events} descriptors, but `events` parses the
+// collector's shard only when a page reads it. Eleventy paginates the array in
+// order, so a collector's pages render back to back and one cached shard is enough
+// to parse each file once while keeping a single collector's history in memory.
+export function loadShardedEventPages(indexPath) {
+  const index = JSON.parse(readFileSync(indexPath, 'utf8'));
+  const shardDir = join(dirname(indexPath), index.dir);
+  let cachedFile = null;
+  let cachedPages = null;
+  const pagesOf = (file) => {
+    if (file !== cachedFile) {
+      cachedPages = JSON.parse(readFileSync(join(shardDir, file), 'utf8'));
+      cachedFile = file;
+    }
+    return cachedPages;
+  };
+  const descriptors = [];
+  for (const { login, total_pages, file } of index.collectors) {
+    for (let page_num = 2; page_num <= total_pages; page_num++) {
+      descriptors.push({
+        login,
+        page_num,
+        total_pages,
+        get events() { return pagesOf(file)[page_num - 2]; },
+      });
+    }
+  }
+  return descriptors;
+}
+
 let collectorEventPages = [];
 if (process.env.ELEVENTY_RUN_MODE === 'build') {
-  if (existsSync(collectorEventPagesPath)) {
+  if (existsSync(collectorEventPagesIndexPath)) {
+    collectorEventPages = loadShardedEventPages(collectorEventPagesIndexPath);
+  } else if (existsSync(collectorEventPagesPath)) {
     collectorEventPages = JSON.parse(readFileSync(collectorEventPagesPath, 'utf8'));
   } else {
     console.warn(`[collectors.js] ${collectorEventPagesPath} absent — returning [] (fetch from S3 for full data)`);
@@ -8,6 +8,8 @@ collector pages can highlight contributed regions via a per-collector CSS
 <style> block without any JavaScript.
 
 County polygons use the species_maps.py moderate tolerance (0.005°).
+Simplified geometry and path strings come through geometry_cache, so a re-run
+against unchanged boundaries skips the simplification.
 
 Outputs (committed to _includes/maps/):
     _includes/maps/counties-base.svg
@@ -49,13 +51,14 @@ Geometry helpers copied from species_maps.py / collector_maps.py rather than
 imported to avoid runtime coupling with those modules.
 """
 
-import json
 import os
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
 import duckdb
+import numpy as np
 
+import geometry_cache
 from config import STATE_FIPS
 
 DB_PATH = os.environ.get("DB_PATH", str(Path(__file__).parent / "beeatlas.duckdb"))
@@ -79,6 +82,7 @@ SVG_HEIGHT = 320
 
 # WA bbox verified live 2026-05-03 (species_maps.py): minlon, minlat, maxlon, maxlat.
 WA_BBOX = (-124.85, 45.54, -116.92, 49.00)
+VIEWPORT = geometry_cache.Viewport(WA_BBOX, SVG_WIDTH, SVG_HEIGHT)
 
 # County simplification tolerance — same as species_maps.py.
 COUNTY_TOLERANCE = 0.005
@@ -113,9 +117,19 @@ def _project(lon: float, lat: float) -> tuple[float, float]:
     return x, y
 
 
+def _project_array(lon: np.ndarray, lat: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """_project over float64 arrays — same operations, bit-identical results."""
+    minx, miny, maxx, maxy = WA_BBOX
+    x = (lon - minx) / (maxx - minx) * SVG_WIDTH
+    y = SVG_HEIGHT - (lat - miny) / (maxy - miny) * SVG_HEIGHT
+    return x, y
+
+
 def _ring_to_path(coords: list[list[float]]) -> str:
     """One GeoJSON LinearRing → SVG path 'd' attribute (closed)."""
-    pts = [_project(lon, lat) for lon, lat in coords]
+    ring = np.asarray(coords, dtype=np.float64)
+    x, y = _project_array(ring[:, 0], ring[:, 1])
+    pts = list(zip(x.tolist(), y.tolist()))
     head = f"M{pts[0][0]:.2f},{pts[0][1]:.2f}"
     tail = "".join(f"L{x:.2f},{y:.2f}" for x, y in pts[1:])
     return head + tail + "Z"
@@ -189,31 +203,29 @@ def build_counties_base(
     root = _make_svg_root()
 
     try:
-        rows = con.execute(
+        shapes = geometry_cache.table_layer(
+            con,
+            "coverage-counties",
             """
-            SELECT name,
-                   ST_AsGeoJSON(
-                       ST_SimplifyPreserveTopology(geom, ?)
-                   )
+            SELECT name, geom
             FROM geographies.us_counties
             WHERE state_fips = ?
             ORDER BY name
             """,
-            [COUNTY_TOLERANCE, STATE_FIPS],
-        ).fetchall()
+            [STATE_FIPS],
+            COUNTY_TOLERANCE,
+            VIEWPORT,
+            _geom_to_d,
+        )
     except Exception as exc:  # noqa: BLE001
         print(
             f"  counties-base: geographies.us_counties unavailable ({exc!r}) "
             "— writing empty backdrop"
         )
-        rows = []
+        shapes = []
 
     written = 0
-    for name, geom_json in rows:
-        if not geom_json:
-            continue
-        geom = json.loads(geom_json)
-        d = _geom_to_d(geom)
+    for name, _geom, d in shapes:
         if not d:
             continue
         ET.SubElement(
@@ -269,32 +281,20 @@ def build_ecoregions_base(
             f"{eco_geojson_path} not found — run dbt build to populate public/data/"
         )
 
-    fc = json.loads(eco_geojson_path.read_text())
+    shapes = geometry_cache.geojson_layer(
+        con,
+        f"coverage-{eco_geojson_path.stem}",
+        eco_geojson_path,
+        name_key,
+        tolerance,
+        VIEWPORT,
+        _geom_to_d,
+    )
     root = _make_svg_root()
 
     written = 0
     skipped = 0
-    for feature in fc["features"]:
-        name = feature["properties"][name_key]
-        geom_json = json.dumps(feature["geometry"])
-
-        try:
-            row = con.execute(
-                "SELECT ST_AsGeoJSON("
-                "  ST_SimplifyPreserveTopology(ST_GeomFromGeoJSON(?), ?)"
-                ")",
-                [geom_json, tolerance],
-            ).fetchone()
-        except Exception:  # noqa: BLE001
-            skipped += 1
-            continue
-
-        if not row or not row[0]:
-            skipped += 1
-            continue
-
-        geom = json.loads(row[0])
-        d = _geom_to_d(geom)
+    for name, _geom, d in shapes:
         if not d:
             skipped += 1
             continue
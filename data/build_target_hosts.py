@@ -36,6 +36,8 @@ from pathlib import Path
 import duckdb
 import requests
 
+from taxa_pipeline import ensure_taxa_store
+
 BURKE_ZIP_URL = "https://burkeherbarium.org/waflora/data/WAFloraChecklist.zip"
 BURKE_HEADERS = {"User-Agent": "BeeAtlas/1.0 (https://github.com/rainhead/beeatlas; data curation)"}
 
@@ -83,10 +85,12 @@ def build() -> None:
     # NOTE: duckdb cannot bind `?` params inside CREATE VIEW/read_csv DDL, so these
     # trusted local paths (constants, no user input) are interpolated directly.
     # iNat backbone: active-taxon name -> taxon_id. lower/trim for case-insensitive join.
+    # Read from the parsed taxonomy store; taxon_id stays VARCHAR to match the
+    # all_varchar Burke/override views it is unioned and joined with.
     con.execute(
-        f"CREATE VIEW inat AS SELECT lower(trim(name)) AS nm, taxon_id, name AS inat_name "
-        f"FROM read_csv('{RAW_TAXA}', delim=chr(9), header=true, all_varchar=true) "
-        f"WHERE lower(active) IN ('t','true')"
+        f"CREATE VIEW inat AS SELECT lower(trim(name)) AS nm, "
+        f"CAST(taxon_id AS VARCHAR) AS taxon_id, name AS inat_name "
+        f"FROM read_parquet('{ensure_taxa_store(RAW_TAXA)}') WHERE active"
     )
     con.execute(
         f"CREATE VIEW waflora AS SELECT * FROM read_csv('{burke / 'waflora.txt'}', "
@@ -18,7 +18,6 @@ Phase 135 Plan 03:
 
 import csv
 import datetime
-import gzip
 import os
 from pathlib import Path
 
@@ -26,6 +25,8 @@ import duckdb
 import pyarrow as pa
 
 from canonical_name import normalize_scientific_name
+from taxa_pipeline import ensure_taxa_store
+from taxon_tree import TaxonTree
 
 def _bulk_insert(
     con: duckdb.DuckDBPyConnection,
@@ -71,10 +72,13 @@ _ANTHOPHILA_ANCESTOR = "630955"
 
 # Module-level cache: loaded once per process, keyed by lowercase species name.
 _TAXA_ANCESTRY: dict[str, dict] | None = None
+# TaxonTree over the cached dict's lineages; rebuilt whenever a different dict
+# object is passed in (tests swap _TAXA_ANCESTRY directly).
+_TAXA_TREE: tuple[dict[str, dict], TaxonTree] | None = None
 
 
 def _load_taxa_ancestry() -> dict[str, dict]:
-    """Load species-rank active Anthophila taxa from taxa.csv.gz into a dict.
+    """Load species-rank active Anthophila taxa from the parsed taxonomy store.
 
     Returns: dict mapping lowercase species name -> {taxon_id: int, ancestry: str}
     Loaded once and cached in _TAXA_ANCESTRY.
@@ -86,24 +90,20 @@ def _load_taxa_ancestry() -> dict[str, dict]:
     if not TAXA_PATH.exists():
         _TAXA_ANCESTRY = result
         return result
-    anthophila_marker = f"/{_ANTHOPHILA_ANCESTOR}/"
-    with gzip.open(str(TAXA_PATH), "rt", newline="") as f:
-        reader = csv.reader(f, delimiter="\t")
-        next(reader)  # skip header
-        for row in reader:
-            if len(row) < 6:
-                continue
-            taxon_id, ancestry, _rank_level, rank, name, active = row[:6]
-            if active != "true":
-                continue
-            if rank not in ("species", "subspecies"):
-                continue
-            if anthophila_marker not in (ancestry + "/"):
-                continue
-            result[name.lower()] = {
-                "taxon_id": int(taxon_id),
-                "ancestry": ancestry,
-            }
+    # is_anthophila also admits 630955 itself, but that row is never species rank,
+    # so this is the old '/630955/' in (ancestry + '/') test.
+    with duckdb.connect(":memory:") as con:
+        rows = con.execute(
+            """
+            SELECT lower(name), taxon_id, ancestry
+            FROM read_parquet(?)
+            WHERE active AND is_anthophila AND rank IN ('species', 'subspecies')
+            ORDER BY taxon_id, rank_level
+            """,
+            [str(ensure_taxa_store(TAXA_PATH))],
+        ).fetchall()
+    for name, taxon_id, ancestry in rows:
+        result[name] = {"taxon_id": taxon_id, "ancestry": ancestry}
     _TAXA_ANCESTRY = result
     return result
 
@@ -111,22 +111,17 @@ def _load_taxa_ancestry() -> dict[str, dict]:
 def _compute_lca(name1: str, name2: str, taxa: dict[str, dict]) -> int | None:
     """Compute LCA taxon_id for two lowercase species canonical names.
 
-    Uses the slash-delimited ancestry path from taxa.csv.gz. LCA is the
-    last common node when traversing both paths in parallel (RCN-05).
+    The taxa dict's ancestry paths are parsed once into a TaxonTree; the LCA
+    is then a binary-lifting query rather than a zip over split strings (RCN-05).
     """
+    global _TAXA_TREE
     r1 = taxa.get(name1)
     r2 = taxa.get(name2)
     if r1 is None or r2 is None:
         return None
-    path1 = (r1["ancestry"] + "/" + str(r1["taxon_id"])).split("/")
-    path2 = (r2["ancestry"] + "/" + str(r2["taxon_id"])).split("/")
-    lca = None
-    for a, b in zip(path1, path2):
-        if a == b:
-            lca = a
-        else:
-            break
-    return int(lca) if lca else None
+    if _TAXA_TREE is None or _TAXA_TREE[0] is not taxa:
+        _TAXA_TREE = (taxa, TaxonTree.from_ancestry_map(taxa))
+    return _TAXA_TREE[1].lca(r1["taxon_id"], r2["taxon_id"])
 
 
 def _lca_canonical_name(lca_taxon_id: int, taxa: dict[str, dict]) -> str | None:
@@ -185,23 +180,16 @@ def _slash_canonical_name(verbatim_name: str) -> str | None:
     if lca_name:
         return lca_name
 
-    # LCA is a higher-rank node (not species-rank) — need to load all ranks.
-    # Re-scan taxa.csv.gz for the exact taxon_id at any rank.
+    # LCA is a higher-rank node (not species-rank) — look up the exact taxon_id at
+    # any rank. The store is sorted by taxon_id, so this is a pruned point lookup.
     if not TAXA_PATH.exists():
         return None
-    with gzip.open(str(TAXA_PATH), "rt", newline="") as f:
-        reader = csv.reader(f, delimiter="\t")
-        next(reader)  # skip header
-        for row in reader:
-            if len(row) < 5:
-                continue
-            taxon_id_str, _ancestry, _rank_level, _rank, name = row[:5]
-            try:
-                if int(taxon_id_str) == lca_id:
-                    return name.lower()
-            except ValueError:
-                pass
-    return None
+    with duckdb.connect(":memory:") as con:
+        row = con.execute(
+            "SELECT name FROM read_parquet(?) WHERE taxon_id = ? ORDER BY rank_level LIMIT 1",
+            [str(ensure_taxa_store(TAXA_PATH)), lca_id],
+        ).fetchone()
+    return row[0].lower() if row else None
 
 
 # Tight WA bounding box: no padding for border records.
@@ -9,6 +9,29 @@ Writes:
                                           artifact has exactly one producer.
     ASSETS_DIR/collector_event_pages.json — flat array of sub-page descriptors for
                                           pages 2+ (compact JSON, ~24 MB build artifact)
+                                          — the default "flat" EVENT_PAGES_LAYOUT
+    or, under EVENT_PAGES_LAYOUT=sharded:
+    ASSETS_DIR/collector_event_pages.index.json — {"format", "dir", "collectors":
+                                          [{login, total_pages, file}]} for every
+                                          collector with a page 2
+    ASSETS_DIR/collector-event-pages/NNNNN.json — one compact file per collector:
+                                          the event arrays of its pages 2..N, in order
+
+The sharded layout exists for the 11ty build: _data/collectors.js reads the small
+index, builds the same {login, page_num, total_pages, events} descriptors, and
+parses a collector's file only when one of that collector's pages renders, so
+build memory and parse time follow the page being rendered rather than the
+whole atlas's event history. Files are numbered in login order (the index is the
+only login -> file mapping; no login ever becomes a path). Each layout removes
+the other's outputs, so the loader never sees a stale mix.
+
+"flat" is the default, and nothing in the nightly or CI selects "sharded": the
+nightly's build memory is unchanged until it does. collector_event_pages.json is
+the output the Stelis task graph declares for this step (and the artifacts.toml
+entry), and with "sharded" that file is removed, so the switch needs the graph
+to declare the index and collector-event-pages/ first (the nightly's stelis gate
+checks that mapping against this repo). Until then, run with
+EVENT_PAGES_LAYOUT=sharded locally.
 
 Runs AFTER collectors-export: reads the base collectors.json written by that step
 (without mutating it) and writes the enriched result to collectors.events.json.
@@ -44,11 +67,15 @@ Usage:
 import csv
 import json
 import os
+import shutil
 from pathlib import Path
 from urllib.parse import quote
 
 import duckdb
 
+from export_context import occurrences_source
+from json_stream import write_json
+
 DB_PATH = os.environ.get("DB_PATH", str(Path(__file__).parent / "beeatlas.duckdb"))
 _default_assets = str(Path(__file__).parent.parent / "public" / "data")
 ASSETS_DIR = Path(os.environ.get("EXPORT_DIR", _default_assets))
@@ -57,6 +84,14 @@ ASSETS_DIR = Path(os.environ.get("EXPORT_DIR", _default_assets))
 # Override via EVENT_CHUNK_SIZE env var for testing deterministic pagination.
 CHUNK_SIZE = int(os.environ.get("EVENT_CHUNK_SIZE", "100"))
 
+# Pages 2+ layout: "flat" (one descriptor array) or "sharded" (index + one file
+# per collector). See the module docstring.
+EVENT_PAGES_LAYOUT = os.environ.get("EVENT_PAGES_LAYOUT", "flat")
+EVENT_PAGES_FILE = "collector_event_pages.json"
+EVENT_PAGES_INDEX = "collector_event_pages.index.json"
+EVENT_PAGES_DIR = "collector-event-pages"
+EVENT_PAGES_INDEX_FORMAT = 1
+
 # Phase 123 taxon synonym seed (texanus → subtilior, etc.)
 _SYNONYMS_CSV = Path(__file__).parent / "dbt" / "seeds" / "occurrence_synonyms.csv"
 
@@ -74,7 +109,7 @@ WITH collector_specimens AS (
         record_type,
         canonical_name,
         catalog_number
-    FROM read_parquet(?)
+    FROM {occ}
     WHERE collector_inat_login IS NOT NULL
       AND (ecdysis_id IS NOT NULL OR record_type = 'waba_specimen')
 ),
@@ -289,13 +324,21 @@ def _resolve_slug(
 # ---------------------------------------------------------------------------
 
 
-def export_collector_events(con: duckdb.DuckDBPyConnection) -> None:
-    """Write collectors.events.json (base + event-feed fields) and collector_event_pages.json.
+def export_collector_events(
+    con: duckdb.DuckDBPyConnection, layout: str | None = None
+) -> None:
+    """Write collectors.events.json (base + event-feed fields) and the pages 2+ output.
 
     Reads ASSETS_DIR/occurrences.parquet (Pitfall 5: always ASSETS_DIR, not the
     dbt build target) and ASSETS_DIR/species.parquet for slug resolution, plus
     ecdysis_data.identifications from the open DuckDB connection.
+
+    layout: "flat" (collector_event_pages.json) or "sharded" (index + per-collector
+    files); defaults to EVENT_PAGES_LAYOUT.
     """
+    layout = layout or EVENT_PAGES_LAYOUT
+    if layout not in ("flat", "sharded"):
+        raise ValueError(f"unknown EVENT_PAGES_LAYOUT {layout!r} (expected 'flat' or 'sharded')")
     ASSETS_DIR.mkdir(parents=True, exist_ok=True)
 
     occ_parquet = ASSETS_DIR / "occurrences.parquet"
@@ -328,8 +371,8 @@ def export_collector_events(con: duckdb.DuckDBPyConnection) -> None:
 
     # Single batch query: all WABA collectors' events in one pass (Pattern 3).
     # The query JOINs ecdysis_data.identifications (live duckdb) with
-    # read_parquet(occurrences.parquet), so the connection must be open.
-    rows = con.execute(_QUERY, [str(occ_parquet)]).fetchall()
+    # occurrences.parquet, so the connection must be open.
+    rows = con.execute(_QUERY.format(occ=occurrences_source(con, occ_parquet))).fetchall()
 
     # Pass 1: find the earliest sort_ts for each (login, ecdysis_id) pair among
     # Identified events. This determines which determination was first chronologically
@@ -407,7 +450,8 @@ def export_collector_events(con: duckdb.DuckDBPyConnection) -> None:
     collectors: list[dict] = json.loads(collectors_json.read_text(encoding="utf-8"))
     collector_map: dict[str, dict] = {c["login"]: c for c in collectors}
 
-    sub_page_descriptors: list[dict] = []
+    # login -> (total_pages, [events of page 2, page 3, ...]), in login order.
+    later_pages: dict[str, tuple[int, list[list[dict]]]] = {}
     for login, events in events_by_login.items():
         chunks = [events[i : i + CHUNK_SIZE] for i in range(0, len(events), CHUNK_SIZE)]
         total_pages = len(chunks)
@@ -416,14 +460,9 @@ def export_collector_events(con: duckdb.DuckDBPyConnection) -> None:
             rec["first_page_events"] = chunks[0] if chunks else []
             rec["total_event_pages"] = total_pages
             rec["total_event_count"] = len(events)
-        # Pages 2+ go into the flat sub-page descriptor array (D-PAGE-01)
-        for page_num, chunk in enumerate(chunks[1:], start=2):
-            sub_page_descriptors.append({
-                "login": login,
-                "page_num": page_num,
-                "total_pages": total_pages,
-                "events": chunk,
-            })
+        # Pages 2+ are written separately (D-PAGE-01), in EVENT_PAGES_LAYOUT
+        if total_pages > 1:
+            later_pages[login] = (total_pages, chunks[1:])
 
     # Collectors with zero events (sample-host-only, D-EMPTY) get empty defaults
     for rec in collectors:
@@ -435,18 +474,65 @@ def export_collector_events(con: duckdb.DuckDBPyConnection) -> None:
     # collectors.json is left untouched, owned solely by collectors-export.
     # Human-readable indent matches the base file's style.
     out_path = ASSETS_DIR / "collectors.events.json"
-    out_path.write_text(json.dumps(collectors, indent=2), encoding="utf-8")
+    write_json(out_path, collectors, indent=2)
     print(  # noqa: T201
         f"  collectors.events.json: {len(collectors):,} collectors, "
         f"{out_path.stat().st_size:,} bytes"
     )
 
-    # Write collector_event_pages.json (compact — keeps the ~24 MB file smaller)
-    out_path2 = ASSETS_DIR / "collector_event_pages.json"
-    out_path2.write_text(json.dumps(sub_page_descriptors), encoding="utf-8")
+    _write_event_pages(ASSETS_DIR, later_pages, layout)
+
+
+def _write_event_pages(
+    assets_dir: Path,
+    later_pages: dict[str, tuple[int, list[list[dict]]]],
+    layout: str,
+) -> None:
+    """Write pages 2+ in the given layout and remove the other layout's files."""
+    flat_path = assets_dir / EVENT_PAGES_FILE
+    index_path = assets_dir / EVENT_PAGES_INDEX
+    shard_dir = assets_dir / EVENT_PAGES_DIR
+
+    if layout == "flat":
+        index_path.unlink(missing_ok=True)
+        if shard_dir.exists():
+            shutil.rmtree(shard_dir)
+        sub_page_descriptors = (
+            {"login": login, "page_num": page_num, "total_pages": total_pages, "events": chunk}
+            for login, (total_pages, chunks) in later_pages.items()
+            for page_num, chunk in enumerate(chunks, start=2)
+        )
+        # Streamed one descriptor at a time; json.dumps' default separators, as before
+        write_json(flat_path, sub_page_descriptors)
+        sub_pages = sum(total_pages - 1 for total_pages, _chunks in later_pages.values())
+        print(  # noqa: T201
+            f"  {EVENT_PAGES_FILE}: {sub_pages:,} sub-pages, "
+            f"{flat_path.stat().st_size:,} bytes"
+        )
+        return
+
+    flat_path.unlink(missing_ok=True)
+    # Wipe-and-rewrite: a collector who lost their page 2 must not leave a shard.
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    shard_dir.mkdir(parents=True)
+    collectors = []
+    total_bytes = 0
+    for i, (login, (total_pages, chunks)) in enumerate(later_pages.items()):
+        name = f"{i:05d}.json"
+        shard = shard_dir / name
+        write_json(shard, chunks)
+        total_bytes += shard.stat().st_size
+        collectors.append({"login": login, "total_pages": total_pages, "file": name})
+    index_path.write_text(json.dumps({
+        "format": EVENT_PAGES_INDEX_FORMAT,
+        "dir": EVENT_PAGES_DIR,
+        "collectors": collectors,
+    }), encoding="utf-8")
+    sub_pages = sum(c["total_pages"] - 1 for c in collectors)
     print(  # noqa: T201
-        f"  collector_event_pages.json: {len(sub_page_descriptors):,} sub-pages, "
-        f"{out_path2.stat().st_size:,} bytes"
+        f"  {EVENT_PAGES_DIR}/: {sub_pages:,} sub-pages in {len(collectors):,} collector files, "
+        f"{total_bytes:,} bytes (+ {EVENT_PAGES_INDEX}, {index_path.stat().st_size:,} bytes)"
     )
 
 
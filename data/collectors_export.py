@@ -26,7 +26,6 @@ Usage:
     cd data && uv run python collectors_export.py
 """
 
-import json
 import os
 from collections import defaultdict
 from pathlib import Path
@@ -34,6 +33,8 @@ from pathlib import Path
 import duckdb
 
 from domain import slugify
+from export_context import occurrences_source, parquet_source
+from json_stream import write_json
 
 
 DB_PATH = os.environ.get("DB_PATH", str(Path(__file__).parent / "beeatlas.duckdb"))
@@ -83,8 +84,8 @@ _QUERY = """
         SUM(CASE WHEN (o.ecdysis_id IS NOT NULL OR o.record_type = 'waba_specimen')
                       AND sp.specific_epithet IS NULL
                  THEN 1 ELSE 0 END)                                    AS status_awaiting
-    FROM read_parquet(?) o
-    LEFT JOIN read_parquet(?) sp ON sp.taxon_id = o.taxon_id
+    FROM {occ} o
+    LEFT JOIN {species} sp ON sp.taxon_id = o.taxon_id
     WHERE o.collector_inat_login IS NOT NULL
       AND (o.ecdysis_id IS NOT NULL OR o.record_type IN ('waba_specimen', 'provisional_sample'))
     GROUP BY o.collector_inat_login
@@ -107,7 +108,7 @@ _ACCOM_QUERY = """
         list_sort(array_agg(DISTINCT o.county) FILTER (WHERE o.county IS NOT NULL))
                                                                             AS county_names,
         COUNT(DISTINCT o.county) FILTER (WHERE o.county IS NOT NULL)        AS county_count
-    FROM read_parquet(?) o
+    FROM {occ} o
     WHERE o.collector_inat_login IS NOT NULL
       AND o.tier = 'atlas'
     GROUP BY o.collector_inat_login
@@ -130,27 +131,15 @@ _ACCOM_QUERY = """
 # "name" property. They come from the same upstream, but nothing enforces it at
 # build time — a mismatch highlights nothing and looks like "no coverage".
 #
-# The occ_id CASE mirrors occIdFromRow (src/occurrence.ts) and the copies in
-# places_export.py / places_maps.py / marts/occurrence_places.sql. Copied rather
-# than imported, per this package's convention of avoiding runtime coupling
-# between export modules; the priority order is what must stay in step.
+# o.occ_id is the Option-B identity the occurrences mart materializes (dbt
+# macros/occ_id.sql, mirroring occIdFromRow in src/occurrence.ts).
 _ECOREGION_L4_QUERY = """
-    WITH occ AS (
-        SELECT *,
-            CASE
-                WHEN ecdysis_id IS NOT NULL THEN 'ecdysis:' || ecdysis_id
-                WHEN observation_id IS NOT NULL THEN 'inat:' || observation_id
-                WHEN specimen_observation_id IS NOT NULL THEN 'inat_obs:' || specimen_observation_id
-                WHEN checklist_id IS NOT NULL THEN 'checklist:' || checklist_id
-            END AS occ_id
-        FROM read_parquet(?)
-    )
     SELECT
         o.collector_inat_login                                              AS login,
         list_sort(array_agg(DISTINCT p.name))                               AS ecoregion_l4_names,
         COUNT(DISTINCT p.slug)                                              AS ecoregion_l4_count
-    FROM occ o
-    JOIN read_parquet(?) op ON op.occ_id = o.occ_id
+    FROM {occ} o
+    JOIN {bridge} op ON op.occ_id = o.occ_id
     JOIN geographies.places p
       ON p.slug = op.place_slug
      AND p.kind = 'ecoregion_l4'
@@ -172,8 +161,8 @@ _SPECIES_QUERY = """
         sp.scientificName,
         sp.slug,
         COUNT(*)                                                          AS occ_count
-    FROM read_parquet(?) o
-    LEFT JOIN read_parquet(?) sp ON sp.taxon_id = o.taxon_id
+    FROM {occ} o
+    LEFT JOIN {species} sp ON sp.taxon_id = o.taxon_id
     WHERE o.collector_inat_login IS NOT NULL
       AND o.tier = 'atlas'
       AND sp.specific_epithet IS NOT NULL
@@ -225,10 +214,14 @@ def export_collectors(con: duckdb.DuckDBPyConnection | None = None) -> None:
                 "(Level IV ecoregion coverage reads the occurrence_places bridge)"
             )
 
-        rows = con.execute(
-            _QUERY,
-            [str(occ_parquet), str(species_parquet)],
-        ).fetchall()
+        # Scans of the three inputs; occurrences always carries occ_id
+        # (export_context.py).
+        sources = {
+            "occ": occurrences_source(con, occ_parquet),
+            "species": parquet_source(con, species_parquet),
+            "bridge": parquet_source(con, bridge_parquet),
+        }
+        rows = con.execute(_QUERY.format(**sources)).fetchall()
 
         records = []
         for row in rows:
@@ -266,10 +259,7 @@ def export_collectors(con: duckdb.DuckDBPyConnection | None = None) -> None:
             "county_names": [],
             "county_count": 0,
         }
-        accom_rows = con.execute(
-            _ACCOM_QUERY,
-            [str(occ_parquet)],
-        ).fetchall()
+        accom_rows = con.execute(_ACCOM_QUERY.format(**sources)).fetchall()
         accom_by_login: dict[str, dict] = {}
         for row in accom_rows:
             (
@@ -289,10 +279,7 @@ def export_collectors(con: duckdb.DuckDBPyConnection | None = None) -> None:
         # occurrence_places bridge, not the occurrences columns (see the comment
         # on _ECOREGION_L4_QUERY). A collector with no bridge row gets the empty
         # default and the template omits their ecoregion map entirely.
-        eco_rows = con.execute(
-            _ECOREGION_L4_QUERY,
-            [str(occ_parquet), str(bridge_parquet)],
-        ).fetchall()
+        eco_rows = con.execute(_ECOREGION_L4_QUERY.format(**sources)).fetchall()
         eco_by_login = {
             login_eco: {
                 "ecoregion_l4_names": list(names) if names is not None else [],
@@ -311,10 +298,7 @@ def export_collectors(con: duckdb.DuckDBPyConnection | None = None) -> None:
         # SQL ORDER BY login, genus, scientificName ensures insertion order is correct;
         # sorted() on genus_dict makes genera alphabetical.
         # count = the collector's atlas records of that species; rendered "N specimens".
-        species_rows = con.execute(
-            _SPECIES_QUERY,
-            [str(occ_parquet), str(species_parquet)],
-        ).fetchall()
+        species_rows = con.execute(_SPECIES_QUERY.format(**sources)).fetchall()
 
         species_by_login: dict[str, dict[str, list]] = defaultdict(lambda: defaultdict(list))
         for login_sp, genus, scientific_name, slug, occ_count in species_rows:
@@ -335,7 +319,7 @@ def export_collectors(con: duckdb.DuckDBPyConnection | None = None) -> None:
             ]
 
         out_path = ASSETS_DIR / "collectors.json"
-        out_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+        write_json(out_path, records, indent=2)
         print(  # noqa: T201
             f"  collectors.json: {len(records):,} collectors, "
             f"{out_path.stat().st_size:,} bytes"
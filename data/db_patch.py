@@ -0,0 +1,305 @@
+"""Delta patches between two published occurrences.db files.
+
+Every nightly ships a complete occurrences.db, so a returning client re-downloads
+the whole database when a handful of rows changed. This module diffs the last
+published DB against tonight's and writes a small patch a client can apply to
+its cached copy instead, plus a chain index of recent patches.
+
+Usage (standalone, nightly.sh step 4b):
+    cd data && uv run python db_patch.py --previous <published.db> --current <new.db>
+
+Patch format — itself a SQLite file, so wa-sqlite can ATTACH it:
+
+  patch_meta(key, value)     format_version, from_digest, to_digest, and
+                             per-table change counts (<table>.deleted_keys /
+                             <table>.upserted_rows)
+  <table>__delete(key)       group keys whose rows are removed or replaced
+  <table>__upsert(...)       the new rows of every added or changed group,
+                             same columns as <table>
+
+for each PATCHED_TABLES table. Rows are grouped by a key (occurrences by the
+Option-B occ_id; the bridge by occ_id; taxa by taxon_id); a group whose row
+multiset differs in any way is deleted whole and re-inserted, which keeps
+duplicate mart rows and many-to-many bridge rows exact without a per-row key.
+
+Applying = for each table, DELETE rows whose key is in <table>__delete, INSERT
+<table>__upsert, and check the result. Physical row order differs from a fresh
+export, so "reproduces the new DB" is checked by sqlite_export.content_digest(),
+an order-independent digest over the patched tables only: verify_patch()
+applies a patch to a scratch copy and demands the digest land on to_digest.
+
+The derived tables (taxon_ancestors, geo_blob, geo_blob_bin, occurrences_rtree,
+search_fts, facet_counts, db_meta) are NOT in the patch and NOT in the digest:
+they are functions of the base tables, and the applier rebuilds them. This
+module does so with the same builders sqlite_export uses; a client-side applier
+rebuilds the ones it reads with its own code (or drops them), and still lands on
+to_digest.
+
+A schema change (any column added, dropped or retyped in a patched table) is not
+patchable; build_patch raises PatchError and clients take the full download.
+"""
+
+import argparse
+import json
+import shutil
+import sqlite3 as _sqlite3
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+import sqlite_export
+from export_context import OCC_ID_SQL
+from sqlite_export import content_digest
+
+PATCH_FORMAT_VERSION = 1
+
+# SQLite occurrences does not carry occ_id, so derive the group key; '' keeps a
+# row with no source id in a group of its own rather than a NULL key.
+_OCC_ID_SQL = f"COALESCE({OCC_ID_SQL}, '')"
+
+# table -> SQL expression of the group key. Order is apply order.
+PATCHED_TABLES: dict[str, str] = {
+    "occurrences": _OCC_ID_SQL,
+    "occurrence_places": "occ_id",
+    "taxa": "CAST(taxon_id AS TEXT)",
+}
+
+# Derived table -> its sqlite_export builder, in generate_sqlite's build order.
+# Outside the digest (see the
+# module docstring), so their output need not match any other applier's.
+_DERIVED_BUILDERS = {
+    "taxon_ancestors": sqlite_export._build_taxon_ancestors,
+    "geo_blob": sqlite_export._write_geo_blobs,
+    "geo_blob_bin": sqlite_export._write_geo_blob_bin,
+    "occurrences_rtree": sqlite_export._build_occurrences_rtree,
+    "search_fts": sqlite_export._build_search_fts,
+    "facet_counts": sqlite_export._build_facet_tables,
+}
+
+# Chain index written beside the patch files; newest patch last.
+CHAIN_INDEX = "index.json"
+
+
+class PatchError(ValueError):
+    """A patch cannot be built, applied, or did not reproduce its target."""
+
+
+def _columns(con: _sqlite3.Connection, schema: str, table: str) -> list[tuple[str, str]]:
+    return [(r[1], r[2]) for r in con.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _groups(con: _sqlite3.Connection, schema: str, table: str, key_sql: str, cols: list[str]) -> dict:
+    """key -> sorted list of row tuples, for one table of one attached DB."""
+    col_list = ", ".join(f'"{c}"' for c in cols)
+    groups: dict[str, list[tuple]] = defaultdict(list)
+    for key, *row in con.execute(f"SELECT {key_sql}, {col_list} FROM {schema}.{table}"):
+        groups[key].append(tuple(row))
+    for rows in groups.values():
+        rows.sort(key=repr)
+    return groups
+
+
+def build_patch(old_db: Path, new_db: Path, patch_path: Path) -> dict:
+    """Write the patch taking old_db's content to new_db's; return patch_meta as a dict."""
+    if patch_path.exists():
+        patch_path.unlink()
+    meta: dict[str, str] = {
+        "format_version": str(PATCH_FORMAT_VERSION),
+        "from_digest": content_digest(old_db),
+        "to_digest": content_digest(new_db),
+    }
+    con = _sqlite3.connect(patch_path)
+    try:
+        con.execute(f"ATTACH DATABASE '{old_db}' AS old")
+        con.execute(f"ATTACH DATABASE '{new_db}' AS new")
+        for table, key_sql in PATCHED_TABLES.items():
+            old_cols = _columns(con, "old", table)
+            new_cols = _columns(con, "new", table)
+            if old_cols != new_cols:
+                raise PatchError(
+                    f"{table}: schema changed ({old_cols} -> {new_cols}); not patchable"
+                )
+            names = [c for c, _t in new_cols]
+            old_groups = _groups(con, "old", table, key_sql, names)
+            new_groups = _groups(con, "new", table, key_sql, names)
+            deleted = sorted(
+                k for k, rows in old_groups.items() if new_groups.get(k) != rows
+            )
+            upserts = [
+                row
+                for k in sorted(new_groups)
+                if old_groups.get(k) != new_groups[k]
+                for row in new_groups[k]
+            ]
+            col_defs = ", ".join(f'"{c}" {t}' for c, t in new_cols)
+            con.execute(f"CREATE TABLE {table}__delete(key TEXT PRIMARY KEY)")
+            con.execute(f"CREATE TABLE {table}__upsert({col_defs})")
+            con.executemany(f"INSERT INTO {table}__delete VALUES (?)", [(k,) for k in deleted])
+            con.executemany(
+                f"INSERT INTO {table}__upsert VALUES ({', '.join('?' for _ in names)})", upserts
+            )
+            meta[f"{table}.deleted_keys"] = str(len(deleted))
+            meta[f"{table}.upserted_rows"] = str(len(upserts))
+        con.execute("CREATE TABLE patch_meta(key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        con.executemany("INSERT INTO patch_meta VALUES (?, ?)", sorted(meta.items()))
+        con.commit()
+        con.execute("DETACH DATABASE old")
+        con.execute("DETACH DATABASE new")
+        con.execute("VACUUM")
+    except BaseException:
+        con.close()
+        patch_path.unlink(missing_ok=True)
+        raise
+    con.close()
+    return meta
+
+
+def read_patch_meta(patch_path: Path) -> dict[str, str]:
+    with _sqlite3.connect(patch_path) as con:
+        return dict(con.execute("SELECT key, value FROM patch_meta").fetchall())
+
+
+def apply_patch(db_path: Path, patch_path: Path) -> None:
+    """Apply a patch to db_path in place and rebuild its derived tables.
+
+    Raises PatchError (leaving db_path untouched) if db_path is not the patch's
+    from_digest; and if a derived-table builder fails (its ValueError, e.g. the
+    facet consistency gate, is re-raised as PatchError) or the patched file does
+    not digest to to_digest — in those cases db_path is left in its patched state
+    and must be discarded.
+    """
+    meta = read_patch_meta(patch_path)
+    if meta.get("format_version") != str(PATCH_FORMAT_VERSION):
+        raise PatchError(f"unsupported patch format {meta.get('format_version')!r}")
+    if content_digest(db_path) != meta["from_digest"]:
+        raise PatchError(f"{db_path} is not this patch's base ({meta['from_digest'][:12]})")
+
+    with _sqlite3.connect(db_path) as con:
+        con.execute(f"ATTACH DATABASE '{patch_path}' AS patch")
+        for table, key_sql in PATCHED_TABLES.items():
+            con.execute(
+                f"DELETE FROM {table} WHERE {key_sql} IN (SELECT key FROM patch.{table}__delete)"
+            )
+            col_list = ", ".join(f'"{c}"' for c, _t in _columns(con, "patch", f"{table}__upsert"))
+            con.execute(
+                f"INSERT INTO {table}({col_list}) SELECT {col_list} FROM patch.{table}__upsert"
+            )
+        con.commit()
+        con.execute("DETACH DATABASE patch")
+        present = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for derived in _DERIVED_BUILDERS:
+            con.execute(f"DROP TABLE IF EXISTS {derived}")
+
+    # Rebuild what the file had, with the same builders in generate_sqlite's order.
+    for derived, builder in _DERIVED_BUILDERS.items():
+        if derived in present:
+            try:
+                builder(db_path)
+            except ValueError as e:
+                raise PatchError(f"patched {db_path}: rebuilding {derived} failed: {e}") from e
+    sqlite_export._write_db_meta(db_path)
+
+    got = content_digest(db_path)
+    if got != meta["to_digest"]:
+        raise PatchError(
+            f"patched {db_path} digests to {got[:12]}, expected {meta['to_digest'][:12]}"
+        )
+
+
+def verify_patch(old_db: Path, patch_path: Path, new_db: Path) -> None:
+    """Apply patch_path to a scratch copy of old_db and check it reproduces new_db.
+
+    Raises PatchError on any mismatch; returns None when the patched copy's
+    content_digest equals both the patch's to_digest and new_db's own digest.
+    """
+    meta = read_patch_meta(patch_path)
+    if content_digest(new_db) != meta["to_digest"]:
+        raise PatchError(f"patch target {meta['to_digest'][:12]} is not {new_db}")
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch = Path(tmp) / "occurrences.db"
+        shutil.copyfile(old_db, scratch)
+        apply_patch(scratch, patch_path)
+
+
+def update_patch_chain(previous_db: Path, current_db: Path, out_dir: Path, keep: int = 7) -> dict:
+    """Add tonight's verified patch to out_dir and rewrite the chain index.
+
+    index.json = {"current": <digest>, "patches": [{"from", "to", "file",
+    "bytes"}, ...]} with the newest patch last and at most `keep` entries.
+    A client holding digest D follows entries from the one whose "from" is D;
+    if none matches (too old, or a schema change broke the chain) it takes the
+    full download. A nightly with no content change adds no patch. Files that
+    fall off the end of the chain are deleted.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_path = out_dir / CHAIN_INDEX
+    chain = json.loads(index_path.read_text()) if index_path.exists() else {"patches": []}
+    patches: list[dict] = chain.get("patches", [])
+
+    to_digest = content_digest(current_db)
+    from_digest = content_digest(previous_db)
+    if from_digest != to_digest:
+        name = f"occurrences-{from_digest[:12]}-{to_digest[:12]}.patch.db"
+        patch_path = out_dir / name
+        tmp_path = out_dir / f".{name}.tmp"
+        try:
+            build_patch(previous_db, current_db, tmp_path)
+            verify_patch(previous_db, tmp_path, current_db)
+        except PatchError as e:
+            # Unpatchable (schema change): the chain restarts at tonight's DB.
+            tmp_path.unlink(missing_ok=True)
+            print(f"WARNING: no delta patch tonight, chain reset: {e}")  # noqa: T201
+            patches = []
+        else:
+            tmp_path.replace(patch_path)
+            patches = [p for p in patches if p["file"] != name]
+            patches.append({
+                "from": from_digest,
+                "to": to_digest,
+                "file": name,
+                "bytes": patch_path.stat().st_size,
+            })
+    # Keep only the unbroken run of entries that ends at tonight's DB: a publish
+    # that skipped this step leaves a gap no client can cross.
+    if patches and patches[-1]["to"] != to_digest:
+        patches = []
+    start = len(patches) - 1
+    while start > 0 and patches[start - 1]["to"] == patches[start]["from"]:
+        start -= 1
+    patches = patches[max(start, 0):]
+    patches = patches[-keep:] if keep > 0 else []
+
+    live = {p["file"] for p in patches}
+    for stale in out_dir.glob("occurrences-*.patch.db"):
+        if stale.name not in live:
+            stale.unlink()
+    chain = {"current": to_digest, "patches": patches}
+    tmp_index = out_dir / f".{CHAIN_INDEX}.tmp"
+    tmp_index.write_text(json.dumps(chain, indent=2) + "\n")
+    tmp_index.replace(index_path)
+    return chain
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build occurrences.db delta patches")
+    parser.add_argument("--previous", type=Path, required=True,
+                        help="last PUBLISHED occurrences.db")
+    parser.add_argument("--current", type=Path,
+                        default=sqlite_export._EXPORT_DIR / "occurrences.db",
+                        help="tonight's occurrences.db (default: EXPORT_DIR/occurrences.db)")
+    parser.add_argument("--out-dir", type=Path,
+                        default=sqlite_export._EXPORT_DIR / "db-patches",
+                        help="patch chain directory (default: EXPORT_DIR/db-patches)")
+    parser.add_argument("--keep", type=int, default=7,
+                        help="patches kept in the chain (default: 7)")
+    args = parser.parse_args()
+    chain = update_patch_chain(args.previous, args.current, args.out_dir, args.keep)
+    total = sum(p["bytes"] for p in chain["patches"])
+    print(  # noqa: T201
+        f"db patches: {len(chain['patches'])} in chain ({total / 1024:.1f} KB) "
+        f"-> {chain['current'][:12]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
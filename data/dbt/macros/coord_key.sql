@@ -0,0 +1,17 @@
+{#
+  128-bit key of an exact coordinate pair, for the incremental place membership
+  (models/intermediate/int_place_membership.sql). DuckDB prints a DOUBLE in its
+  shortest round-trip form, so two coordinates get the same key exactly when
+  they are the same pair of doubles; a NULL lon or lat gives a NULL key.
+#}
+{% macro coord_key(lon, lat) -%}
+md5_number(({{ lon }})::VARCHAR || ' ' || ({{ lat }})::VARCHAR)
+{%- endmacro %}
+
+{#
+  128-bit key of a place's exact geometry (its WKB), so an edited boundary gets a
+  new key even when its slug does not change.
+#}
+{% macro geom_key(geom) -%}
+md5_number(ST_AsWKB({{ geom }})::BLOB)
+{%- endmacro %}
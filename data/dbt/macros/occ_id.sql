@@ -0,0 +1,21 @@
+{#
+  The Option-B synthetic occurrence identity (Phase 160 D-discretion "Join key"):
+  'ecdysis:N' | 'inat:N' | 'inat_obs:N' | 'checklist:N', first non-NULL source id
+  wins. `alias` is an optional table alias ('j' -> j.ecdysis_id ...).
+
+  This is the ONE dbt copy of the CASE. marts/occurrences materializes it as the
+  occ_id column and marts/occurrence_places keys the bridge on it, so every
+  parquet consumer joins on a stored column instead of re-deriving it. The branch
+  order is POSITIONALLY COUPLED to src/occurrence.ts occIdFromRow (the frontend
+  recomputes it from SQLite rows, which do not carry the column) — change the two
+  together, or the filter.ts EXISTS membership join stops matching.
+#}
+{% macro occ_id(alias=none) -%}
+{%- set p = alias ~ '.' if alias else '' -%}
+CASE
+            WHEN {{ p }}ecdysis_id IS NOT NULL THEN 'ecdysis:' || {{ p }}ecdysis_id
+            WHEN {{ p }}observation_id IS NOT NULL THEN 'inat:' || {{ p }}observation_id
+            WHEN {{ p }}specimen_observation_id IS NOT NULL THEN 'inat_obs:' || {{ p }}specimen_observation_id
+            WHEN {{ p }}checklist_id IS NOT NULL THEN 'checklist:' || {{ p }}checklist_id
+        END
+{%- endmacro %}
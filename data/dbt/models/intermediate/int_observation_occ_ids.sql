@@ -10,8 +10,8 @@
 -- Sample rows ('inat:<N>') are deliberately absent: those observations are the
 -- FLORAL HOST photos, and identifications on plants never bear on bee trust.
 --
--- The prefixes and priority mirror the synthetic occ_id CASE shared by
--- occurrence_places.sql, test_no_duplicate_occ_ids.sql, and
+-- The prefixes and priority mirror the synthetic occ_id CASE in
+-- macros/occ_id.sql (materialized as occurrences.occ_id) and
 -- src/occurrence.ts occIdFromRow — if that CASE changes, change this too.
 {{ config(materialized='view') }}
 
@@ -0,0 +1,14 @@
+-- The distinct coordinates the occurrence_places bridge needs a place membership
+-- for, keyed by macros/coord_key.sql. Same row filter as the bridge's `joined` CTE
+-- (checklist coordinates are county placeholders and get no membership — see
+-- marts/occurrence_places.sql); rows without a coordinate have nothing to test.
+-- Occurrences sharing a point share one row, so int_place_membership tests each
+-- location once however many specimens were collected there.
+SELECT DISTINCT
+    {{ coord_key('lon', 'lat') }} AS coord_key,
+    lon,
+    lat
+FROM {{ ref('int_combined') }}
+WHERE record_type <> 'checklist'
+  AND lon IS NOT NULL
+  AND lat IS NOT NULL
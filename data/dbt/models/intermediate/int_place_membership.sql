@@ -0,0 +1,85 @@
+-- Incremental (coordinate, place) membership behind the occurrence_places bridge.
+--
+-- Point-in-polygon depends only on the coordinate and the polygon, and night to
+-- night almost neither changes. So this table keys every row on the exact
+-- coordinate (macros/coord_key.sql) and remembers which version of each place
+-- (geom_key, a hash of its WKB) it was tested against. An incremental run re-tests
+-- only:
+--   * coordinates it has never tested (new occurrences, moved ones);
+--   * coordinates that were members of a place since edited or removed;
+--   * coordinates inside a place since added or edited;
+-- each against ALL current places, and replaces those coordinates' rows
+-- wholesale (delete+insert on coord_key). The post-hook deletes coordinates no
+-- occurrence has any more. The cost follows the day's changes, not the
+-- occurrence count.
+--
+-- Three kinds of row share the table:
+--   coord_key, lon, lat, place_slug, geom_key   one membership
+--   coord_key, lon, lat, NULL,       NULL       "tested" marker, one per coordinate —
+--                                               how a coordinate in NO place is
+--                                               told apart from a new one
+--   0,         NULL, NULL, slug,     geom_key   the place versions the table is
+--                                               current for, one per place
+-- The bridge reads only the first kind.
+--
+-- Equivalence: tests/assert_place_membership_matches_full_rebuild.sql compares the
+-- table with a from-scratch ST_Within join (nightly.sh passes
+-- --vars '{verify_place_membership: true}' on Sundays). Changing the membership
+-- semantics (coord_key.sql, this file) needs a one-off
+-- `run.sh build --full-refresh -s int_place_membership`: rows tested under the
+-- old logic are otherwise kept.
+{{ config(
+    materialized='incremental',
+    unique_key='coord_key',
+    incremental_strategy='delete+insert',
+    post_hook="DELETE FROM {{ this }} WHERE coord_key <> 0 AND coord_key NOT IN (SELECT coord_key FROM {{ ref('int_place_coords') }})"
+) }}
+
+WITH coords AS (
+    SELECT coord_key, lon, lat FROM {{ ref('int_place_coords') }}
+),
+places AS (
+    SELECT slug, geom, {{ geom_key('geom') }} AS geom_key
+    FROM {{ source('geographies', 'places') }}
+),
+{% if is_incremental() %}
+tested_places AS (
+    SELECT place_slug AS slug, geom_key FROM {{ this }} WHERE coord_key = 0
+),
+-- Place versions new since the last run (added, or edited: same slug, new geometry)
+-- and those gone from it (removed, or the old geometry of an edited one).
+added_places AS (
+    SELECT p.slug, p.geom FROM places p
+    WHERE NOT EXISTS (SELECT 1 FROM tested_places t WHERE t.slug = p.slug AND t.geom_key = p.geom_key)
+),
+gone_places AS (
+    SELECT t.slug, t.geom_key FROM tested_places t
+    WHERE NOT EXISTS (SELECT 1 FROM places p WHERE p.slug = t.slug AND p.geom_key = t.geom_key)
+),
+to_test AS (
+    SELECT c.coord_key, c.lon, c.lat FROM coords c
+    WHERE NOT EXISTS (SELECT 1 FROM {{ this }} m WHERE m.coord_key = c.coord_key)
+    UNION
+    SELECT c.coord_key, c.lon, c.lat FROM coords c
+    JOIN {{ this }} m ON m.coord_key = c.coord_key
+    JOIN gone_places g ON g.slug = m.place_slug AND g.geom_key = m.geom_key
+    UNION
+    SELECT c.coord_key, c.lon, c.lat FROM coords c
+    JOIN added_places a ON ST_Within(ST_Point(c.lon, c.lat), a.geom)
+)
+{% else %}
+to_test AS (
+    SELECT coord_key, lon, lat FROM coords
+)
+{% endif %}
+-- The plain join: DuckDB plans it as a SPATIAL_JOIN (an R-tree over the place
+-- bboxes), and the batch is only the day's changed coordinates.
+SELECT t.coord_key, t.lon, t.lat, p.slug AS place_slug, p.geom_key
+FROM to_test t
+JOIN places p ON ST_Within(ST_Point(t.lon, t.lat), p.geom)
+UNION ALL
+SELECT coord_key, lon, lat, NULL::VARCHAR, NULL::UHUGEINT
+FROM to_test
+UNION ALL
+SELECT 0::UHUGEINT, NULL::DOUBLE, NULL::DOUBLE, slug, geom_key
+FROM places
@@ -1,21 +1,24 @@
 -- occurrence_places bridge mart: one row per (occ_id, place_slug) membership.
 -- Many-to-many replacement for the scalar place_slug formerly carried on the
 -- occurrences mart (Phase 160 D-01/D-02). The place ST_Within join now lives ONLY
--- in this bridge file (Phase 160 dropped the with_place/place_dedup CTEs from
--- occurrences.sql). There is no DISTINCT ON collapse here — a point inside the
+-- behind this bridge, in intermediate/int_place_membership (Phase 160 dropped the
+-- with_place/place_dedup CTEs from occurrences.sql). There is no DISTINCT ON collapse here — a point inside the
 -- overlap of two places yields one row per place.
 --
 -- occ_id is the Option-B synthetic canonical occurrence identity (Phase 160 D-discretion
--- "Join key"). The CASE branch order below is POSITIONALLY COUPLED to
--- src/occurrence.ts:23-30 (occIdFromRow): ecdysis_id → observation_id (inat) →
--- specimen_observation_id (inat_obs) → checklist_id. Both ends must use the same
--- priority or the frontend membership join (filter.ts EXISTS clause) will not match;
--- change them together (cf. the _GEO_COLS positional-coupling doc in sqlite_export.py).
+-- "Join key"), produced by the same macros/occ_id.sql CASE the occurrences mart
+-- materializes — so a bridge key and its occurrences row can never disagree. The CASE
+-- branch order is POSITIONALLY COUPLED to src/occurrence.ts:23-30 (occIdFromRow):
+-- ecdysis_id → observation_id (inat) → specimen_observation_id (inat_obs) →
+-- checklist_id; change the macro and occIdFromRow together (cf. the _GEO_COLS
+-- positional-coupling doc in sqlite_export.py).
 --
 -- INNER JOIN (not LEFT): an occurrence in no named place simply has zero bridge rows
--- (D-discretion "empty membership" — no sentinel). _row_id is internal scaffolding and
--- MUST NOT appear in the projected output. ORDER BY (occ_id, place_slug) for byte-stable
--- determinism (RESEARCH Pitfall 4).
+-- (D-discretion "empty membership" — no sentinel); the membership table's own "tested"
+-- markers never reach the output. ORDER BY (occ_id, place_slug) for byte-stable
+-- determinism (RESEARCH Pitfall 4); with the same ROW_GROUP_SIZE as occurrences.parquet,
+-- which is sorted on occ_id too, so both sides of a bridge join carry matching per-row-group
+-- occ_id min/max statistics.
 --
 -- Sandbox output path: target/sandbox/occurrence_places.parquet (relative to data/dbt/);
 -- external_root from profiles.yml applies (mirrors occurrences.sql:10-17).
@@ -23,11 +26,11 @@
     materialized='external',
     location='target/sandbox/occurrence_places.parquet',
     format='parquet',
-    options={'CODEC': "'SNAPPY'"}
+    options={'CODEC': "'SNAPPY'", 'ROW_GROUP_SIZE': '16384'}
 ) }}
 
 WITH joined AS (
-    SELECT ROW_NUMBER() OVER () AS _row_id, *
+    SELECT *
     FROM {{ ref('int_combined') }}
     -- A checklist record's COORDINATE is a county-level placeholder, not a location:
     -- 6,090 of 19,929 checklist rows sit on 45 shared points, 683 King County records
@@ -44,30 +47,25 @@ WITH joined AS (
     -- Level IV ecoregions, so "large polygon" is no defence: the pin still picks one.
     WHERE record_type <> 'checklist'
 ),
-occ_pt AS (
-    SELECT *, ST_Point(lon, lat) AS pt FROM joined
-),
-wa_places AS (SELECT * FROM {{ source('geographies', 'places') }}),
-with_place AS (
-    SELECT occ_pt._row_id, p.slug AS place_slug
-    FROM occ_pt
-    JOIN wa_places p ON ST_Within(occ_pt.pt, p.geom)
+-- Membership is looked up by exact coordinate in int_place_membership, an
+-- incremental table that re-tests only coordinates and places that changed since
+-- the last build (see that model); membership rows carry a place_slug, its
+-- "tested" markers and place-version rows do not.
+membership AS (
+    SELECT coord_key, place_slug
+    FROM {{ ref('int_place_membership') }}
+    WHERE coord_key <> 0 AND place_slug IS NOT NULL
 ),
 identified AS (
     SELECT
-        CASE
-            WHEN j.ecdysis_id IS NOT NULL THEN 'ecdysis:' || j.ecdysis_id
-            WHEN j.observation_id IS NOT NULL THEN 'inat:' || j.observation_id
-            WHEN j.specimen_observation_id IS NOT NULL THEN 'inat_obs:' || j.specimen_observation_id
-            WHEN j.checklist_id IS NOT NULL THEN 'checklist:' || j.checklist_id
-        END AS occ_id,
+        {{ occ_id('j') }} AS occ_id,
         wp.place_slug
     FROM joined j
-    JOIN with_place wp ON wp._row_id = j._row_id
+    JOIN membership wp ON wp.coord_key = {{ coord_key('j.lon', 'j.lat') }}
 )
 SELECT occ_id, place_slug
 FROM identified
--- An int_combined row can match NO branch of the CASE above: the checklist arm keys
+-- An int_combined row can match NO branch of the occ_id CASE: the checklist arm keys
 -- on the source's ObjectID, and one upstream checklist record has a null one, so it
 -- arrives here with no identity at all. A null occ_id is unjoinable by construction —
 -- the frontend resolves membership BY occ_id — so the row is dropped rather than
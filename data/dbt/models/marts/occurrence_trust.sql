@@ -6,7 +6,7 @@
 --
 -- JOIN CONTRACT: occ_id is the synthetic canonical occurrence identity —
 -- 'ecdysis:N' | 'inat:N' | 'inat_obs:N' | 'checklist:N' — the same CASE
--- priority as occurrence_places.sql, test_no_duplicate_occ_ids.sql, and
+-- priority as macros/occ_id.sql (materialized as occurrences.occ_id) and
 -- src/occurrence.ts occIdFromRow. Occurrence rows WITHOUT a current expert
 -- assertion (checklist arm, samples) simply have no row here; consumers treat
 -- absence as "no trust computed", never as distrust.
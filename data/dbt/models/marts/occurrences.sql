@@ -9,11 +9,17 @@
 --
 -- Sandbox output path: target/sandbox/occurrences.parquet (relative to data/dbt/).
 -- Per Pitfall 3: location is relative so external_root (profiles.yml: target/sandbox) applies.
+--
+-- occ_id is materialized here (macros/occ_id.sql) and leads the projection, so the file
+-- is written sorted on it. With ROW_GROUP_SIZE well under the row count each row group
+-- covers a narrow occ_id range, and its min/max statistics (DuckDB writes them for every
+-- column) let a bridge join prune or merge instead of hashing the whole file. The
+-- sibling occurrence_places.parquet is written the same way.
 {{ config(
     materialized='external',
     location='target/sandbox/occurrences.parquet',
     format='parquet',
-    options={'CODEC': "'SNAPPY'"}
+    options={'CODEC': "'SNAPPY'", 'ROW_GROUP_SIZE': '16384'}
 ) }}
 
 WITH joined AS (
@@ -87,6 +93,7 @@ final_eco AS (
 -- Phase 160 (D-02): place_slug dropped from this mart; place membership is now the
 -- many-to-many occurrence_places bridge (data/dbt/models/marts/occurrence_places.sql).
 SELECT
+    {{ occ_id('j') }} AS occ_id,
     j.ecdysis_id, j.catalog_number,
     j.lon, j.lat, j.date, j.year, j.month,
     j.recordedBy, j.fieldNumber,
@@ -128,8 +135,10 @@ LEFT JOIN {{ ref('stg_dem__elevations') }} dem
 -- same way). Without a final ORDER BY the parquet row order follows DuckDB's parallel scan
 -- of int_combined and flips between builds (beeatlas-zo7). _row_id can't be the sort key —
 -- it's ROW_NUMBER() OVER () with no ORDER BY, so its assignment is itself nondeterministic.
--- ORDER BY ALL (not occ_id) because occ_id is NOT guaranteed unique here: the
+-- ORDER BY ALL (not occ_id alone) because occ_id is NOT guaranteed unique here: the
 -- test_no_duplicate_occ_ids check is severity:warn (known "Shape C" OFV fan-out dupes), so
--- ordering by occ_id alone would leave duplicate-occ_id rows tied on their other 34 columns.
+-- ordering by occ_id alone would leave duplicate-occ_id rows tied on their other columns.
 -- ORDER BY ALL is a total order over the projection; any genuine tie is byte-identical anyway.
+-- occ_id is the first projected column, so ORDER BY ALL is primarily an occ_id sort (NULL
+-- occ_id — the identity-less checklist row, beeatlas-cmsf — sorts last).
 ORDER BY ALL
@@ -0,0 +1,67 @@
+-- The incremental int_place_membership must hold exactly what a from-scratch build
+-- would: the plain ST_Within join of today's coordinates and places, one "tested"
+-- marker per current coordinate, and one place-version row per current place.
+-- Every row returned here is a discrepancy, named by `problem`.
+--
+-- WHY THIS TEST EXISTS. An incremental table is only as right as its change
+-- detection: a place edit or a coordinate move it failed to notice would leave a
+-- stale membership in the bridge forever, with nothing else to catch it. This is
+-- the full rebuild run as a check instead of as the build — the one full-cost
+-- point-in-polygon join left in the pipeline, so it is off unless
+-- `--vars '{verify_place_membership: true}'` is passed: nightly.sh does so on
+-- Sundays (step 4a). The day is not computed here — dbt renders config() at
+-- parse time, and partial parsing or the build cache would freeze the answer.
+--
+-- On failure: `bash data/dbt/run.sh build --full-refresh -s int_place_membership+`
+-- repairs the table; the failing rows say what the change detection missed.
+{{ config(
+    enabled=var('verify_place_membership', false),
+    severity='error'
+) }}
+
+WITH incremental AS (
+    SELECT coord_key, place_slug, geom_key
+    FROM {{ ref('int_place_membership') }}
+    WHERE coord_key <> 0 AND place_slug IS NOT NULL
+),
+places AS (
+    SELECT slug, geom, {{ geom_key('geom') }} AS geom_key
+    FROM {{ source('geographies', 'places') }}
+),
+full_rebuild AS (
+    SELECT c.coord_key, p.slug AS place_slug, p.geom_key
+    FROM {{ ref('int_place_coords') }} c
+    JOIN places p ON ST_Within(ST_Point(c.lon, c.lat), p.geom)
+),
+markers AS (
+    SELECT coord_key, count(*) AS n
+    FROM {{ ref('int_place_membership') }}
+    WHERE coord_key <> 0 AND place_slug IS NULL
+    GROUP BY coord_key
+),
+versions AS (
+    SELECT place_slug AS slug, geom_key
+    FROM {{ ref('int_place_membership') }}
+    WHERE coord_key = 0
+)
+SELECT 'missing membership' AS problem, coord_key, place_slug
+FROM (SELECT * FROM full_rebuild EXCEPT ALL SELECT * FROM incremental)
+UNION ALL
+SELECT 'stale membership', coord_key, place_slug
+FROM (SELECT * FROM incremental EXCEPT ALL SELECT * FROM full_rebuild)
+UNION ALL
+SELECT 'coordinate not marked tested exactly once', c.coord_key, NULL
+FROM {{ ref('int_place_coords') }} c
+LEFT JOIN markers m ON m.coord_key = c.coord_key
+WHERE m.n IS DISTINCT FROM 1
+UNION ALL
+SELECT 'marker for a vanished coordinate', m.coord_key, NULL
+FROM markers m
+WHERE m.coord_key NOT IN (SELECT coord_key FROM {{ ref('int_place_coords') }})
+UNION ALL
+SELECT 'place version out of date', NULL, slug
+FROM (
+    (SELECT slug, geom_key FROM places EXCEPT ALL SELECT * FROM versions)
+    UNION ALL
+    (SELECT * FROM versions EXCEPT ALL SELECT slug, geom_key FROM places)
+)
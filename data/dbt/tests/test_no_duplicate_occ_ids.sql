@@ -4,10 +4,10 @@
 --
 -- PASS semantics: this query returns 0 rows (no duplicate occ_ids).
 --
--- occ_id is not a stored column in int_combined; it is computed here using the
--- same CASE expression as occurrence_places.sql (lines 43-48) and
--- src/occurrence.ts occIdFromRow (lines 23-30). These three must move together —
--- if the priority order or prefixes change in any one place, update all three.
+-- occ_id is not a stored column in int_combined (the occurrences mart materializes it);
+-- it is computed here with the same macros/occ_id.sql CASE the marts use, which mirrors
+-- src/occurrence.ts occIdFromRow (lines 23-30). The macro and occIdFromRow must move
+-- together — if the priority order or prefixes change in one, update the other.
 --
 -- Priority order: ecdysis → inat → inat_obs → checklist
 --
@@ -19,12 +19,7 @@
 
 WITH occ_ids AS (
     SELECT
-        CASE
-            WHEN ecdysis_id IS NOT NULL THEN 'ecdysis:' || ecdysis_id
-            WHEN observation_id IS NOT NULL THEN 'inat:' || observation_id
-            WHEN specimen_observation_id IS NOT NULL THEN 'inat_obs:' || specimen_observation_id
-            WHEN checklist_id IS NOT NULL THEN 'checklist:' || checklist_id
-        END AS occ_id
+        {{ occ_id() }} AS occ_id
     FROM {{ ref('int_combined') }}
 )
 SELECT occ_id, COUNT(*) AS dup_count
@@ -0,0 +1,58 @@
+"""Shared FROM-item builders for the exporters' parquet inputs.
+
+species_maps, places_maps, places_export, collectors_export,
+collectors_events_export and taxon_presence_export all read
+ASSETS_DIR/occurrences.parquet (most of them also species.parquet and the
+occurrence_places bridge), and every bridge join used to re-synthesize the
+Option-B occ_id with its own copy of the CASE. Exporters now name their inputs
+through two builders:
+
+    occurrences_source(con, path)  # occurrences.parquet, always with occ_id
+    parquet_source(con, path)      # species.parquet, the bridge, ...
+
+The occurrences mart materializes occ_id (dbt macros/occ_id.sql) and writes
+the file sorted on it, so a current occurrences.parquet is scanned as-is.
+OCC_ID_SQL is the exporters' fallback for a file without the column (one
+written before the mart carried it, or a test fixture), and the one Python
+copy of the key: sqlite_export (facet_counts' bridge join) and db_patch (the
+occurrences group key) derive it from occurrences.db rows with the same
+expression. It mirrors the macro and occIdFromRow (src/occurrence.ts), and the
+priority order is what must stay in step.
+"""
+
+from pathlib import Path
+
+import duckdb
+
+OCC_ID_SQL = """CASE
+        WHEN ecdysis_id IS NOT NULL THEN 'ecdysis:' || ecdysis_id
+        WHEN observation_id IS NOT NULL THEN 'inat:' || observation_id
+        WHEN specimen_observation_id IS NOT NULL THEN 'inat_obs:' || specimen_observation_id
+        WHEN checklist_id IS NOT NULL THEN 'checklist:' || checklist_id
+    END"""
+_OCC_ID_COLUMNS = ("ecdysis_id", "observation_id", "specimen_observation_id", "checklist_id")
+
+
+def _literal(path: Path | str) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def _occurrences_select(con: duckdb.DuckDBPyConnection, path: Path | str) -> str:
+    """SELECT over an occurrences parquet that yields an occ_id column when the
+    file has the identity columns (and does not carry occ_id already)."""
+    scan = f"read_parquet({_literal(path)})"
+    cols = {r[0] for r in con.execute(f"DESCRIBE SELECT * FROM {scan}").fetchall()}
+    if "occ_id" in cols or not set(_OCC_ID_COLUMNS) <= cols:
+        return f"SELECT * FROM {scan}"
+    return f"SELECT *, {OCC_ID_SQL} AS occ_id FROM {scan}"
+
+
+def occurrences_source(con: duckdb.DuckDBPyConnection, path: Path | str) -> str:
+    """FROM-item for an occurrences parquet, with occ_id (see module docstring)."""
+    return f"({_occurrences_select(con, path)})"
+
+
+def parquet_source(con: duckdb.DuckDBPyConnection, path: Path | str) -> str:
+    """FROM-item for any other parquet input (see module docstring)."""
+    return f"read_parquet({_literal(path)})"
+
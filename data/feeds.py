@@ -10,14 +10,40 @@ Covers all determinations whose modified timestamp falls within the last 90 days
 with blank scientific_name / identified_by rows and Ecdysis "undetermined"
 placeholder identifications excluded (the latter are non-determinations).
 
+The 90-day window is queried ONCE (_QUERY, newest first). The variant feeds are
+partitions of that one result by collector (recorded_by) and genus, taken in
+memory in the window's order, so the step costs one scan however many
+collectors and genera there are — not one query per feed. Each file is streamed
+out by _write_feed, a small Atom writer that emits exactly the bytes the
+former ElementTree + ET.indent(space='  ') + ET.tostring(xml_declaration=True,
+encoding='unicode') rendering produced (including its escaping rules).
+
+Unchanged feeds are not rewritten. FEED_DIGESTS_NAME (beside feeds/, so the
+feeds/ publish never ships it) records a digest per file: every rendered entry
+(so its id and <updated>, and its text) under the feed's title and id. A feed
+whose digest matches the last run's, and whose file is still there, is left
+alone, and main() reports rewritten vs skipped counts. The feed-level
+<updated> is derived, not digested:
+
+  - with entries it is the newest entry's timestamp, which the digest already
+    covers; when the 90-day window drops an OLDER entry the entry set
+    changes, the digest changes and the file is rewritten (its <updated> rightly
+    unchanged — the newest determination is the same);
+  - an empty feed's <updated> is the run time it was written at. Leaving the
+    run time out of the digest means a feed that stays empty keeps the instant
+    it became empty instead of churning every night.
+
 Usage:
     uv run --project data python data/feeds.py
 """
 
 import datetime
+import functools
+import hashlib
 import json
 import os
-import xml.etree.ElementTree as ET
+from collections import defaultdict
+from collections.abc import Callable
 from pathlib import Path
 
 import duckdb
@@ -29,7 +55,11 @@ _default_assets = str(Path(__file__).parent.parent / 'public' / 'data')
 ASSETS_DIR = Path(os.environ.get('EXPORT_DIR', _default_assets))
 
 ATOM_NS = 'http://www.w3.org/2005/Atom'
-ET.register_namespace('', ATOM_NS)
+
+# Folded into every feed digest: bump when _write_feed's output changes for the
+# same rows, so the next run rewrites every feed.
+FEEDS_RENDER_VERSION = 1
+FEED_DIGESTS_NAME = 'feeds.digests.json'
 
 _FEED_TITLE = 'Washington Bee Atlas \u2014 All Recent Determinations'
 _FEED_ID = 'https://beeatlas.org/data/feeds/determinations.xml'
@@ -42,7 +72,8 @@ _QUERY = """
         o.occurrence_id                AS specimen_occurrence_id,
         o.id                           AS ecdysis_id,
         o.recorded_by                  AS collector,
-        o.event_date                   AS collection_date
+        o.event_date                   AS collection_date,
+        o.genus                        AS genus  -- partition key only, not rendered
     FROM ecdysis_data.identifications i
     JOIN ecdysis_data.occurrences o ON i.coreid = CAST(o.id AS VARCHAR)
     WHERE i.modified >= NOW() - INTERVAL '90 days'
@@ -55,47 +86,159 @@ _QUERY = """
 """
 
 
-def _atom(tag: str) -> str:
-    """Return Clark-notation tag for Atom namespace."""
-    return f'{{{ATOM_NS}}}{tag}'
+_XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+
+
+def _escape_text(text: str) -> str:
+    """Escape character data the way ElementTree does (&, <, >; quotes kept)."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
 
+def _escape_attr(text: str) -> str:
+    """Escape an attribute value the way ElementTree does."""
+    return (
+        _escape_text(text).replace('"', '&quot;')
+        .replace('\r', '&#13;').replace('\n', '&#10;').replace('\t', '&#09;')
+    )
+
+
+def _element(indent: str, tag: str, text: str = '', **attrs: str) -> str:
+    """One leaf element on its own line; ET self-closes it when text is empty."""
+    attr_str = ''.join(f' {k}="{_escape_attr(v)}"' for k, v in attrs.items())
+    if not text:
+        return f'{indent}<{tag}{attr_str} />\n'
+    return f'{indent}<{tag}{attr_str}>{_escape_text(text)}</{tag}>\n'
 
-def _build_entry(feed: ET.Element, row: tuple) -> None:
-    """Append one Atom <entry> element to feed for the given row."""
-    modified, taxon_name, determiner, specimen_uuid, ecdysis_id, collector, coll_date = row
+
+def _entry_xml(row: tuple) -> str:
+    """The indented Atom <entry> for one _QUERY row (its trailing genus is not rendered)."""
+    modified, taxon_name, determiner, specimen_uuid, ecdysis_id, collector, coll_date = row[:7]
     utc_ts = modified.astimezone(datetime.timezone.utc).isoformat()
     ecdysis_url = f'https://ecdysis.org/collections/individual/index.php?occid={ecdysis_id}'
+    return ''.join((
+        '  <entry>\n',
+        # Use specimen occurrence_id UUID as globally-unique Atom entry ID (RFC 4287 §4.1.2)
+        _element('    ', 'id', f'urn:ecdysis:{specimen_uuid}'),
+        _element('    ', 'title', f'{taxon_name} \u2014 determined by {determiner}'),
+        _element('    ', 'updated', utc_ts),
+        _element('    ', 'link', href=ecdysis_url),
+        _element(
+            '    ', 'summary',
+            f'Collected by {collector} on {coll_date}. Specimen: ecdysis:{ecdysis_id}',
+            type='text',
+        ),
+        '  </entry>\n',
+    ))
 
-    entry = ET.SubElement(feed, _atom('entry'))
-
-    id_el = ET.SubElement(entry, _atom('id'))
-    # Use specimen occurrence_id UUID as globally-unique Atom entry ID (RFC 4287 §4.1.2)
-    id_el.text = f'urn:ecdysis:{specimen_uuid}'
 
-    title_el = ET.SubElement(entry, _atom('title'))
-    title_el.text = f'{taxon_name} \u2014 determined by {determiner}'
+def _write_feed(out_path: Path, title: str, feed_id: str, updated: str, entries: list[str]) -> None:
+    """Stream one Atom feed (header, then the rendered _entry_xml entries) to out_path."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write(_XML_DECLARATION)
+        f.write(f'<feed xmlns="{ATOM_NS}" xml:lang="en">\n')
+        f.write(_element('  ', 'title', title))
+        f.write(_element('  ', 'id', feed_id))
+        f.write(_element('  ', 'link', rel='self', href=feed_id))
+        f.write(_element('  ', 'updated', updated))
+        for entry in entries:
+            f.write(entry)
+        f.write('</feed>')
+
+
+class _FeedDigests:
+    """Last run's per-file digests (FEED_DIGESTS_NAME) and this run's.
+
+    write() rewrites a file only when its digest changed or the file is gone,
+    counting each outcome for report().
+    """
 
-    updated_el = ET.SubElement(entry, _atom('updated'))
-    updated_el.text = utc_ts
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.previous: dict[str, str] = {}
+        try:
+            stored = json.loads(path.read_text())
+            if stored.get('render_version') == FEEDS_RENDER_VERSION:
+                self.previous = stored.get('feeds', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        self.current: dict[str, str] = {}
+        self.rewritten = 0
+        self.skipped = 0
+
+    def write(self, out_path: Path, digest: str, render: Callable[[], None]) -> bool:
+        """Call render() unless out_path is unchanged; True if it was (re)written."""
+        name = out_path.name
+        self.current[name] = digest
+        if self.previous.get(name) == digest and out_path.exists():
+            self.skipped += 1
+            return False
+        render()
+        self.rewritten += 1
+        return True
+
+    def save(self) -> None:
+        """Persist this run's digests (a feed it did not emit is rewritten next time)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps(
+            {'render_version': FEEDS_RENDER_VERSION, 'feeds': self.current}, sort_keys=True,
+        ))
+        tmp.replace(self.path)
+
+    def report(self) -> None:
+        print(  # noqa: T201
+            f"  feeds/: {self.rewritten:,} rewritten, {self.skipped:,} unchanged (skipped)"
+        )
+
+
+def _feed_digest(title: str, feed_id: str, entries: list[str]) -> str:
+    """Digest of what a feed renders, except the derived feed-level <updated>."""
+    h = hashlib.sha256(f'v{FEEDS_RENDER_VERSION}\0{title}\0{feed_id}\0'.encode())
+    for entry in entries:
+        h.update(entry.encode())
+    return h.hexdigest()
+
+
+def _emit_feed(
+    out_path: Path,
+    title: str,
+    feed_id: str,
+    updated: str,
+    rows: list,
+    digests: _FeedDigests | None,
+) -> bool:
+    """Write one feed, through digests when given; True if the file was written."""
+    entries = [_entry_xml(row) for row in rows]
+    render = functools.partial(_write_feed, out_path, title, feed_id, updated, entries)
+    if digests is None:
+        render()
+        return True
+    return digests.write(out_path, _feed_digest(title, feed_id, entries), render)
 
-    link_el = ET.SubElement(entry, _atom('link'))
-    link_el.set('href', ecdysis_url)
 
-    summary_el = ET.SubElement(entry, _atom('summary'))
-    summary_el.set('type', 'text')
-    summary_el.text = (
-        f'Collected by {collector} on {coll_date}. '
-        f'Specimen: ecdysis:{ecdysis_id}'
-    )
+def _recent_rows(con: duckdb.DuckDBPyConnection) -> list:
+    """The 90-day window, newest first — the one query every feed is cut from."""
+    return con.execute(_QUERY).fetchall()
 
 
-def write_determinations_feed(con: duckdb.DuckDBPyConnection, out_dir: Path) -> None:
+def write_determinations_feed(
+    con: duckdb.DuckDBPyConnection,
+    out_dir: Path,
+    rows: list | None = None,
+    digests: _FeedDigests | None = None,
+) -> None:
     """Query recent determinations and write Atom XML to out_dir/feeds/determinations.xml.
 
+    rows: an already-fetched _recent_rows(con) result (main() shares one with
+    write_all_variants); queried here when omitted. digests: skip the write
+    when the feed is unchanged since the last run (see module docstring).
+
     If no rows match the 90-day window, prints a skip message and returns without
     creating any file.
     """
-    rows = con.execute(_QUERY).fetchall()
+    if rows is None:
+        rows = _recent_rows(con)
 
     if not rows:
         print("  feeds: no recent determinations in 90-day window — skipping")  # noqa: T201
@@ -103,29 +246,9 @@ def write_determinations_feed(con: duckdb.DuckDBPyConnection, out_dir: Path) ->
 
     most_recent_ts = rows[0][0].astimezone(datetime.timezone.utc)
 
-    feed = ET.Element(_atom('feed'))
-    feed.set('xml:lang', 'en')
-
-    ET.SubElement(feed, _atom('title')).text = _FEED_TITLE
-    ET.SubElement(feed, _atom('id')).text = _FEED_ID
-
-    link_el = ET.SubElement(feed, _atom('link'))
-    link_el.set('rel', 'self')
-    link_el.set('href', _FEED_ID)
-
-    ET.SubElement(feed, _atom('updated')).text = most_recent_ts.isoformat()
-
-    for row in rows:
-        _build_entry(feed, row)
-
-    tree = ET.ElementTree(feed)
-    ET.indent(tree, space='  ')
-
     out_path = out_dir / 'feeds' / 'determinations.xml'
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    result = ET.tostring(feed, xml_declaration=True, encoding='unicode')
-    out_path.write_text(result, encoding='utf-8')
+    if not _emit_feed(out_path, _FEED_TITLE, _FEED_ID, most_recent_ts.isoformat(), rows, digests):
+        return
 
     print(  # noqa: T201
         f"  feeds/determinations.xml: {len(rows):,} entries, "
@@ -141,47 +264,10 @@ _TITLE_TEMPLATES = {
     'genus':     'Washington Bee Atlas \u2014 Genus: {value}',
 }
 
-_COLLECTOR_QUERY = """
-    SELECT
-        i.modified,
-        NULLIF(i.scientific_name, '')  AS taxon_name,
-        NULLIF(i.identified_by, '')    AS determiner,
-        o.occurrence_id                AS specimen_occurrence_id,
-        o.id                           AS ecdysis_id,
-        o.recorded_by                  AS collector,
-        o.event_date                   AS collection_date
-    FROM ecdysis_data.identifications i
-    JOIN ecdysis_data.occurrences o ON i.coreid = CAST(o.id AS VARCHAR)
-    WHERE i.modified >= NOW() - INTERVAL '90 days'
-      AND i.scientific_name != ''
-      AND i.identified_by   != ''
-      AND lower(trim(i.scientific_name)) != 'undetermined'
-      AND o.recorded_by = ?
-    ORDER BY i.modified DESC
-"""
-
-_GENUS_QUERY = """
-    SELECT
-        i.modified,
-        NULLIF(i.scientific_name, '')  AS taxon_name,
-        NULLIF(i.identified_by, '')    AS determiner,
-        o.occurrence_id                AS specimen_occurrence_id,
-        o.id                           AS ecdysis_id,
-        o.recorded_by                  AS collector,
-        o.event_date                   AS collection_date
-    FROM ecdysis_data.identifications i
-    JOIN ecdysis_data.occurrences o ON i.coreid = CAST(o.id AS VARCHAR)
-    WHERE i.modified >= NOW() - INTERVAL '90 days'
-      AND i.scientific_name != ''
-      AND i.identified_by   != ''
-      AND lower(trim(i.scientific_name)) != 'undetermined'
-      AND o.genus = ?
-    ORDER BY i.modified DESC
-"""
-
-_VARIANT_QUERIES = {
-    'collector': _COLLECTOR_QUERY,
-    'genus':     _GENUS_QUERY,
+# Column of a _QUERY row each variant type partitions on (collector, genus).
+_PARTITION_COLUMNS = {
+    'collector': 5,
+    'genus':     7,
 }
 
 
@@ -192,12 +278,14 @@ def write_variant_feed(
     slug: str,
     rows: list,
     run_time: datetime.datetime,
+    digests: _FeedDigests | None = None,
 ) -> dict:
     """Write a single variant Atom feed file and return its index entry dict.
 
     Always writes a file even when rows is empty. Uses run_time as the
     feed-level <updated> timestamp when rows is empty. Produces valid Atom
-    with zero <entry> children when rows is empty.
+    with zero <entry> children when rows is empty. With digests, an unchanged
+    feed already on disk is left as it is (the index entry is returned either way).
     """
     filename = f'{variant_type}-{slug}.xml'
     feed_id = f'https://beeatlas.org/data/feeds/{filename}'
@@ -209,34 +297,12 @@ def write_variant_feed(
     else:
         updated_ts = run_time.isoformat()
 
-    feed = ET.Element(_atom('feed'))
-    feed.set('xml:lang', 'en')
-
-    ET.SubElement(feed, _atom('title')).text = title_str
-    ET.SubElement(feed, _atom('id')).text = feed_id
-
-    link_el = ET.SubElement(feed, _atom('link'))
-    link_el.set('rel', 'self')
-    link_el.set('href', feed_id)
-
-    ET.SubElement(feed, _atom('updated')).text = updated_ts
-
     # Always write entries (D-01 means always write file; D-03 means 0 entries is valid)
-    for row in rows:
-        _build_entry(feed, row)
-
-    tree = ET.ElementTree(feed)
-    ET.indent(tree, space='  ')
-
     out_path = out_dir / 'feeds' / filename
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    result = ET.tostring(feed, xml_declaration=True, encoding='unicode')
-    out_path.write_text(result, encoding='utf-8')
-
-    print(  # noqa: T201
-        f"  feeds/{filename}: {len(rows):,} entries, {out_path.stat().st_size:,} bytes"
-    )
+    if _emit_feed(out_path, title_str, feed_id, updated_ts, rows, digests):
+        print(  # noqa: T201
+            f"  feeds/{filename}: {len(rows):,} entries, {out_path.stat().st_size:,} bytes"
+        )
 
     return {
         'filename': filename,
@@ -252,11 +318,20 @@ def write_all_variants(
     con: duckdb.DuckDBPyConnection,
     out_dir: Path,
     run_time: datetime.datetime,
+    rows: list | None = None,
+    digests: _FeedDigests | None = None,
 ) -> list:
     """Enumerates all filter values per variant type (collector, genus) and writes one feed file each.
 
+    Each feed's entries are its value's partition of the 90-day window (rows, or
+    _recent_rows(con) when omitted), in the window's newest-first order.
+    digests is passed through to write_variant_feed.
+
     Returns list of index entry dicts (one per feed written).
     """
+    if rows is None:
+        rows = _recent_rows(con)
+
     # Enumerate distinct filter values per type
     _ENUM_QUERIES = {
         'collector': (
@@ -273,6 +348,10 @@ def write_all_variants(
 
     for variant_type in ('collector', 'genus'):
         filter_values = [row[0] for row in con.execute(_ENUM_QUERIES[variant_type]).fetchall()]
+        column = _PARTITION_COLUMNS[variant_type]
+        partitions: dict[str, list] = defaultdict(list)
+        for row in rows:
+            partitions[row[column]].append(row)
         # Track slugs within this variant type to detect collisions
         seen_slugs: dict[str, int] = {}
 
@@ -289,18 +368,28 @@ def write_all_variants(
                 seen_slugs[base_slug] = 1
                 slug = base_slug
 
-            rows = con.execute(_VARIANT_QUERIES[variant_type], [filter_value]).fetchall()
-            entry = write_variant_feed(out_dir, variant_type, filter_value, slug, rows, run_time)
+            entry = write_variant_feed(
+                out_dir, variant_type, filter_value, slug, partitions.get(filter_value, []), run_time,
+                digests,
+            )
             all_entries.append(entry)
 
     return all_entries
 
 
-def write_index_json(out_dir: Path, entries: list) -> None:
-    """Write index.json listing all variant feeds with metadata."""
+def write_index_json(out_dir: Path, entries: list, digests: _FeedDigests | None = None) -> None:
+    """Write index.json listing all variant feeds with metadata (skipped if unchanged, with digests)."""
     out_path = out_dir / 'feeds' / 'index.json'
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(entries, indent=2), encoding='utf-8')
+    text = json.dumps(entries, indent=2)
+
+    def render() -> None:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(text, encoding='utf-8')
+
+    if digests is None:
+        render()
+    elif not digests.write(out_path, hashlib.sha256(text.encode()).hexdigest(), render):
+        return
     print(  # noqa: T201
         f"  feeds/index.json: {len(entries)} feeds, {out_path.stat().st_size:,} bytes"
     )
@@ -330,9 +419,13 @@ def main() -> None:
     con = duckdb.connect(DB_PATH, read_only=True)
     con.execute("INSTALL spatial; LOAD spatial;")
     run_time = _run_time()
-    write_determinations_feed(con, ASSETS_DIR)
-    entries = write_all_variants(con, ASSETS_DIR, run_time)
-    write_index_json(ASSETS_DIR, entries)
+    rows = _recent_rows(con)
+    digests = _FeedDigests(ASSETS_DIR / FEED_DIGESTS_NAME)
+    write_determinations_feed(con, ASSETS_DIR, rows, digests)
+    entries = write_all_variants(con, ASSETS_DIR, run_time, rows, digests)
+    write_index_json(ASSETS_DIR, entries, digests)
+    digests.save()
+    digests.report()
     con.close()
 
 
@@ -0,0 +1,228 @@
+"""Simplified, projected boundary geometry shared by the SVG map generators.
+
+species_maps.py, places_maps.py and build_coverage_basemaps.py all draw the
+same few boundary layers (WA counties, ecoregions) onto small fixed viewports.
+Each used to run ST_SimplifyPreserveTopology, round-trip the result through
+ST_AsGeoJSON / json.loads and re-project every ring to an SVG path string on
+every run — nightly, for layers that change about once a year.
+
+This module does that work once per (layer, tolerance, viewport, path
+function) and source version, and persists the result as JSON under CACHE_DIR:
+
+    table_layer(con, "wa-counties", sql, params, tolerance, viewport, to_d)
+    geojson_layer(con, "eco-l4", path, "name", tolerance, viewport, to_d)
+
+Both return a list of Shape(name, geom, d): the simplified GeoJSON geometry and
+to_d(geom), the caller's path string (None when to_d rejects the geometry).
+The caller keeps its own to_d so its output is byte-for-byte what it was; the
+cache only remembers it.
+
+SOURCE VERSION. A table layer's version is an md5 over every (name, WKB) row of
+the caller's query — a scan, but no simplification or projection. A GeoJSON
+layer's version is the file's sha256. A version mismatch recomputes and
+overwrites the entry, so stale versions never accumulate.
+
+PATH FUNCTION. The key holds to_d's qualified name and a hash of its bytecode
+(co_code, constants and names), plus that of every function in to_d's module it
+reaches by name, so editing _polygon_d or a ring helper it calls recomputes
+the layer. CACHE_VERSION is part of every key too: bump it when output changes
+in a way the bytecode does not show (a module-level constant, a function from
+another module).
+"""
+
+import hashlib
+import json
+import os
+import types
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import duckdb
+
+CACHE_DIR = Path(os.environ.get(
+    "GEOMETRY_CACHE_DIR",
+    str(Path(__file__).parent / ".geometry_cache"),
+))
+
+CACHE_VERSION = 1
+
+
+class Viewport(NamedTuple):
+    """The projection a layer's paths were drawn for: lon/lat bbox -> width x height."""
+    bbox: tuple[float, float, float, float]
+    width: int
+    height: int
+
+
+class Shape(NamedTuple):
+    name: str
+    geom: dict | None  # None: the feature failed to simplify
+    d: str | None
+
+
+class Layer(dict):
+    """name -> simplified GeoJSON geometry, with .paths: name -> cached path d.
+
+    A plain dict to code that only needs geometry (and to json / pickle), so
+    it drops in wherever a {name: geojson} mapping was passed before.
+    """
+
+    def __init__(self, shapes: list[Shape] = ()) -> None:
+        super().__init__((s.name, s.geom) for s in shapes if s.geom is not None)
+        self.paths = {s.name: s.d for s in shapes if s.geom is not None}
+
+
+def _cache_path(key: dict) -> Path:
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return CACHE_DIR / f"{key['layer']}.{digest}.json"
+
+
+def _cached(
+    key: dict,
+    source_version: str,
+    compute: Callable[[], list[tuple[str, dict | None]]],
+    to_d: Callable[[dict], str | None],
+) -> list[Shape]:
+    """The cached shapes for key at source_version, computing them on a miss."""
+    path = _cache_path(key)
+    try:
+        entry = json.loads(path.read_text())
+        if entry["key"] == key and entry["source_version"] == source_version:
+            return [Shape(*shape) for shape in entry["shapes"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    shapes = [
+        Shape(name, geom, None if geom is None else to_d(geom))
+        for name, geom in compute()
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(
+        {"key": key, "source_version": source_version, "shapes": [list(s) for s in shapes]}
+    ))
+    tmp.replace(path)
+    return shapes
+
+
+def _code_hash(fn: Callable) -> str | None:
+    """sha256 over fn's bytecode and that of the same-module functions it names."""
+    if not isinstance(fn, types.FunctionType):
+        return None
+    h = hashlib.sha256()
+    seen: set[int] = set()
+
+    def feed_code(code: types.CodeType) -> None:
+        h.update(code.co_code)
+        h.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                feed_code(const)
+            elif isinstance(const, frozenset):  # set literal; repr order is per-process
+                h.update(repr(sorted(map(repr, const))).encode())
+            else:
+                h.update(repr(const).encode())
+
+    def feed(f: types.FunctionType) -> None:
+        if id(f) in seen:
+            return
+        seen.add(id(f))
+        feed_code(f.__code__)
+        for name in _names(f.__code__):
+            callee = f.__globals__.get(name)
+            if isinstance(callee, types.FunctionType) and callee.__module__ == fn.__module__:
+                feed(callee)
+
+    feed(fn)
+    return h.hexdigest()[:16]
+
+
+def _names(code: types.CodeType) -> list[str]:
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_names(const))
+    return names
+
+
+def _key(layer: str, tolerance: float, viewport: Viewport, to_d: Callable) -> dict:
+    return {
+        "layer": layer,
+        "cache_version": CACHE_VERSION,
+        "tolerance": tolerance,
+        "viewport": [list(viewport.bbox), viewport.width, viewport.height],
+        "to_d": getattr(to_d, "__qualname__", repr(to_d)),
+        "to_d_code": _code_hash(to_d),
+    }
+
+
+def table_layer(
+    con: duckdb.DuckDBPyConnection,
+    layer: str,
+    sql: str,
+    params: list,
+    tolerance: float,
+    viewport: Viewport,
+    to_d: Callable[[dict], str | None],
+) -> list[Shape]:
+    """Shapes for the (name, geom) rows of `sql`, simplified at `tolerance`.
+
+    Row order is the query's. Errors from the query (e.g. a missing table)
+    propagate unchanged.
+    """
+    src = f"({sql}) AS src(name, geom)"
+    (n, fingerprint) = con.execute(
+        f"""
+        SELECT count(*),
+               md5(coalesce(string_agg(
+                   coalesce(md5(name), '-') || coalesce(md5(ST_AsWKB(geom)), '-'), ','
+                   ORDER BY name, md5(ST_AsWKB(geom))
+               ), ''))
+        FROM {src}
+        """,
+        params,
+    ).fetchone()
+
+    def compute() -> list[tuple[str, dict | None]]:
+        rows = con.execute(
+            f"SELECT name, ST_AsGeoJSON(ST_SimplifyPreserveTopology(geom, ?)) FROM {src}",
+            [tolerance, *params],  # positional: the SELECT's ? precedes the query's
+        ).fetchall()
+        return [(name, json.loads(g) if g else None) for name, g in rows]
+
+    return _cached(_key(layer, tolerance, viewport, to_d), f"{n}:{fingerprint}", compute, to_d)
+
+
+def geojson_layer(
+    con: duckdb.DuckDBPyConnection,
+    layer: str,
+    path: Path,
+    name_key: str,
+    tolerance: float,
+    viewport: Viewport,
+    to_d: Callable[[dict], str | None],
+) -> list[Shape]:
+    """Shapes for each feature of a GeoJSON FeatureCollection, in file order.
+
+    Features are simplified one at a time, so a feature DuckDB cannot parse
+    comes back with geom None instead of failing the layer.
+    """
+    raw = path.read_bytes()
+    version = f"{hashlib.sha256(raw).hexdigest()}:{name_key}"
+
+    def compute() -> list[tuple[str, dict | None]]:
+        out: list[tuple[str, dict | None]] = []
+        for feature in json.loads(raw)["features"]:
+            name = feature["properties"][name_key]
+            try:
+                row = con.execute(
+                    "SELECT ST_AsGeoJSON("
+                    "  ST_SimplifyPreserveTopology(ST_GeomFromGeoJSON(?), ?)"
+                    ")",
+                    [json.dumps(feature["geometry"]), tolerance],
+                ).fetchone()
+            except Exception:  # noqa: BLE001
+                row = None
+            out.append((name, json.loads(row[0]) if row and row[0] else None))
+        return out
+
+    return _cached(_key(layer, tolerance, viewport, to_d), version, compute, to_d)
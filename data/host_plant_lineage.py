@@ -24,6 +24,8 @@ from pathlib import Path
 
 import duckdb
 
+from taxa_pipeline import ensure_taxa_store
+
 DB_PATH = os.environ.get("DB_PATH", str(Path(__file__).parent / "beeatlas.duckdb"))
 RAW_DIR = Path(__file__).parent / "raw"
 TAXA_PATH = RAW_DIR / "taxa.csv.gz"
@@ -32,7 +34,7 @@ TAXA_PATH = RAW_DIR / "taxa.csv.gz"
 def load_host_plant_lineage(db_path: str | None = None) -> None:
     """Populate inaturalist_data.host_plant_lineage from local taxa.csv.gz.
 
-    Reads TAXA_PATH (gzip-compressed TSV), walks the ancestry column for the
+    Reads the parsed taxonomy store for TAXA_PATH, walks the ancestry column for the
     observed host plant taxon_ids (seed set from occurrence_links × observations),
     and materialises the result as inaturalist_data.host_plant_lineage with
     columns: (taxon_id, family, genus).
@@ -66,14 +68,10 @@ def load_host_plant_lineage(db_path: str | None = None) -> None:
                 WHERE o.taxon__id IS NOT NULL
             ),
             all_active_taxa AS (
-                -- All active taxa from the full iNat taxonomy archive.
-                -- active column is string 'true'/'false', not a SQL boolean.
+                -- All active taxa from the parsed iNat taxonomy store.
                 SELECT taxon_id, ancestry, rank, name
-                FROM read_csv(?, delim='\t', header=true, compression='gzip',
-                              columns={'taxon_id':'BIGINT','ancestry':'VARCHAR',
-                                       'rank_level':'INTEGER','rank':'VARCHAR',
-                                       'name':'VARCHAR','active':'VARCHAR'})
-                WHERE active = 'true'
+                FROM read_parquet(?)
+                WHERE active
             ),
             -- Unnest ancestor IDs from the ancestry string (for seed taxa only).
             -- Restricting to seeds here avoids a full walk of all active taxa.
@@ -113,7 +111,7 @@ def load_host_plant_lineage(db_path: str | None = None) -> None:
             FROM pivoted
             WHERE taxon_id IN (SELECT taxon_id FROM host_seed_ids)
             """,
-            [str(TAXA_PATH)],
+            [str(ensure_taxa_store(TAXA_PATH))],
         )
         count = con.execute(
             "SELECT count(*) FROM inaturalist_data.host_plant_lineage"
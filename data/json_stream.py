@@ -0,0 +1,134 @@
+"""Stream a large JSON export artifact to disk without building it as one string.
+
+The exporters used to write their artifacts as
+
+    out_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+which holds the record list, the full encoded str, and its UTF-8 bytes at once
+— several times the artifact's size, on a small build host, for the artifacts
+(collectors, collector events) that grow fastest. json.dump(fh) is no help: it
+falls back to the pure-Python encoder and is several times slower.
+
+write_json(path, value, ...) walks the top `depth` levels of value itself and
+hands each element below them to json.dumps (the C encoder), writing as it
+goes. Peak memory is one element's text, and a streamed level may be a
+generator, so a caller can produce records on demand instead of as a list.
+The bytes are identical to the json.dumps call it replaces:
+
+    indent=2                   json.dumps(v, indent=2)
+    compact=True               json.dumps(v, separators=(",", ":"))
+    sort_keys=True             ... sort_keys=True (at every level)
+    neither                    json.dumps(v)
+
+That holds because json.dumps never emits a raw newline inside a string, so an
+element encoded at level 0 is moved to level n by indenting each of its
+newlines. The file is written to a sibling temp path and renamed into place, so
+a failed export never leaves a truncated artifact behind.
+"""
+
+import json
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+
+def _key(key) -> str:
+    """A dict key as json.dumps writes it (str, or a scalar it coerces)."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _streams(value) -> bool:
+    """True for the containers write_json walks itself at a streamed level."""
+    return isinstance(value, (Mapping, list, tuple, Iterator))
+
+
+def _chunks(
+    value,
+    depth: int,
+    level: int,
+    indent: str | None,
+    item_sep: str,
+    key_sep: str,
+    sort_keys: bool,
+) -> Iterator[str]:
+    if depth == 0 or not _streams(value):
+        text = json.dumps(
+            value,
+            indent=indent,
+            separators=(item_sep, key_sep),
+            sort_keys=sort_keys,
+        )
+        if indent is not None and level:
+            text = text.replace("\n", "\n" + indent * level)
+        yield text
+        return
+
+    if isinstance(value, Mapping):
+        items: Iterable = value.items()
+        if sort_keys:
+            items = sorted(items, key=lambda kv: kv[0])
+        open_, close = "{", "}"
+    else:
+        items = value
+        open_, close = "[", "]"
+    inner = "" if indent is None else "\n" + indent * (level + 1)
+
+    first = True
+    for item in items:
+        yield (open_ + inner) if first else (item_sep + inner)
+        first = False
+        if open_ == "{":
+            key, item = item
+            yield json.dumps(_key(key)) + key_sep
+        yield from _chunks(item, depth - 1, level + 1, indent, item_sep, key_sep, sort_keys)
+    if first:
+        yield open_ + close
+    else:
+        yield ("" if indent is None else "\n" + indent * level) + close
+
+
+def write_json(
+    path: Path,
+    value,
+    *,
+    indent: int | None = None,
+    compact: bool = False,
+    sort_keys: bool = False,
+    depth: int = 1,
+) -> None:
+    """Write value to path as json.dumps would, streaming its top `depth` levels.
+
+    indent and compact are exclusive: compact=True is the separators=(",", ":")
+    wire format. A list, tuple, dict or iterator at a streamed level is written
+    element by element; anything deeper is encoded whole by json.dumps.
+    """
+    if indent is not None and compact:
+        raise ValueError("write_json: indent and compact are exclusive")
+    if compact:
+        item_sep, key_sep = ",", ":"
+    elif indent is not None:
+        item_sep, key_sep = ",", ": "
+    else:
+        item_sep, key_sep = ", ", ": "
+    indent_str = None if indent is None else " " * indent
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            for chunk in _chunks(value, depth, 0, indent_str, item_sep, key_sep, sort_keys):
+                fh.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
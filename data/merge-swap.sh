@@ -11,10 +11,12 @@
 #      files it reuses; without that, `rsync -a` would carry their old mtimes here
 #      and `-mtime +30` would eventually delete the live bundle out from under the
 #      pages referencing it. If you change either side, change both.
-#   b. stable-URL dirs with --delete so removed species/places prune.
+#   b. stable-URL dirs with --delete so removed species/places/patches prune —
+#      db-patches/index.json excepted, held back for d.
 #   c. the page tree with --delete (excluding /assets and /data).
-#   d. manifest.json LAST and atomically: every name it resolves already
-#      exists by the time readers (and the SW's NetworkFirst route) see it.
+#   d. db-patches/index.json, then manifest.json, LAST and atomically: every
+#      name each resolves already exists by the time readers (and the SW's
+#      NetworkFirst route) see it.
 #
 # Exit 3 (distinct from any rsync failure) when SITE_ROOT does not exist —
 # callers decide whether that is a skip (nightly on a fresh host) or a
@@ -36,10 +38,13 @@ fi
 mkdir -p "$SITE_ROOT/data"
 rsync -a "$REPO_ROOT/_site/assets/" "$SITE_ROOT/assets/"
 rsync -a --exclude='/manifest.json' --exclude='/feeds' \
-    --exclude='/species-maps' --exclude='/place-maps' \
+    --exclude='/species-maps' --exclude='/place-maps' --exclude='/db-patches' \
     "$REPO_ROOT/_site/data/" "$SITE_ROOT/data/"
-for _dir in feeds species-maps place-maps; do
-    rsync -a --delete "$REPO_ROOT/_site/data/$_dir/" "$SITE_ROOT/data/$_dir/"
+# scripts/postbuild-data.mjs skips a STABLE_DIRS dir its export lacks (db-patches
+# is absent whenever nightly's patch step was skipped); keep the served copy then.
+for _dir in feeds species-maps place-maps db-patches; do
+    [[ -d "$REPO_ROOT/_site/data/$_dir" ]] || continue
+    rsync -a --delete --exclude='/index.json' "$REPO_ROOT/_site/data/$_dir/" "$SITE_ROOT/data/$_dir/"
 done
 # /build-log.html is the Stelis operator page (stelis st-9rf) — served from
 # SITE_ROOT but written by nightly.sh's trap, never part of _site, so the page
@@ -52,5 +57,9 @@ rsync -a --delete --exclude='/assets' --exclude='/data' \
     "$REPO_ROOT/_site/" "$SITE_ROOT/"
 find "$SITE_ROOT/assets" -type f -mtime +30 -delete
 find "$SITE_ROOT/data" -maxdepth 1 -type f -name '*-*.*' -mtime +30 -delete
+if [[ -f "$REPO_ROOT/_site/data/db-patches/index.json" ]]; then
+    cp "$REPO_ROOT/_site/data/db-patches/index.json" "$SITE_ROOT/data/db-patches/.index.json.tmp"
+    mv "$SITE_ROOT/data/db-patches/.index.json.tmp" "$SITE_ROOT/data/db-patches/index.json"
+fi
 cp "$REPO_ROOT/_site/data/manifest.json" "$SITE_ROOT/data/.manifest.json.tmp"
 mv "$SITE_ROOT/data/.manifest.json.tmp" "$SITE_ROOT/data/manifest.json"
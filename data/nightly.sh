@@ -118,6 +118,10 @@ TAXA_CACHE_PATH="$SCRIPT_DIR/raw/taxa_cache.json"
 # (beeatlas-923).
 export SOURCE_DATE_EPOCH="${SOURCE_DATE_EPOCH:-$(date +%s)}"
 
+# species_maps renders serially by default; this host is dedicated to the run,
+# so the nightly opts its map render into one process per CPU (--workers).
+export SPECIES_MAPS_WORKERS="${SPECIES_MAPS_WORKERS:-$(nproc)}"
+
 _ts() { date -u +%Y-%m-%dT%H:%M:%SZ; }
 _hash() { sha256sum "$1" | awk '{print $1}'; }
 _elapsed() { echo $(( $(date +%s) - $1 ))s; }
@@ -503,6 +507,40 @@ else
     echo "integration gate passed in $(_elapsed $_t0)"
 fi
 
+# 4a. Weekly (Sundays) full-rebuild check of the incremental place membership
+# behind occurrence_places (dbt/tests/assert_place_membership_matches_full_rebuild.sql):
+# the one full-cost point-in-polygon join left, so it does not run nightly. The
+# day is decided HERE and passed in as a var — a date expression inside the dbt
+# test would be frozen by partial parsing and Stelis's build cache. A hard gate:
+# a stale membership must not publish. VERIFY_PLACE_MEMBERSHIP=1 forces it.
+if [[ "$(date +%u)" == 7 || -n "${VERIFY_PLACE_MEMBERSHIP:-}" ]]; then
+    _stage="place-membership-check"
+    echo "--- place membership full-rebuild check ---"
+    _t0=$(date +%s)
+    if ! bash "$SCRIPT_DIR/dbt/run.sh" test -s assert_place_membership_matches_full_rebuild \
+            --vars '{verify_place_membership: true}'; then
+        echo "PLACE MEMBERSHIP CHECK FAILED in $(_elapsed $_t0) — aborting publish" >&2
+        echo "  repair: bash data/dbt/run.sh build --full-refresh -s int_place_membership+" >&2
+        exit 1
+    fi
+    echo "place membership check passed in $(_elapsed $_t0)"
+fi
+
+# 4b. occurrences.db delta patches (db_patch.py): diff the last PUBLISHED DB
+# (snapshotted in step 7) against tonight's, verify the patch reproduces
+# tonight's content digest, and rewrite $EXPORT_DIR/db-patches/index.json —
+# published as the stable db-patches/ dir. Non-fatal: without a patch, clients
+# simply take the full download.
+echo "--- occurrences.db delta patch ---"
+cd "$SCRIPT_DIR"
+if [[ -f "$BASELINE_DIR/occurrences.db" ]]; then
+    uv run python db_patch.py --previous "$BASELINE_DIR/occurrences.db" \
+        --current "$EXPORT_DIR/occurrences.db" --out-dir "$EXPORT_DIR/db-patches" \
+        || echo "WARN: db_patch failed — publishing without a delta patch" >&2
+else
+    echo "  no published occurrences.db snapshot yet — no patch tonight"
+fi
+
 # 5. Render the site. 11ty inlines the baked artifacts straight from
 # $EXPORT_DIR (lib/build-data-dir.js honors the env), Vite hashes the
 # bundles, and the postbuild step derives _site/data (hashed runtime
@@ -574,6 +612,9 @@ fi
 if [[ -n "$_published" ]]; then
     echo "--- snapshotting integration baseline ---"
     _copy_baseline "$EXPORT_DIR" "$BASELINE_DIR"
+    # The delta-patch base for step 4b: the occurrences.db that just went live.
+    cp "$EXPORT_DIR/occurrences.db" "$BASELINE_DIR/.occurrences.db.tmp"
+    mv "$BASELINE_DIR/.occurrences.db.tmp" "$BASELINE_DIR/occurrences.db"
 else
     echo "publish skipped — baseline snapshot skipped (stays at last published)"
 fi
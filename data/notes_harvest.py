@@ -33,6 +33,7 @@ from pathlib import Path
 
 from sqlalchemy.orm import Session
 
+from json_stream import write_json
 from notes_store.db import make_engine
 from notes_store.models import Note, User
 
@@ -149,9 +150,7 @@ def export_notes(
             notes_by_species.setdefault(note.canonical_name, []).append(record)
 
     for canonical_name, notes in notes_by_species.items():
-        (notes_dir / f"{canonical_name}.json").write_text(
-            json.dumps(notes, sort_keys=True, indent=2), encoding="utf-8"
-        )
+        write_json(notes_dir / f"{canonical_name}.json", notes, sort_keys=True, indent=2)
 
     scope = f"{len(rebuild_keys)} key(s)" if rebuild_keys is not None else "all species"
     print(  # noqa: T201
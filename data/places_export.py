@@ -22,6 +22,8 @@ from pathlib import Path
 
 import duckdb
 
+from export_context import occurrences_source, parquet_source
+from json_stream import write_json
 from places_load import KIND_SITE
 
 
@@ -47,9 +49,10 @@ def _query_counts(
 
     Phase 160: place_slug is no longer a scalar column on the
     occurrences mart. Membership lives in the occurrence_places bridge keyed by
-    the synthetic occ_id. We rebuild the Option-B occ_id over occurrences.parquet
-    (the same CASE priority as occIdFromRow in src/occurrence.ts:23-30 — positionally
-    coupled), JOIN the bridge on occ_id, and GROUP BY place_slug. Because an
+    the synthetic occ_id. The occurrences mart materializes the Option-B occ_id
+    (dbt macros/occ_id.sql — the same CASE priority as occIdFromRow in
+    src/occurrence.ts:23-30, positionally coupled), we JOIN the bridge on occ_id,
+    and GROUP BY place_slug. Because an
     occurrence in A∩B has two bridge rows, it is counted under BOTH place_slugs —
     the intended double-count; per-place totals may exceed the global count.
 
@@ -65,19 +68,7 @@ def _query_counts(
             f"{bridge_parquet} not found — run dbt before places-export"
         )
     rows = con.execute(
-        """
-        WITH occ AS (
-            SELECT *,
-                -- Option-B synthetic occ_id; mirrors occIdFromRow priority
-                -- (src/occurrence.ts:23-30 — positionally coupled with the bridge).
-                CASE
-                    WHEN ecdysis_id IS NOT NULL THEN 'ecdysis:' || ecdysis_id
-                    WHEN observation_id IS NOT NULL THEN 'inat:' || observation_id
-                    WHEN specimen_observation_id IS NOT NULL THEN 'inat_obs:' || specimen_observation_id
-                    WHEN checklist_id IS NOT NULL THEN 'checklist:' || checklist_id
-                END AS occ_id
-            FROM read_parquet(?)
-        )
+        f"""
         SELECT
             b.place_slug,
             -- Canonical "confirmed specimen" predicate: ecdysis_id IS NOT NULL.
@@ -86,30 +77,14 @@ def _query_counts(
             -- sample-only iNat rows (ecdysis_id IS NULL, is_provisional = false).
             COUNT(DISTINCT CASE WHEN occ.ecdysis_id IS NOT NULL THEN occ.occ_id END) AS specimen_count,
             COUNT(DISTINCT CASE WHEN occ.sample_id IS NOT NULL THEN occ.sample_id END) AS sample_count
-        FROM occ JOIN read_parquet(?) b ON b.occ_id = occ.occ_id
+        FROM {occurrences_source(con, occ_parquet)} occ
+        JOIN {parquet_source(con, bridge_parquet)} b ON b.occ_id = occ.occ_id
         GROUP BY b.place_slug
-        """,
-        [str(occ_parquet), str(bridge_parquet)],
+        """
     ).fetchall()
     return {row[0]: {"specimen_count": int(row[1]), "sample_count": int(row[2])} for row in rows}
 
 
-# Shared occ_id synthesis CTE — identical priority to _query_counts / occIdFromRow
-# (src/occurrence.ts:23-30). Reused by the per-place species and month queries so
-# the bridge JOIN sees the same synthetic occ_id everywhere.
-_OCC_ID_CTE = """
-    WITH occ AS (
-        SELECT *,
-            CASE
-                WHEN ecdysis_id IS NOT NULL THEN 'ecdysis:' || ecdysis_id
-                WHEN observation_id IS NOT NULL THEN 'inat:' || observation_id
-                WHEN specimen_observation_id IS NOT NULL THEN 'inat_obs:' || specimen_observation_id
-                WHEN checklist_id IS NOT NULL THEN 'checklist:' || checklist_id
-            END AS occ_id
-        FROM read_parquet(?)
-    )
-"""
-
 # Below this many dated records a peak month is noise, not signal (cyv / phase 1
 # design: "don't fabricate a pattern from noise"). The month bars still render.
 _PEAK_MIN_RECORDS = 10
@@ -133,17 +108,15 @@ def _query_species_by_place(
             f"{species_parquet} not found — run species-export before places-export"
         )
     rows = con.execute(
-        _OCC_ID_CTE
-        + """
+        f"""
         SELECT b.place_slug, sp.genus, sp.scientificName, sp.slug, COUNT(*) AS cnt
-        FROM occ
-        JOIN read_parquet(?) b ON b.occ_id = occ.occ_id
-        LEFT JOIN read_parquet(?) sp ON sp.taxon_id = occ.taxon_id
+        FROM {occurrences_source(con, occ_parquet)} occ
+        JOIN {parquet_source(con, bridge_parquet)} b ON b.occ_id = occ.occ_id
+        LEFT JOIN {parquet_source(con, species_parquet)} sp ON sp.taxon_id = occ.taxon_id
         WHERE occ.tier = 'atlas' AND sp.specific_epithet IS NOT NULL
         GROUP BY b.place_slug, sp.genus, sp.scientificName, sp.slug
         ORDER BY b.place_slug, sp.genus, sp.scientificName
-        """,
-        [str(occ_parquet), str(bridge_parquet), str(species_parquet)],
+        """
     ).fetchall()
     # SQL ORDER BY (slug, genus, scientificName) makes dict insertion order correct;
     # genera come out alphabetical, species alphabetical within genus.
@@ -171,15 +144,13 @@ def _query_collection_months(
     collected here' signal (peak-framed); rows lacking a month are excluded.
     """
     rows = con.execute(
-        _OCC_ID_CTE
-        + """
+        f"""
         SELECT b.place_slug, occ.month, COUNT(*) AS cnt
-        FROM occ
-        JOIN read_parquet(?) b ON b.occ_id = occ.occ_id
+        FROM {occurrences_source(con, occ_parquet)} occ
+        JOIN {parquet_source(con, bridge_parquet)} b ON b.occ_id = occ.occ_id
         WHERE occ.tier = 'atlas' AND occ.month IS NOT NULL
         GROUP BY b.place_slug, occ.month
-        """,
-        [str(occ_parquet), str(bridge_parquet)],
+        """
     ).fetchall()
     result: dict[str, list[int]] = {}
     for slug, month, cnt in rows:
@@ -210,18 +181,17 @@ def _query_target_hosts_by_place(
     if not _TARGET_HOSTS_CSV.exists():
         raise FileNotFoundError(f"{_TARGET_HOSTS_CSV} not found — the target_hosts seed is required")
     rows = con.execute(
-        _OCC_ID_CTE
-        + """
+        f"""
         SELECT b.place_slug, th.canonical_name, th.family, th.endemic, COUNT(*) AS cnt
-        FROM occ
-        JOIN read_parquet(?) b ON b.occ_id = occ.occ_id
+        FROM {occurrences_source(con, occ_parquet)} occ
+        JOIN {parquet_source(con, bridge_parquet)} b ON b.occ_id = occ.occ_id
         JOIN read_csv(?, header=true, all_varchar=true) th
           ON lower(th.canonical_name) = lower(occ.sample_host)
         WHERE occ.tier = 'atlas' AND occ.sample_host IS NOT NULL
         GROUP BY b.place_slug, th.canonical_name, th.family, th.endemic
         ORDER BY b.place_slug, cnt DESC, th.canonical_name
         """,
-        [str(occ_parquet), str(bridge_parquet), str(_TARGET_HOSTS_CSV)],
+        [str(_TARGET_HOSTS_CSV)],
     ).fetchall()
     by_slug: dict[str, list[dict]] = {}
     for slug, name, family, endemic, cnt in rows:
@@ -260,7 +230,7 @@ def _write_place_details(
                 "target_hosts": target_hosts_by_place.get(slug, []),
             }
         )
-    out_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    write_json(out_path, records, indent=2)
     print(  # noqa: T201
         f"  place_details.json: {len(records):,} places, {out_path.stat().st_size:,} bytes"
     )
@@ -280,17 +250,18 @@ def _write_places_geojson(con: duckdb.DuckDBPyConnection, out_path: Path, kind:
         "WHERE kind = ? ORDER BY slug",
         [kind],
     ).fetchall()
-    features = [
+    # A generator: each feature's geometry is parsed only as it is written.
+    features = (
         {
             "type": "Feature",
             "properties": {"slug": slug, "name": name},
             "geometry": json.loads(geom_json),
         }
         for slug, name, geom_json in rows
-    ]
+    )
     fc = {"type": "FeatureCollection", "features": features}
-    out_path.write_text(json.dumps(fc, separators=(",", ":")), encoding="utf-8")
-    print(f"  {out_path.name}: {len(features):,} features, {out_path.stat().st_size:,} bytes")  # noqa: T201
+    write_json(out_path, fc, compact=True, depth=2)
+    print(f"  {out_path.name}: {len(rows):,} features, {out_path.stat().st_size:,} bytes")  # noqa: T201
 
 
 def _write_places_json(
@@ -328,7 +299,7 @@ def _write_places_json(
                 "sample_count": c["sample_count"],
             }
         )
-    out_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    write_json(out_path, records, indent=2)
     print(f"  places.json: {len(records):,} places, {out_path.stat().st_size:,} bytes")  # noqa: T201
 
 
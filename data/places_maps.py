@@ -13,12 +13,17 @@ Usage:
 """
 
 import os
-from collections import defaultdict
 from pathlib import Path
 
 import duckdb
 
-from species_maps import _load_county_geojsons, _build_county_backdrop, _write_species_svg
+from export_context import occurrences_source, parquet_source
+from species_maps import (
+    _build_county_backdrop,
+    _fetch_dots_by_key,
+    _load_county_geojsons,
+    _write_species_svg,
+)
 
 DB_PATH = os.environ.get('DB_PATH', str(Path(__file__).parent / 'beeatlas.duckdb'))
 _default_assets = str(Path(__file__).parent.parent / 'public' / 'data')
@@ -63,29 +68,23 @@ def generate_place_maps(con: duckdb.DuckDBPyConnection | None = None) -> None:
         backdrop = _build_county_backdrop(county_geojsons)
 
         # place membership lives in the occurrence_places
-        # bridge (no scalar place_slug column). Rebuild the Option-B occ_id over
-        # occurrences.parquet (same CASE priority as occIdFromRow,
-        # src/occurrence.ts:23-30 — positionally coupled), JOIN the bridge, and
+        # bridge (no scalar place_slug column). The occurrences mart carries the
+        # Option-B occ_id (same CASE priority as occIdFromRow,
+        # src/occurrence.ts:23-30 — positionally coupled), we JOIN the bridge, and
         # group points per place_slug. A point whose occurrence is in two places
         # has two bridge rows, so it lands in both by_slug lists → both SVGs.
-        rows = con.execute(
-            """
-            WITH occ AS (
-                SELECT *,
-                    CASE
-                        WHEN ecdysis_id IS NOT NULL THEN 'ecdysis:' || ecdysis_id
-                        WHEN observation_id IS NOT NULL THEN 'inat:' || observation_id
-                        WHEN specimen_observation_id IS NOT NULL THEN 'inat_obs:' || specimen_observation_id
-                        WHEN checklist_id IS NOT NULL THEN 'checklist:' || checklist_id
-                    END AS occ_id
-                FROM read_parquet(?)
-            )
+        # Fetched as NumPy columns and projected/clipped/formatted in bulk
+        # (species_maps._dots_by_key) — the ORDER BY below also does the grouping.
+        by_slug = _fetch_dots_by_key(
+            con,
+            f"""
             -- DISTINCT defends against bridge fan-out: if one occ_id ever lands in a
             -- place twice (no structural uniqueness on (occ_id, place_slug)), the
             -- point must not be plotted/clipped twice within a single place (D-05:
             -- double-count is intended ACROSS places only). See WR-01.
             SELECT DISTINCT b.place_slug, occ.lon, occ.lat
-            FROM occ JOIN read_parquet(?) b ON b.occ_id = occ.occ_id
+            FROM {occurrences_source(con, occurrences_parquet)} occ
+            JOIN {parquet_source(con, bridge_parquet)} b ON b.occ_id = occ.occ_id
             WHERE occ.lon IS NOT NULL AND occ.lat IS NOT NULL
             -- Total order over the projected columns so per-place dot EMISSION
             -- order is deterministic: without it DuckDB's parallel scan returns
@@ -95,16 +94,11 @@ def generate_place_maps(con: duckdb.DuckDBPyConnection | None = None) -> None:
             -- SITE 3, the places_maps analogue of SITE 1/2).
             ORDER BY b.place_slug, occ.lon, occ.lat
             """,
-            [str(occurrences_parquet), str(bridge_parquet)],
-        ).fetchall()
-
-        by_slug: dict[str, list[tuple[float, float]]] = defaultdict(list)
-        for slug, lon, lat in rows:
-            by_slug[slug].append((lon, lat))
+        )
 
         total_clipped = 0
-        for slug, points in sorted(by_slug.items()):
-            clipped = _write_species_svg(slug, points, set(), county_geojsons, backdrop, maps_dir)
+        for slug, dots in sorted(by_slug.items()):
+            clipped = _write_species_svg(slug, dots, set(), county_geojsons, backdrop, maps_dir)
             total_clipped += clipped
 
         print(  # noqa: T201
@@ -21,7 +21,6 @@ Decisions honored: D-01, D-02, D-04, D-05, D-06, D-08
 """
 
 import csv
-import gzip
 import os
 import time
 from pathlib import Path
@@ -29,6 +28,8 @@ from pathlib import Path
 import duckdb
 
 from canonical_name import normalize_scientific_name
+from taxa_pipeline import ensure_taxa_store
+from taxon_tree import TaxonTree
 
 # ---------------------------------------------------------------------------
 # Module-level path constants
@@ -47,6 +48,10 @@ INAT_TAXA_URL = "https://api.inaturalist.org/v1/taxa"
 
 _GBIF_PACE_SECONDS = 0.3
 
+# TaxonTree over the taxa dict compute_lca() was last given; rebuilt whenever a
+# different dict object is passed in (same cache as checklist_pipeline._TAXA_TREE).
+_TAXA_TREE: tuple[dict, TaxonTree] | None = None
+
 # WR-03: characters that trigger spreadsheet formula evaluation if a CSV cell
 # begins with one of them. Curator-facing CSVs are hardened against CSV formula
 # injection on write.
@@ -74,63 +79,47 @@ def _load_anthophila_ancestry(taxa_path: str) -> dict[str, dict]:
 
     Returns a mapping of lowercased canonical name →
         {'taxon_id': int, 'ancestry': str}
-    Reads taxa.csv.gz (tab-delimited, columns: taxon_id, ancestry, rank_level,
-    rank, name, active).
+    Reads the parsed taxonomy store built from taxa.csv.gz (see
+    taxa_pipeline.ensure_taxa_store). A missing archive yields an empty mapping.
     """
-    result: dict[str, dict] = {}
-    try:
-        with gzip.open(taxa_path, "rt", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh, delimiter="\t")
-            for row in reader:
-                ancestry = row.get("ancestry", "") or ""
-                active = str(row.get("active", "")).lower()
-                rank = str(row.get("rank", "")).lower()
-                if "/630955/" not in ancestry:
-                    continue
-                if active != "true":
-                    continue
-                if rank not in ("species", "subspecies"):
-                    continue
-                name = (row.get("name") or "").strip().lower()
-                if not name:
-                    continue
-                try:
-                    taxon_id = int(row["taxon_id"])
-                except (KeyError, ValueError):
-                    continue
-                result[name] = {"taxon_id": taxon_id, "ancestry": ancestry}
-    except FileNotFoundError:
-        pass
-    return result
+    if not Path(taxa_path).exists():
+        return {}
+    with duckdb.connect(":memory:") as con:
+        rows = con.execute(
+            """
+            SELECT lower(trim(name)), taxon_id, ancestry
+            FROM read_parquet(?)
+            WHERE active
+              AND is_anthophila
+              AND lower(rank) IN ('species', 'subspecies')
+              AND trim(coalesce(name, '')) <> ''
+            ORDER BY taxon_id, rank_level
+            """,
+            [str(ensure_taxa_store(taxa_path))],
+        ).fetchall()
+    return {name: {"taxon_id": taxon_id, "ancestry": ancestry} for name, taxon_id, ancestry in rows}
 
 
 def compute_lca(name1: str, name2: str, taxa: dict) -> int | None:
     """Compute lowest-common-ancestor taxon_id for two canonical names.
 
-    Uses the full ancestry path (ancestry + '/' + taxon_id). Returns the
-    last taxon_id where both paths agree, or None if either name is absent.
+    Uses the full ancestry path (ancestry + '/' + taxon_id) via a TaxonTree,
+    built once per taxa dict and cached in _TAXA_TREE. Returns the deepest
+    taxon_id on both paths, or None if either name is absent.
 
     Example:
         angelicus full path: .../50086/606634/270393
         texanus   full path: .../50086/606634/1581466/1581468
         LCA: 606634 (subgenus Agapostemon)
     """
+    global _TAXA_TREE
     row1 = taxa.get(name1)
     row2 = taxa.get(name2)
     if row1 is None or row2 is None:
         return None
-
-    path1 = (row1["ancestry"] + "/" + str(row1["taxon_id"])).split("/")
-    path2 = (row2["ancestry"] + "/" + str(row2["taxon_id"])).split("/")
-
-    lca_id: str | None = None
-    for a, b in zip(path1, path2):
-        if a == b:
-            lca_id = a
-        else:
-            break
-
-    return int(lca_id) if lca_id else None
+    if _TAXA_TREE is None or _TAXA_TREE[0] is not taxa:
+        _TAXA_TREE = (taxa, TaxonTree.from_ancestry_map(taxa))
+    return _TAXA_TREE[1].lca(row1["taxon_id"], row2["taxon_id"])
 
 
 def _split_slash_compound(verbatim_name: str) -> tuple[str, str] | None:
@@ -24,6 +24,7 @@ import duckdb
 import requests
 
 from inaturalist_pipeline import _inat_get_with_retry, _INAT_PACE_SECONDS
+from taxa_pipeline import ensure_taxa_store
 
 # The nightly pipeline (data/nightly.sh) runs with DB_PATH=/tmp/beeatlas.duckdb. A manual
 # `uv run python resolve_taxon_ids.py --refresh-lineage` from the data/ directory WITHOUT
@@ -128,16 +129,17 @@ def generate_inactive_remaps() -> None:
     con = duckdb.connect(DB_PATH)
     # Computed from __file__ at call time (not the module-level TAXA_CSV_PATH constant)
     # so the inactive-remap unit tests' __file__ monkeypatch keeps redirecting this read.
-    taxa_path = str(Path(__file__).parent / "raw/taxa.csv.gz")
+    taxa_path = Path(__file__).parent / "raw/taxa.csv.gz"
     try:
-        inactive = con.execute(f"""
+        taxa_store = str(ensure_taxa_store(taxa_path))
+        inactive = con.execute("""
             SELECT b.canonical_name, b.taxon_id, t.name AS inat_name
             FROM inaturalist_data.canonical_to_taxon_id b
-            LEFT JOIN read_csv('{taxa_path}', header=True) t
+            LEFT JOIN read_parquet(?) t
                 ON CAST(t.taxon_id AS INTEGER) = b.taxon_id
-            WHERE t.active = false
+            WHERE NOT t.active
             ORDER BY b.canonical_name
-        """).fetchall()
+        """, [taxa_store]).fetchall()
 
         auto_rows: list[tuple[str, str, str]] = []  # (synonym, accepted_name, source)
         triage_rows: list[dict] = []
@@ -214,11 +216,11 @@ def generate_inactive_remaps() -> None:
 
             if len(successor_ids) == 1:
                 # D-09: look up successor name in local taxa.csv.gz
-                row = con.execute(f"""
-                    SELECT name FROM read_csv('{taxa_path}', header=True)
+                row = con.execute("""
+                    SELECT name FROM read_parquet(?)
                     WHERE CAST(taxon_id AS INTEGER) = ?
-                      AND active = true
-                """, [successor_ids[0]]).fetchone()
+                      AND active
+                """, [taxa_store, successor_ids[0]]).fetchone()
 
                 if row is None:
                     triage_rows.append({
@@ -407,23 +409,10 @@ def _resolve_genus_from_taxa_csv(
         """
         WITH animal_genera AS (
             SELECT lower(name) AS genus_name, taxon_id::INTEGER AS taxon_id
-            FROM read_csv(
-                ?,
-                delim = chr(9),
-                header = true,
-                compression = 'gzip',
-                columns = {
-                    'taxon_id': 'BIGINT',
-                    'ancestry': 'VARCHAR',
-                    'rank_level': 'BIGINT',
-                    'rank': 'VARCHAR',
-                    'name': 'VARCHAR',
-                    'active': 'VARCHAR'
-                }
-            )
+            FROM read_parquet(?)
             WHERE rank = 'genus'
-              AND active = 'true'
-              AND list_contains(string_split(ancestry, '/'), '1')  -- kingdom = Animalia
+              AND active
+              AND list_contains(ancestor_ids, 1)  -- kingdom = Animalia
               AND lower(name) = ?
         )
         SELECT ANY_VALUE(taxon_id) AS taxon_id
@@ -431,7 +420,7 @@ def _resolve_genus_from_taxa_csv(
         GROUP BY genus_name
         HAVING COUNT(*) = 1  -- exclude cross-phylum homonyms (keeps genus resolution unique)
         """,
-        [str(TAXA_CSV_PATH), genus_name],
+        [str(ensure_taxa_store(TAXA_CSV_PATH)), genus_name],
     ).fetchone()
     return row[0] if row else None
 
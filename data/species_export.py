@@ -23,7 +23,6 @@ Usage:
     EXPORT_DIR=data/dbt/target/sandbox uv run python species_export.py
 """
 
-import json
 import os
 from collections import defaultdict
 from pathlib import Path
@@ -33,6 +32,7 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 
 from domain import slugify  # Phase 78 D-01: byte-for-byte slug invariant (Phase 102 PY-01: promoted from private feeds helper)
+from json_stream import write_json
 
 
 DB_PATH = os.environ.get('DB_PATH', str(Path(__file__).parent / 'beeatlas.duckdb'))
@@ -169,10 +169,7 @@ def _build_higher_taxa(con: duckdb.DuckDBPyConnection) -> list[dict]:
     higher_taxa_rows = [dict(zip(cols, r)) for r in rows]
 
     out = ASSETS_DIR / "higher_taxa.json"
-    out.write_text(
-        json.dumps(higher_taxa_rows, sort_keys=True, indent=2),
-        encoding='utf-8',
-    )
+    write_json(out, higher_taxa_rows, sort_keys=True, indent=2)
     print(f"  higher_taxa.json: {len(higher_taxa_rows):,} rows, {out.stat().st_size:,} bytes")
     assert len(higher_taxa_rows) > 0, "higher_taxa.json must be non-empty"
     subfamily_count = sum(1 for r in higher_taxa_rows if r['rank'] == 'subfamily')
@@ -192,8 +189,8 @@ def export_species_parquet(con: duckdb.DuckDBPyConnection) -> None:
 
     Writes seven artifacts to ASSETS_DIR:
       - species.parquet             (23 cols including taxon_id + slug)
-      - species.json                (json.dumps sort_keys=True, indent=2)
-      - seasonality.json            (json.dumps sort_keys=True, separators=(',', ':'))
+      - species.json                (sort_keys=True, indent=2)
+      - seasonality.json            (sort_keys=True, compact separators)
       - photos.json                 (CC-licensed iNat obs photos, keyed by canonical_name)
       - species_hosts.json          (per-bee floral host families/genera from sample data, Phase 175)
       - higher_taxa.json            (dbt rollup: all higher-rank taxa with counts + membership)
@@ -328,10 +325,7 @@ def export_species_parquet(con: duckdb.DuckDBPyConnection) -> None:
     # indent=2 keeps the file diff-friendly; the on-disk size is ~150 KB at
     # production scale.
     species_json_out = ASSETS_DIR / "species.json"
-    species_json_out.write_text(
-        json.dumps(_jsonify_rows(species_rows), sort_keys=True, indent=2),
-        encoding='utf-8',
-    )
+    write_json(species_json_out, _jsonify_rows(species_rows), sort_keys=True, indent=2)
     print(
         f"  species.json: {len(species_rows):,} rows, "
         f"{species_json_out.stat().st_size:,} bytes"
@@ -366,10 +360,7 @@ def export_species_parquet(con: duckdb.DuckDBPyConnection) -> None:
         k: dict(sorted(v.items())) for k, v in sorted(seasonality.items())
     }
     seas_out = ASSETS_DIR / "seasonality.json"
-    seas_out.write_text(
-        json.dumps(out_seas, sort_keys=True, separators=(',', ':')),
-        encoding='utf-8',
-    )
+    write_json(seas_out, out_seas, sort_keys=True, compact=True)
     seas_size = seas_out.stat().st_size
     print(f"  seasonality.json: {len(out_seas):,} species, {seas_size:,} bytes")
     assert seas_size < 6 * 1024 * 1024, (
@@ -399,10 +390,7 @@ def export_species_parquet(con: duckdb.DuckDBPyConnection) -> None:
     except Exception as exc:  # noqa: BLE001
         print(f"  photos.json: WARNING — inat_obs_data.observations not available ({exc}); writing empty dict")
     photos_out = ASSETS_DIR / "photos.json"
-    photos_out.write_text(
-        json.dumps(photos, sort_keys=True, indent=2),
-        encoding='utf-8',
-    )
+    write_json(photos_out, photos, sort_keys=True, indent=2)
     print(f"  photos.json: {len(photos):,} species, {photos_out.stat().st_size:,} bytes")
 
     # ---- Phase 175: species_hosts.json ----------------------------------------
@@ -450,10 +438,7 @@ def export_species_parquet(con: duckdb.DuckDBPyConnection) -> None:
         print("  species_hosts.json: WARNING — species_host_plants.parquet not found; writing empty object")
 
     hosts_out = ASSETS_DIR / "species_hosts.json"
-    hosts_out.write_text(
-        json.dumps(hosts, sort_keys=True, indent=2),
-        encoding='utf-8',
-    )
+    write_json(hosts_out, hosts, sort_keys=True, indent=2)
     print(f"  species_hosts.json: {len(hosts):,} species, {hosts_out.stat().st_size:,} bytes")
 
     # ---- D-03: higher_taxa.json (replaces higher_rank_taxon_ids.json) -------
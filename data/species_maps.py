@@ -12,7 +12,11 @@ NOT per-element fill/stroke. Browsers honor <style> blocks inside
 <img src=".svg"> in image mode (only external CSS and scripts are blocked).
 
 Per D-04 (CONTEXT.md): wipe-and-rewrite the species-maps/ directory at
-the start of each run for idempotency.
+the start of each run for idempotency. --incremental keeps that guarantee
+without the rewrite: each map's inputs are digested into a sidecar index
+(species-maps.index.json, beside the directory so it is never published),
+only maps whose digest changed are rendered, and maps no longer produced are
+deleted — the directory ends up byte-identical to a wipe-and-rewrite.
 
 Per D-02 (CONTEXT.md): state_fips comes from config.STATE_FIPS, NOT
 hardcoded — multi-state expansion deferred but the seam is already here.
@@ -20,22 +24,45 @@ hardcoded — multi-state expansion deferred but the seam is already here.
 Per MAP-04 + Pitfall #5: off-WA-bbox occurrence points are silently
 dropped; clipped count is printed; never raise.
 
+Rendering is CPU-bound and independent per file, so --workers N hands the
+per-map point lists to a process pool (the backdrop goes to each worker once).
+Every file is produced by the same writer either way, so the output is
+byte-identical to the serial path (--workers 1, the default). The CLI default
+comes from SPECIES_MAPS_WORKERS, which the nightly sets to the host's CPU count;
+an interactive run stays serial unless asked.
+
+--aggregate snaps projected dots to a pixel grid and collapses each species'
+duplicates (optionally sizing or shading a dot by its count), coarsening the
+grid until a map fits --max-map-bytes; see DotAggregation. Off by default —
+the per-occurrence output above is the compatibility contract.
+
 Usage:
-    cd data && uv run python species_maps.py
+    cd data && uv run python species_maps.py [--workers N] [--incremental]
+        [--aggregate {dedupe,radius,opacity}] [--dot-grid PX] [--max-map-bytes N]
 """
 
+import argparse
 import colorsys
 import copy
+import hashlib
 import json
+import multiprocessing
 import os
 import shutil
+import weakref
 import xml.etree.ElementTree as ET
 from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 import duckdb
+import numpy as np
 
+import geometry_cache
 from config import STATE_FIPS
+from export_context import occurrences_source, parquet_source
 
 DB_PATH = os.environ.get('DB_PATH', str(Path(__file__).parent / 'beeatlas.duckdb'))
 _default_assets = str(Path(__file__).parent.parent / 'public' / 'data')
@@ -48,6 +75,26 @@ VIEWBOX = "0 0 600 320"
 SVG_WIDTH = 600
 SVG_HEIGHT = 320
 
+# Folded into every map digest (see _map_digest). Bump when the writers' output
+# changes in a way the backdrop text does not show, so --incremental rewrites all.
+MAPS_RENDER_VERSION = 1
+MAP_INDEX_NAME = "species-maps.index.json"
+# Layout of the index entries: [digest, clipped, plain_bytes, bytes].
+_MAP_INDEX_FORMAT = 2
+
+# Dot geometry. One occurrence is an r=2.5 circle; under DotAggregation(encode=
+# "radius") a cell of n points grows with area ~ n up to DOT_RADIUS_MAX, and
+# under encode="opacity" it ramps from DOT_MIN_OPACITY to opaque at
+# DOT_FULL_OPACITY_AT points.
+DOT_RADIUS = 2.5
+DOT_RADIUS_MAX = 7.5
+DOT_MIN_OPACITY = 0.35
+DOT_FULL_OPACITY_AT = 32
+
+# CLI default for --workers: serial unless the environment opts in (nightly.sh
+# exports SPECIES_MAPS_WORKERS). generate_species_maps() itself defaults to serial.
+DEFAULT_WORKERS = int(os.environ.get("SPECIES_MAPS_WORKERS", "1"))
+
 # WA bbox verified live 2026-05-03 (CONTEXT §Specifics): minlon, minlat, maxlon, maxlat.
 WA_BBOX = (-124.85, 45.54, -116.92, 49.00)
 
@@ -72,15 +119,145 @@ def _in_bbox(lon: float, lat: float) -> bool:
     return minx <= lon <= maxx and miny <= lat <= maxy
 
 
+def _project_array(lon: np.ndarray, lat: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """_project over float64 arrays: the same operations in the same order, so
+    every x, y is bit-identical to the scalar result."""
+    minx, miny, maxx, maxy = WA_BBOX
+    x = (lon - minx) / (maxx - minx) * SVG_WIDTH
+    y = SVG_HEIGHT - (lat - miny) / (maxy - miny) * SVG_HEIGHT
+    return x, y
+
+
+def _in_bbox_array(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    minx, miny, maxx, maxy = WA_BBOX
+    return (minx <= lon) & (lon <= maxx) & (miny <= lat) & (lat <= maxy)
+
+
+class _Dots(NamedTuple):
+    """A point set, projected, clipped and formatted once for every map it is on.
+
+    attrs holds the ready `cx="…" cy="…" r="2.5"` attribute text of each in-bbox
+    point in point order; x and y are the same points' projected coordinates
+    (for DotAggregation); clipped counts the points dropped outside WA_BBOX
+    (MAP-04). Group maps draw the same species at genus, subgenus, tribe and
+    subfamily level, so formatting here rather than per map multiplies the
+    savings.
+    """
+    attrs: list[str]
+    clipped: int
+    x: np.ndarray
+    y: np.ndarray
+
+
+_NO_DOTS = _Dots([], 0, np.empty(0), np.empty(0))
+
+
+def _dots_by_key(keys: np.ndarray, lon: np.ndarray, lat: np.ndarray) -> dict[str, _Dots]:
+    """Project, clip and format all points at once, then split them by key.
+
+    Rows must arrive grouped by key (ORDER BY key, …); each key's points keep
+    their row order.
+    """
+    if len(keys) == 0:
+        return {}
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    inside = _in_bbox_array(lon, lat)
+    x, y = _project_array(lon[inside], lat[inside])
+    attrs = [f'cx="{a:.2f}" cy="{b:.2f}" r="2.5"' for a, b in zip(x.tolist(), y.tolist())]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.append(starts[1:], len(keys))
+    # Position of each group's first in-bbox point within attrs.
+    kept_before = np.concatenate(([0], np.cumsum(inside)))
+    out: dict[str, _Dots] = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        lo, hi = int(kept_before[start]), int(kept_before[end])
+        out[keys[start]] = _Dots(attrs[lo:hi], (end - start) - (hi - lo), x[lo:hi], y[lo:hi])
+    return out
+
+
+def _dots(points) -> _Dots:
+    """_Dots for a point list of (lon, lat) tuples; an existing _Dots passes through."""
+    if isinstance(points, _Dots):
+        return points
+    if len(points) == 0:
+        return _NO_DOTS
+    arr = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return _dots_by_key(np.zeros(len(arr), dtype=np.int8), arr[:, 0], arr[:, 1])[0]
+
+
+class DotAggregation(NamedTuple):
+    """Density aggregation for the map dots (generate_species_maps(aggregation=…)).
+
+    Each species' projected points are snapped to a grid_px pixel grid and the
+    points sharing a cell collapse into one dot at the cell centre, in order of
+    first appearance. encode=None keeps every dot r=2.5 (pure de-duplication);
+    "radius" grows a dot's area with its count; "opacity" shades it. If a map
+    would still exceed max_bytes, the grid doubles until it fits or reaches
+    max_grid_px.
+    """
+    encode: str | None = None
+    grid_px: float = 1.0
+    max_bytes: int | None = None
+    max_grid_px: float = 16.0
+
+
+def _fmt_num(v: float) -> str:
+    """Two decimals, trailing zeros dropped: 2.5 -> "2.5", 1.0 -> "1"."""
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+def _aggregate_attrs(dots: _Dots, grid_px: float, encode: str | None) -> list[str]:
+    """One circle's attribute text per occupied grid cell of `dots`."""
+    if not dots.attrs:
+        return []
+    cx = np.floor(dots.x / grid_px).astype(np.int64)
+    cy = np.floor(dots.y / grid_px).astype(np.int64)
+    _cells, first, counts = np.unique(cx * (1 << 32) + cy, return_index=True, return_counts=True)
+    order = np.argsort(first, kind="stable")
+    first, counts = first[order], counts[order]
+    x = np.minimum((cx[first] + 0.5) * grid_px, SVG_WIDTH)
+    y = np.minimum((cy[first] + 0.5) * grid_px, SVG_HEIGHT)
+    if encode == "radius":
+        radii = [_fmt_num(r) for r in np.minimum(DOT_RADIUS * np.sqrt(counts), DOT_RADIUS_MAX).tolist()]
+    else:
+        radii = [_fmt_num(DOT_RADIUS)] * len(counts)
+    if encode == "opacity":
+        ramp = np.log2(counts) / np.log2(DOT_FULL_OPACITY_AT)
+        opacity = [
+            f' opacity="{_fmt_num(o)}"'
+            for o in np.minimum(1.0, DOT_MIN_OPACITY + (1 - DOT_MIN_OPACITY) * ramp).tolist()
+        ]
+    elif encode in (None, "radius"):
+        opacity = [""] * len(counts)
+    else:
+        raise ValueError(f"unknown dot encoding {encode!r}")
+    # Attribute order is ET's sorted order: cx, cy, opacity, r.
+    return [
+        f'cx="{a:.2f}" cy="{b:.2f}"{o} r="{r}"'
+        for a, b, o, r in zip(x.tolist(), y.tolist(), opacity, radii)
+    ]
+
+
+def _fetch_dots_by_key(con: duckdb.DuckDBPyConnection, sql: str, params: list | None = None) -> dict[str, _Dots]:
+    """Run `SELECT key, lon, lat … ORDER BY key, …` and return its points as
+    _Dots per key, fetched as NumPy columns rather than per-row tuples."""
+    cols = con.execute(sql, params or []).fetchnumpy()
+    key, lon, lat = (cols[c] for c in list(cols)[:3])
+    return _dots_by_key(np.asarray(key), lon, lat)
+
+
 def _ring_to_path(coords: list[list[float]]) -> str:
     """One GeoJSON LinearRing → SVG path 'd' attribute (closed)."""
-    pts = [_project(lon, lat) for lon, lat in coords]
+    ring = np.asarray(coords, dtype=np.float64)
+    x, y = _project_array(ring[:, 0], ring[:, 1])
+    pts = list(zip(x.tolist(), y.tolist()))
     head = f"M{pts[0][0]:.2f},{pts[0][1]:.2f}"
     tail = "".join(f"L{x:.2f},{y:.2f}" for x, y in pts[1:])
     return head + tail + "Z"
 
 
-def _load_county_geojsons(con: duckdb.DuckDBPyConnection) -> dict[str, dict]:
+def _load_county_geojsons(con: duckdb.DuckDBPyConnection) -> geometry_cache.Layer:
     """Fetch the WA county polygon set as a county_name -> GeoJSON dict mapping.
 
     D-02: state_fips comes from config (not hardcoded). MAP-03: uses
@@ -89,24 +266,55 @@ def _load_county_geojsons(con: duckdb.DuckDBPyConnection) -> dict[str, dict]:
 
     Returns dict[str, dict] keyed by county name (e.g. "King") so callers
     can look up county geometry by name for checklist-county fill rendering.
+    The mapping is a geometry_cache.Layer: simplification and each county's
+    path string are computed once per county-table version, not per run.
     """
-    rows = con.execute(
-        """
-        SELECT name,
-               ST_AsGeoJSON(
-                   ST_SimplifyPreserveTopology(geom, 0.005)
-               )
-        FROM geographies.us_counties
-        WHERE state_fips = ?
-        """,
+    return geometry_cache.Layer(geometry_cache.table_layer(
+        con,
+        "wa-counties",
+        "SELECT name, geom FROM geographies.us_counties WHERE state_fips = ?",
         [STATE_FIPS],
-    ).fetchall()
-    return {name: json.loads(g) for name, g in rows}
+        0.005,
+        geometry_cache.Viewport(WA_BBOX, SVG_WIDTH, SVG_HEIGHT),
+        _polygon_d,
+    ))
+
+
+def _county_d(county_geojsons: dict[str, dict], name: str, geom: dict) -> str | None:
+    """A county's path 'd': from the Layer's cache when it has one, else projected."""
+    paths = getattr(county_geojsons, "paths", None)
+    if paths is not None and name in paths and county_geojsons.get(name) is geom:
+        return paths[name]
+    return _polygon_d(geom)
+
+
+def _escape_attr(value: str) -> str:
+    """Escape an attribute value exactly as ElementTree's serializer does."""
+    return (
+        value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        .replace('"', "&quot;").replace("\r", "&#13;").replace("\n", "&#10;")
+        .replace("\t", "&#09;")
+    )
+
+
+def _polygon_d(geom: dict) -> str | None:
+    """SVG path 'd' for a Polygon / MultiPolygon GeoJSON geometry; None otherwise."""
+    gtype = geom.get("type")
+    if gtype == "Polygon":
+        return " ".join(_ring_to_path(ring) for ring in geom["coordinates"])
+    if gtype == "MultiPolygon":
+        return " ".join(
+            _ring_to_path(ring)
+            for poly in geom["coordinates"]
+            for ring in poly
+        )
+    return None
 
 
 def _build_county_backdrop(county_geojsons: dict[str, dict]) -> ET.Element:
     """Build the <svg> root with a single <style> block + one <path class="county">
-    per county polygon. Deepcopied per species and then occurrence circles append.
+    per county polygon. Not modified afterwards: each map streams through the
+    backdrop's _SvgTemplate, which serializes it once per process.
     """
     root = ET.Element(
         f"{{{SVG_NS}}}svg",
@@ -118,17 +326,9 @@ def _build_county_backdrop(county_geojsons: dict[str, dict]) -> ET.Element:
     )
     style = ET.SubElement(root, f"{{{SVG_NS}}}style")
     style.text = STYLE_CSS
-    for geom in county_geojsons.values():
-        gtype = geom.get("type")
-        if gtype == "Polygon":
-            d = " ".join(_ring_to_path(ring) for ring in geom["coordinates"])
-        elif gtype == "MultiPolygon":
-            d = " ".join(
-                _ring_to_path(ring)
-                for poly in geom["coordinates"]
-                for ring in poly
-            )
-        else:  # Point / LineString / etc — skip silently
+    for name, geom in county_geojsons.items():
+        d = _county_d(county_geojsons, name, geom)
+        if d is None:  # Point / LineString / etc — skip silently
             continue
         ET.SubElement(
             root,
@@ -167,88 +367,174 @@ def _group_colors(canonical_names: list[str]) -> dict[str, str]:
     return result
 
 
+class _SvgTemplate:
+    """A backdrop serialized once, into the text before and after its last child.
+
+    The maps used to deepcopy the backdrop per file, append elements, sort every
+    element's attributes, and ET.tostring the whole tree. The output of that
+    path is the compatibility contract: `prefix + children + suffix` reproduces
+    it byte for byte, as long as each appended child is formatted the way ET
+    formats it (sorted attributes, ` />` for empty elements). `empty` is the
+    whole document for a file that appends nothing, where ET self-closes a
+    childless root.
+    """
+
+    _MARK = "__svg_template_children__"
+
+    def __init__(self, backdrop: ET.Element) -> None:
+        root = copy.deepcopy(backdrop)
+        # Idempotency (Phase 78 success criterion 4): sorted attributes give
+        # stable bytes regardless of construction order.
+        for elem in root.iter():
+            if elem.attrib:
+                elem.attrib = dict(sorted(elem.attrib.items()))
+        self.empty = ET.tostring(root, xml_declaration=True, encoding="unicode")
+        ET.SubElement(root, f"{{{SVG_NS}}}{self._MARK}")
+        self.prefix, self.suffix = ET.tostring(
+            root, xml_declaration=True, encoding="unicode"
+        ).split(f"<{self._MARK} />")
+        self._county_paths: dict[tuple[str, str], tuple[dict, str | None]] = {}
+
+    def county_path(self, name: str, counties: dict[str, dict], cls: str) -> str | None:
+        """A county's <path> element, built once per geometry (None if not a polygon)."""
+        geom = counties[name]
+        cached = self._county_paths.get((cls, name))
+        if cached is None or cached[0] is not geom:
+            d = _county_d(counties, name, geom)
+            path = None if d is None else f'<path class="{cls}" d="{_escape_attr(d)}" />'
+            cached = self._county_paths[(cls, name)] = (geom, path)
+        return cached[1]
+
+    def size(self, children: list[str]) -> int:
+        """Byte size write() would produce for these children."""
+        if not children:
+            return len(self.empty.encode())
+        return len(self.prefix.encode()) + len(self.suffix.encode()) + sum(len(c.encode()) for c in children)
+
+    def write(self, out_path: Path, children: list[str]) -> None:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(out_path, "w", encoding="utf-8") as f:
+            if not children:
+                f.write(self.empty)
+                return
+            f.write(self.prefix)
+            f.writelines(children)
+            f.write(self.suffix)
+
+
+# Templates by backdrop. Weak keys: a backdrop built per run (or per test) takes
+# its template with it. Callers do not mutate a backdrop after first use.
+_TEMPLATES: "weakref.WeakKeyDictionary[ET.Element, _SvgTemplate]" = weakref.WeakKeyDictionary()
+
+
+def _template(backdrop: ET.Element) -> _SvgTemplate:
+    template = _TEMPLATES.get(backdrop)
+    if template is None:
+        template = _TEMPLATES[backdrop] = _SvgTemplate(backdrop)
+    return template
+
+
+def _fit_dots(
+    template: _SvgTemplate,
+    fixed: list[str],
+    dot_sets: list[_Dots],
+    set_overheads: list[int],
+    circle_overhead: int,
+    aggregation: DotAggregation | None,
+    stats: dict | None,
+) -> list[list[str]]:
+    """Choose each dot set's circle attributes for one map.
+
+    Without aggregation that is every point's own attrs. With it, the sets are
+    aggregated on one shared grid, doubled until the map fits max_bytes (or the
+    grid reaches max_grid_px). Sizes are computed, not rendered: fixed children
+    plus, per non-empty set, its wrapper overhead and each circle's text.
+    stats, if given, receives the map's plain_bytes (one dot per occurrence)
+    and bytes (as written).
+    """
+    fixed_bytes = template.size(fixed) if fixed else len(template.prefix.encode()) + len(template.suffix.encode())
+
+    def size(sets: list[list[str]]) -> int:
+        if not fixed and not any(sets):
+            return template.size([])
+        return fixed_bytes + sum(
+            overhead + sum(len(a) + circle_overhead for a in attrs)
+            for overhead, attrs in zip(set_overheads, sets) if attrs
+        )
+
+    chosen = [d.attrs for d in dot_sets]
+    plain_bytes = size(chosen)
+    if aggregation is not None:
+        grid = aggregation.grid_px
+        while True:
+            chosen = [_aggregate_attrs(d, grid, aggregation.encode) for d in dot_sets]
+            if (aggregation.max_bytes is None or grid >= aggregation.max_grid_px
+                    or size(chosen) <= aggregation.max_bytes):
+                break
+            grid *= 2
+    if stats is not None:
+        stats["plain_bytes"] = plain_bytes
+        stats["bytes"] = size(chosen)
+    return chosen
+
+
 def _write_species_svg(
     slug: str,
-    points: list[tuple[float, float]],
+    points: "list[tuple[float, float]] | _Dots",
     checklist_counties: set[str],
     county_geojsons_by_name: dict[str, dict],
     backdrop: ET.Element,
     out_dir: Path,
+    aggregation: DotAggregation | None = None,
+    stats: dict | None = None,
 ) -> int:
     """Emit out_dir/<slug>.svg with county fills for checklist counties and
-    one <circle class="occ"> per in-bbox occurrence point.
+    one <circle class="occ"> per in-bbox occurrence point (per occupied grid
+    cell under `aggregation`).
 
     County fills (class="checklist-county") are written BEFORE occurrence dots
     so dots render on top (SVG document order = z-order).
 
+    Streams through the backdrop's _SvgTemplate; without aggregation the bytes
+    are those of the ElementTree build this replaced. `stats` is filled as in
+    _fit_dots.
+
     Returns the number of points dropped because they fell outside WA_BBOX
     (MAP-04 — silent clip, never raise).
     """
-    root = copy.deepcopy(backdrop)
+    template = _template(backdrop)
+    children: list[str] = []
     # 1. Draw checklist county fills BEFORE occurrence dots (SVG render order / Pitfall #4).
-    for county_name, geom in county_geojsons_by_name.items():
+    for county_name in county_geojsons_by_name:
         if county_name not in checklist_counties:
             continue
-        gtype = geom.get("type")
-        if gtype == "Polygon":
-            d = " ".join(_ring_to_path(ring) for ring in geom["coordinates"])
-        elif gtype == "MultiPolygon":
-            d = " ".join(
-                _ring_to_path(ring)
-                for poly in geom["coordinates"]
-                for ring in poly
-            )
-        else:
-            continue
-        ET.SubElement(
-            root,
-            f"{{{SVG_NS}}}path",
-            attrib={"class": "checklist-county", "d": d},
-        )
+        path = template.county_path(county_name, county_geojsons_by_name, "checklist-county")
+        if path is not None:
+            children.append(path)
     # 2. Draw occurrence dots on top.
-    clipped = 0
-    for lon, lat in points:
-        if not _in_bbox(lon, lat):
-            clipped += 1
-            continue
-        x, y = _project(lon, lat)
-        ET.SubElement(
-            root,
-            f"{{{SVG_NS}}}circle",
-            attrib={
-                "class": "occ",
-                "cx": f"{x:.2f}",
-                "cy": f"{y:.2f}",
-                "r": "2.5",
-            },
-        )
-    # Idempotency (Phase 78 success criterion 4): sort attribute dicts so
-    # ET.tostring emits stable byte output across Python invocations.
-    # ET stores attrib as a regular dict and serializes in insertion order;
-    # sorting by key gives deterministic output regardless of construction order.
-    for elem in root.iter():
-        if elem.attrib:
-            elem.attrib = dict(sorted(elem.attrib.items()))
-    out_path = out_dir / f"{slug}.svg"
-    out_path.parent.mkdir(parents=True, exist_ok=True)  # NEW: create Genus/ subdir
-    out_path.write_text(
-        ET.tostring(root, xml_declaration=True, encoding="unicode"),
-        encoding="utf-8",
+    dots = _dots(points)
+    [attrs] = _fit_dots(
+        template, children, [dots], [0], len('<circle class="occ"  />'), aggregation, stats
     )
-    return clipped
+    children.extend(f'<circle class="occ" {a} />' for a in attrs)
+    template.write(out_dir / f"{slug}.svg", children)
+    return dots.clipped
 
 
 def _write_group_svg(
     slug_path: str,
-    species_points: dict[str, list[tuple[float, float]]],
+    species_points: "dict[str, list[tuple[float, float]] | _Dots]",
     colors: dict[str, str],
     backdrop: ET.Element,
     out_dir: Path,
+    aggregation: DotAggregation | None = None,
+    stats: dict | None = None,
 ) -> int:
     """Emit out_dir/<slug_path>.svg with per-species colored circle groups.
 
     Each species gets a <g fill="{color}"> wrapper containing one <circle>
-    per in-bbox occurrence point.  Species with no points are skipped (no
+    per in-bbox occurrence point (per occupied grid cell under `aggregation`,
+    which never merges two species).  Species with no points are skipped (no
     empty <g> emitted).
 
     D-01: species are rendered in alphabetical canonical_name order so the
@@ -257,53 +543,205 @@ def _write_group_svg(
 
     Returns the total number of points dropped outside WA_BBOX (MAP-04).
     """
-    root = copy.deepcopy(backdrop)
-    clipped = 0
-    for canon in sorted(species_points.keys()):
-        pts = species_points[canon]
-        in_bbox_pts = []
-        for lon, lat in pts:
-            if not _in_bbox(lon, lat):
-                clipped += 1
-            else:
-                in_bbox_pts.append((lon, lat))
-        if not in_bbox_pts:
+    template = _template(backdrop)
+    canons = sorted(species_points.keys())
+    dot_sets = [_dots(species_points[c]) for c in canons]
+    opens = [f'<g fill="{_escape_attr(colors.get(c, "#aaaaaa"))}">' for c in canons]
+    sets = _fit_dots(
+        template, [], dot_sets, [len(g) + len("</g>") for g in opens],
+        len("<circle  />"), aggregation, stats,
+    )
+    children: list[str] = []
+    for open_tag, attrs in zip(opens, sets):
+        if not attrs:
             continue  # skip empty groups — no <g> emitted
-        g = ET.SubElement(root, f"{{{SVG_NS}}}g", attrib={"fill": colors.get(canon, '#aaaaaa')})
-        for lon, lat in in_bbox_pts:
-            x, y = _project(lon, lat)
-            ET.SubElement(
-                g,
-                f"{{{SVG_NS}}}circle",
-                attrib={
-                    "cx": f"{x:.2f}",
-                    "cy": f"{y:.2f}",
-                    "r": "2.5",
-                },
-            )
-    # Idempotency: sort attribute dicts so ET.tostring emits stable byte output.
-    for elem in root.iter():
-        if elem.attrib:
-            elem.attrib = dict(sorted(elem.attrib.items()))
-    out_path = out_dir / f"{slug_path}.svg"
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(
-        ET.tostring(root, xml_declaration=True, encoding="unicode"),
-        encoding="utf-8",
+        children.append(open_tag)
+        children.extend(f"<circle {a} />" for a in attrs)
+        children.append("</g>")
+    template.write(out_dir / f"{slug_path}.svg", children)
+    return sum(d.clipped for d in dot_sets)
+
+
+# Per-process state for pooled rendering, set once by _init_map_worker so each
+# task ships only its own points, not the backdrop and county geometry.
+_WORKER_STATE: dict = {}
+
+
+def _init_map_worker(
+    backdrop: ET.Element,
+    county_geojsons: dict[str, dict],
+    aggregation: DotAggregation | None = None,
+) -> None:
+    _WORKER_STATE["backdrop"] = backdrop
+    _WORKER_STATE["county_geojsons"] = county_geojsons
+    _WORKER_STATE["aggregation"] = aggregation
+
+
+def _species_map_job(job: tuple) -> tuple[int, int, int]:
+    """Render one species map; return (clipped, plain_bytes, bytes)."""
+    slug, points, checklist_counties, out_dir = job
+    stats: dict = {}
+    clipped = _write_species_svg(
+        slug, points, checklist_counties,
+        _WORKER_STATE["county_geojsons"], _WORKER_STATE["backdrop"], out_dir,
+        _WORKER_STATE["aggregation"], stats,
+    )
+    return clipped, stats["plain_bytes"], stats["bytes"]
+
+
+def _group_map_job(job: tuple) -> tuple[int, int, int]:
+    """Render one group map; return (clipped, plain_bytes, bytes)."""
+    slug_path, species_points, colors, out_dir = job
+    stats: dict = {}
+    clipped = _write_group_svg(
+        slug_path, species_points, colors, _WORKER_STATE["backdrop"], out_dir,
+        _WORKER_STATE["aggregation"], stats,
+    )
+    return clipped, stats["plain_bytes"], stats["bytes"]
+
+
+def _render_maps(
+    job_fn: Callable[[tuple], tuple[int, int, int]],
+    jobs: list[tuple],
+    backdrop: ET.Element,
+    county_geojsons: dict[str, dict],
+    workers: int,
+    aggregation: DotAggregation | None = None,
+) -> list[tuple[int, int, int]]:
+    """Run job_fn over jobs and return their (clipped, plain_bytes, bytes) in job order.
+
+    workers <= 1 renders in-process (tests, small runs). Otherwise a spawn-context
+    process pool: the caller holds a DuckDB connection, whose threads a fork()
+    would copy mid-flight. Each job writes a distinct file, so the only shared
+    filesystem work is the exist_ok mkdir of a parent directory.
+    """
+    if workers <= 1 or len(jobs) < 2:
+        _init_map_worker(backdrop, county_geojsons, aggregation)
+        return [job_fn(job) for job in jobs]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_map_worker,
+        initargs=(backdrop, county_geojsons, aggregation),
+    ) as pool:
+        return list(pool.map(job_fn, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def _map_digest_base(
+    backdrop: ET.Element,
+    county_geojsons: dict[str, dict],
+    aggregation: DotAggregation | None = None,
+) -> bytes:
+    """The inputs every map shares: render version, aggregation settings,
+    serialized backdrop, counties."""
+    template = _template(backdrop)
+    h = hashlib.sha256(f"v{MAPS_RENDER_VERSION}\0{aggregation!r}\0".encode())
+    h.update(template.prefix.encode())
+    h.update(template.suffix.encode())
+    h.update(json.dumps(county_geojsons, sort_keys=True).encode())
+    return h.digest()
+
+
+def _json_default(v):
+    if isinstance(v, (set, frozenset)):
+        return sorted(v)
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    return str(v)
+
+
+def _map_digest(base: bytes, job_fn: Callable[[tuple], int], job: tuple) -> str:
+    """Digest of one job's inputs (everything but its out_dir) on top of base.
+
+    Point order is part of the input — generate_species_maps sorts each
+    species' points so the digest (and the file) depend on the point set only.
+    """
+    payload = json.dumps(
+        [job_fn.__name__, *job[:-1]],
+        sort_keys=True,
+        default=_json_default,
     )
-    return clipped
+    return hashlib.sha256(base + payload.encode()).hexdigest()
+
+
+def _render_changed(
+    job_fn: Callable[[tuple], tuple[int, int, int]],
+    jobs: list[tuple],
+    backdrop: ET.Element,
+    county_geojsons: dict[str, dict],
+    workers: int,
+    maps_dir: Path,
+    previous: dict[str, list],
+    aggregation: DotAggregation | None = None,
+) -> tuple[list[int], dict[str, list]]:
+    """_render_maps over the jobs whose digest is not in `previous`.
+
+    A job is skipped when previous[<relpath>] holds its digest and the file is
+    still on disk; its counts then come from the index. Returns the clipped
+    counts in job order and the index entries {relpath: [digest, clipped,
+    plain_bytes, bytes]} for every job, rendered or not.
+    """
+    base = _map_digest_base(backdrop, county_geojsons, aggregation)
+    entries: dict[str, list] = {}
+    keys: list[tuple[str, str]] = []
+    todo: list[int] = []
+    for i, job in enumerate(jobs):
+        path = job[-1] / f"{job[0]}.svg"
+        rel = path.relative_to(maps_dir).as_posix()
+        digest = _map_digest(base, job_fn, job)
+        keys.append((rel, digest))
+        old = previous.get(rel)
+        if old is not None and old[0] == digest and path.exists():
+            entries[rel] = old
+        else:
+            todo.append(i)
+    rendered = _render_maps(
+        job_fn, [jobs[i] for i in todo], backdrop, county_geojsons, workers, aggregation
+    )
+    for i, result in zip(todo, rendered):
+        entries[keys[i][0]] = [keys[i][1], *result]
+    return [entries[rel][1] for rel, _d in keys], entries
+
+
+def _load_map_index(path: Path) -> dict[str, list]:
+    """The previous run's {relpath: [digest, clipped, plain_bytes, bytes]};
+    empty if absent or written by another render version or index format."""
+    try:
+        index = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if (index.get("render_version") != MAPS_RENDER_VERSION
+            or index.get("format") != _MAP_INDEX_FORMAT):
+        return {}
+    return index.get("maps", {})
+
+
+def _write_map_index(path: Path, maps: dict[str, list]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(
+        {"render_version": MAPS_RENDER_VERSION, "format": _MAP_INDEX_FORMAT, "maps": maps},
+        sort_keys=True,
+    ))
+    tmp.replace(path)
 
 
 def _generate_group_maps(
     con: duckdb.DuckDBPyConnection,
-    occ_by_canon: dict[str, list[tuple[float, float]]],
+    occ_by_canon: "dict[str, list[tuple[float, float]] | _Dots]",
     backdrop: ET.Element,
     maps_dir: Path,
-) -> None:
+    workers: int = 1,
+    previous: dict[str, list] | None = None,
+    aggregation: DotAggregation | None = None,
+) -> dict[str, list]:
     """Emit multi-color SVGs under maps_dir/{genus,subgenus,tribe,subfamily}/.
 
     Reads species.parquet for group membership; uses occ_by_canon
-    for points (no second DB sweep). MUST NOT wipe maps_dir.
+    for points (no second DB sweep), each species' projected and formatted
+    once (_dots) however many groups draw it. MUST NOT wipe maps_dir. Colors are
+    assigned here; rendering goes through _render_changed with `workers`,
+    skipping maps whose digest is in `previous`. Returns the maps' index
+    entries (see _render_changed).
 
     D-02 coordination: species are rendered in alphabetical canonical_name
     order within each group — Phase 94's Eleventy template must use the same
@@ -319,11 +757,13 @@ def _generate_group_maps(
             f"{species_parquet} not found — run species-export STEP first"
         )
 
+    dots_by_canon = {c: _dots(points) for c, points in occ_by_canon.items()}
+
     rows = con.execute(
         f"""
         SELECT canonical_name, genus, subgenus, tribe, specific_epithet, subfamily,
                occurrence_count, inat_obs_count, checklist_count
-        FROM read_parquet('{species_parquet}')
+        FROM {parquet_source(con, species_parquet)}
         WHERE occurrence_count > 0 OR inat_obs_count > 0 OR checklist_count > 0
            OR on_checklist = true
         ORDER BY canonical_name
@@ -372,7 +812,7 @@ def _generate_group_maps(
         if subfamily:
             subfamily_members[subfamily].append(canonical_name)
 
-    total_clipped = 0
+    jobs: list[tuple] = []
     n_genus = 0
     n_subgenus = 0
     n_tribe = 0
@@ -396,7 +836,7 @@ def _generate_group_maps(
     genus_dir = maps_dir / "genus"
     for genus_name in sorted(genus_members.keys()):
         members = genus_members[genus_name]
-        species_points = {c: occ_by_canon.get(c, []) for c in members}
+        species_points = {c: dots_by_canon.get(c, _NO_DOTS) for c in members}
         # A hue is a POSITION in this list, so it must hold exactly the members
         # _data/species.js colors — the mapped ones. Members that draw nothing are
         # left out of the palette entirely and fall back to grey below; they emit
@@ -426,32 +866,32 @@ def _generate_group_maps(
             for c in members:
                 if c in unresolved or c not in mapped:
                     colors[c] = _UNRESOLVED_COLOR
-        total_clipped += _write_group_svg(genus_name, species_points, colors, backdrop, genus_dir)
+        jobs.append((genus_name, species_points, colors, genus_dir))
         n_genus += 1
 
     # Subgenus maps: subgenus/<Genus>/<Subgenus>.svg
     subgenus_dir = maps_dir / "subgenus"
     for (genus_name, subgenus_name) in sorted(subgenus_members.keys()):
         members = subgenus_members[(genus_name, subgenus_name)]
-        species_points = {c: occ_by_canon.get(c, []) for c in members}
+        species_points = {c: dots_by_canon.get(c, _NO_DOTS) for c in members}
         colors = _group_colors([c for c in members if c in mapped])
         for c in members:
             if c in unresolved or c not in mapped:
                 colors[c] = _UNRESOLVED_COLOR
         slug_path = f"{genus_name}/{subgenus_name}"
-        total_clipped += _write_group_svg(slug_path, species_points, colors, backdrop, subgenus_dir)
+        jobs.append((slug_path, species_points, colors, subgenus_dir))
         n_subgenus += 1
 
     # Tribe maps: tribe/<Tribe>.svg
     tribe_dir = maps_dir / "tribe"
     for tribe_name in sorted(tribe_members.keys()):
         members = tribe_members[tribe_name]
-        species_points = {c: occ_by_canon.get(c, []) for c in members}
+        species_points = {c: dots_by_canon.get(c, _NO_DOTS) for c in members}
         colors = _group_colors([c for c in members if c in mapped])
         for c in members:
             if c in unresolved or c not in mapped:
                 colors[c] = _UNRESOLVED_COLOR
-        total_clipped += _write_group_svg(tribe_name, species_points, colors, backdrop, tribe_dir)
+        jobs.append((tribe_name, species_points, colors, tribe_dir))
         n_tribe += 1
 
     # Subfamily maps: subfamily/<Subfamily>.svg  (colored by GENUS — D-06)
@@ -473,26 +913,42 @@ def _generate_group_maps(
                 colors[c] = _UNRESOLVED_COLOR
             else:
                 colors[c] = genus_colors.get(genus_of.get(c, ''), _UNRESOLVED_COLOR)
-        species_points = {c: occ_by_canon.get(c, []) for c in members}
-        total_clipped += _write_group_svg(
-            subfamily_name, species_points, colors, backdrop, subfamily_dir
-        )
+        species_points = {c: dots_by_canon.get(c, _NO_DOTS) for c in members}
+        jobs.append((subfamily_name, species_points, colors, subfamily_dir))
         n_subfamily += 1
 
+    clipped_counts, entries = _render_changed(
+        _group_map_job, jobs, backdrop, {}, workers, maps_dir, previous or {}, aggregation
+    )
+    total_clipped = sum(clipped_counts)
     print(
         f"  species-maps/groups: {n_genus + n_subgenus + n_tribe + n_subfamily:,} files "
         f"({n_genus} genus, {n_subgenus} subgenus, {n_tribe} tribe, {n_subfamily} subfamily), "
         f"{total_clipped:,} total points clipped"
     )
+    return entries
 
 
-def generate_species_maps(con: duckdb.DuckDBPyConnection | None = None) -> None:
+def generate_species_maps(
+    con: duckdb.DuckDBPyConnection | None = None,
+    workers: int = 1,
+    incremental: bool = False,
+    aggregation: DotAggregation | None = None,
+) -> None:
     """Emit one <slug>.svg per species with mappable evidence (occurrence,
-    iNat expert observation, or checklist listing).
+    iNat expert observation, or checklist listing), then the group maps.
+
+    workers > 1 renders both sets in a process pool (see _render_maps); the
+    files are byte-identical to the serial run.
 
     D-04 idempotency: wipe and recreate the species-maps directory at the
     start of each run — guarantees no stale files for species whose
     canonical_name changed or whose occurrence_count dropped to zero.
+    incremental=True gets the same end state by rendering only maps whose
+    digest differs from the sidecar index and deleting every .svg this run
+    did not produce. Either mode rewrites the index.
+
+    aggregation collapses dense dots (DotAggregation) and prints what it saved.
     """
     own_con = con is None
     if own_con:
@@ -500,13 +956,18 @@ def generate_species_maps(con: duckdb.DuckDBPyConnection | None = None) -> None:
         con.execute("INSTALL spatial; LOAD spatial;")
 
     try:
-        # D-04 — wipe-and-rewrite for idempotency.
+        # D-04 — wipe-and-rewrite for idempotency, unless incremental.
         maps_dir = ASSETS_DIR / "species-maps"
-        if maps_dir.exists():
+        index_path = ASSETS_DIR / MAP_INDEX_NAME
+        previous: dict[str, list] = {}
+        if incremental:
+            previous = _load_map_index(index_path)
+        elif maps_dir.exists():
             shutil.rmtree(maps_dir)
-        maps_dir.mkdir(parents=True)
+        maps_dir.mkdir(parents=True, exist_ok=True)
 
-        # Build the county backdrop once and deepcopy per species.
+        # Build the county backdrop once; every map (species and group) renders
+        # through its one serialized template.
         county_geojsons = _load_county_geojsons(con)
         backdrop = _build_county_backdrop(county_geojsons)
 
@@ -521,7 +982,7 @@ def generate_species_maps(con: duckdb.DuckDBPyConnection | None = None) -> None:
         species_rows = con.execute(
             f"""
             SELECT canonical_name, slug
-            FROM read_parquet('{species_parquet}')
+            FROM {parquet_source(con, species_parquet)}
             WHERE (occurrence_count > 0 OR inat_obs_count > 0 OR on_checklist = true)
               AND specific_epithet IS NOT NULL
             ORDER BY canonical_name
@@ -536,21 +997,21 @@ def generate_species_maps(con: duckdb.DuckDBPyConnection | None = None) -> None:
             raise FileNotFoundError(
                 f"{occurrences_parquet} not found — run dbt before species-maps"
             )
-        occ_rows = con.execute(
+        # Points come back as NumPy columns, grouped by species and ordered by
+        # (lon, lat) so a map (and its digest) changes only when its point set
+        # does, never with the parquet's row order. Projection, clipping and
+        # coordinate formatting then happen once, in bulk (_dots_by_key).
+        occ_by_canon = _fetch_dots_by_key(
+            con,
             f"""
             SELECT canonical_name, lon, lat
-            FROM read_parquet('{occurrences_parquet}')
+            FROM {occurrences_source(con, occurrences_parquet)}
             WHERE canonical_name IS NOT NULL
               AND lat IS NOT NULL
               AND lon IS NOT NULL
-            """
-        ).fetchall()
-
-        occ_by_canon: dict[str, list[tuple[float, float]]] = defaultdict(list)
-        for canon, lon, lat in occ_rows:
-            if lon is None or lat is None:
-                continue
-            occ_by_canon[canon].append((lon, lat))
+            ORDER BY canonical_name, lon, lat
+            """,
+        )
 
         # Read checklist.parquet once into per-species county sets.
         checklist_counties_by_canon: dict[str, set[str]] = defaultdict(set)
@@ -566,36 +1027,101 @@ def generate_species_maps(con: duckdb.DuckDBPyConnection | None = None) -> None:
             for canon, county in cl_rows:
                 checklist_counties_by_canon[canon].add(county)
 
+        jobs = [
+            (slug, occ_by_canon.get(canon, _NO_DOTS), checklist_counties_by_canon.get(canon, set()), maps_dir)
+            for canon, slug in species_rows
+        ]
+        clipped_counts, index = _render_changed(
+            _species_map_job, jobs, backdrop, county_geojsons, workers, maps_dir, previous,
+            aggregation,
+        )
         total_clipped = 0
         written = 0
-        for canon, slug in species_rows:
-            points = occ_by_canon.get(canon, [])
-            checklist_counties = checklist_counties_by_canon.get(canon, set())
-            clipped = _write_species_svg(
-                slug, points, checklist_counties, county_geojsons, backdrop, maps_dir
-            )
+        for (slug, *_rest), clipped in zip(jobs, clipped_counts):
             if clipped:
                 # MAP-04 + Pitfall #5: log silently, NEVER raise.
                 print(f"  species-maps/{slug}.svg: {clipped} points clipped")
                 total_clipped += clipped
             written += 1
 
-        total_size = sum(p.stat().st_size for p in maps_dir.rglob('*.svg'))
+        total_size = sum((maps_dir / f"{slug}.svg").stat().st_size for slug, *_rest in jobs)
         print(
             f"  species-maps/: {written:,} files, {total_size:,} bytes, "
             f"{total_clipped:,} total points clipped"
         )
 
-        _generate_group_maps(con, occ_by_canon, backdrop, maps_dir)
+        index.update(
+            _generate_group_maps(
+                con, occ_by_canon, backdrop, maps_dir,
+                workers=workers, previous=previous, aggregation=aggregation,
+            )
+        )
+        if aggregation is not None:
+            _print_aggregation_report(index, aggregation)
+
+        # D-04 under --incremental: drop every map this run did not produce.
+        deleted = 0
+        for path in sorted(maps_dir.rglob("*.svg")):
+            if path.relative_to(maps_dir).as_posix() not in index:
+                path.unlink()
+                deleted += 1
+        for d in sorted((p for p in maps_dir.rglob("*") if p.is_dir()), reverse=True):
+            if not any(d.iterdir()):
+                d.rmdir()
+        _write_map_index(index_path, index)
+        if incremental:
+            unchanged = sum(1 for rel, entry in index.items() if previous.get(rel) is entry)
+            print(
+                f"  species-maps/ incremental: {len(index) - unchanged:,} rewritten, "
+                f"{unchanged:,} unchanged, {deleted:,} deleted"
+            )
     finally:
         if own_con:
             con.close()
 
 
-def main() -> None:
+def _print_aggregation_report(index: dict[str, list], aggregation: DotAggregation) -> None:
+    """Bytes saved by DotAggregation across every map of the run (from the index)."""
+    plain = sum(entry[2] for entry in index.values())
+    written = sum(entry[3] for entry in index.values())
+    saved = plain - written
+    pct = 100.0 * saved / plain if plain else 0.0
+    print(f"  species-maps/ aggregation: {plain:,} -> {written:,} bytes ({saved:,} saved, {pct:.1f}%)")
+    largest = sorted(index.items(), key=lambda kv: kv[1][2], reverse=True)[:5]
+    for rel, entry in largest:
+        print(f"    {rel}: {entry[2]:,} -> {entry[3]:,} bytes")
+    if aggregation.max_bytes is not None:
+        over = sorted(rel for rel, entry in index.items() if entry[3] > aggregation.max_bytes)
+        if over:
+            print(
+                f"  ! {len(over)} maps exceed {aggregation.max_bytes:,} bytes even at "
+                f"{aggregation.max_grid_px:g}px cells: {', '.join(over[:5])}"
+            )
+
+
+def main(argv: list[str] | None = None) -> None:
     """Generate per-species SVGs from beeatlas.duckdb."""
+    parser = argparse.ArgumentParser(description="Per-species and group SVG occurrence maps.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="render processes; 1 renders serially (default: $SPECIES_MAPS_WORKERS, else 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"rewrite only maps whose inputs changed since {MAP_INDEX_NAME}")
+    parser.add_argument("--aggregate", choices=("dedupe", "radius", "opacity"),
+                        help="collapse dots sharing a grid cell; radius/opacity encode the count")
+    parser.add_argument("--dot-grid", type=float, default=DotAggregation().grid_px,
+                        help="aggregation cell size in SVG pixels (default: %(default)s)")
+    parser.add_argument("--max-map-bytes", type=int,
+                        help="per-map size budget; the grid coarsens until a map fits")
+    args = parser.parse_args(argv)
+    aggregation = None
+    if args.aggregate:
+        aggregation = DotAggregation(
+            encode=None if args.aggregate == "dedupe" else args.aggregate,
+            grid_px=args.dot_grid,
+            max_bytes=args.max_map_bytes,
+        )
     print("Connecting to DuckDB...")
-    generate_species_maps()
+    generate_species_maps(workers=args.workers, incremental=args.incremental, aggregation=aggregation)
     print("Done.")
 
 
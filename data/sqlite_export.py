@@ -8,12 +8,19 @@ The module can also be imported and called programmatically:
     generate_sqlite(Path("dbt/target/sandbox/occurrences.parquet"), Path("/tmp/occurrences.db"))
 """
 
+import hashlib
 import json
 import os
+import re
 import sqlite3 as _sqlite3
+import struct
 from pathlib import Path
 
 import duckdb
+import numpy as np
+
+from export_context import _OCC_ID_COLUMNS, OCC_ID_SQL
+from taxa_pipeline import ensure_taxa_store
 
 _DBT_SANDBOX = Path(__file__).parent / "dbt" / "target" / "sandbox"
 _EXPORT_DIR = Path(os.environ.get(
@@ -25,15 +32,6 @@ DB_PATH = os.environ.get("DB_PATH", str(Path(__file__).parent / "beeatlas.duckdb
 
 ANTHOPHILA_ID = 630955
 
-_TAXA_READ_CSV_OPTS = """
-    delim = chr(9), header = true, compression = 'gzip',
-    columns = {
-        taxon_id: BIGINT, ancestry: VARCHAR, rank_level: BIGINT,
-        rank: VARCHAR, name: VARCHAR, active: VARCHAR
-    }
-"""
-
-
 def _build_taxon_hierarchy(
     con: duckdb.DuckDBPyConnection,
     dst_db: Path,
@@ -134,22 +132,23 @@ def _build_taxon_hierarchy(
         # DETACH out in generate_sqlite() (WR-04: no stdlib write while ATTACHed).
         return
 
+    # Every pass below reads the parsed, taxon_id-sorted taxonomy store rather than
+    # re-decompressing taxa.csv.gz; is_anthophila there is the same
+    # ancestry LIKE '%/630955/%' OR '%/630955' OR taxon_id = 630955 test, done once.
+    store = str(ensure_taxa_store(taxa_path))
+
     # Build the occurrence-seeded bee taxon_ids in DuckDB memory.
     # These are occurrence taxon_ids whose taxa.csv.gz row is active Anthophila.
     con.execute("""
         CREATE TEMP TABLE _bee_seed AS
         SELECT DISTINCT o.taxon_id
         FROM out.occurrences o
-        JOIN read_csv(?, """ + _TAXA_READ_CSV_OPTS + """) t
+        JOIN read_parquet(?) t
           ON t.taxon_id = o.taxon_id
         WHERE o.taxon_id IS NOT NULL
-          AND t.active = 'true'
-          AND (
-              t.ancestry LIKE '%/630955/%'
-              OR t.ancestry LIKE '%/630955'
-              OR t.taxon_id = 630955
-          )
-    """, [str(taxa_path)])
+          AND t.active
+          AND t.is_anthophila
+    """, [store])
 
     # Add checklist taxon_ids to the seed (if any resolved).
     # CR-02: apply the same Anthophila ancestry guard the occurrence seed uses, so a
@@ -161,15 +160,11 @@ def _build_taxon_hierarchy(
         con.execute(f"""
             INSERT INTO _bee_seed
             SELECT DISTINCT t.taxon_id
-            FROM read_csv(?, {_TAXA_READ_CSV_OPTS}) t
+            FROM read_parquet(?) t
             WHERE t.taxon_id IN ({placeholders})
-              AND (
-                  t.ancestry LIKE '%/630955/%'
-                  OR t.ancestry LIKE '%/630955'
-                  OR t.taxon_id = 630955
-              )
+              AND t.is_anthophila
               AND t.taxon_id NOT IN (SELECT taxon_id FROM _bee_seed)
-        """, [str(taxa_path)] + checklist_ids)
+        """, [store] + checklist_ids)
 
     # Expand: seed ∪ ancestor taxon_ids AT/BELOW the Anthophila root ∪ root itself.
     # WR-01: unnest only the suffix of `ancestry` from 630955 onward, NOT the whole
@@ -187,18 +182,19 @@ def _build_taxon_hierarchy(
                 regexp_extract(t.ancestry, '(630955(?:/[0-9]+)*)$', 1), '/'
             )) AS BIGINT
         ) AS ancestor_id
-        FROM read_csv(?, """ + _TAXA_READ_CSV_OPTS + """) t
+        FROM read_parquet(?) t
         WHERE t.taxon_id IN (SELECT taxon_id FROM _bee_seed)
           AND t.ancestry IS NOT NULL AND t.ancestry != ''
           AND regexp_extract(t.ancestry, '(630955(?:/[0-9]+)*)$', 1) != ''
         UNION
         SELECT CAST(""" + str(ANTHOPHILA_ID) + """ AS BIGINT)
-    """, [str(taxa_path)])
+    """, [store])
 
     # PASS 1 LOAD: INSERT INTO out.taxa (Anthophila arm).
     # WHERE NOT IN (SELECT taxon_id FROM out.taxa) is the INSERT OR IGNORE equivalent
     # for DuckDB's SQLite extension (which does not support ON CONFLICT syntax).
-    # active = 'true' (string literal — boolean TRUE matches zero rows, Pitfall 4).
+    # active is a real BOOLEAN in the taxonomy store (parsed from the archive's
+    # 'true'/'false' strings once, in ensure_taxa_store — Pitfall 4 lives there now).
     # rank IN (...) includes 'complex' per Pitfall 6 and 'subtribe' because the
     # ancestry-expansion step (_bee_taxon_ids) includes all ancestor taxon_ids —
     # some lineage paths pass through subtribe nodes; omitting subtribe from the
@@ -228,7 +224,7 @@ def _build_taxon_hierarchy(
                     1
                 ) || '/' AS lineage_path,
                 1 AS is_anthophila
-            FROM read_csv(?, """ + _TAXA_READ_CSV_OPTS + """) t
+            FROM read_parquet(?) t
             WHERE t.taxon_id IN (SELECT taxon_id FROM _bee_taxon_ids)
               AND t.rank IN (
                   'family', 'subfamily', 'tribe', 'subtribe', 'genus', 'subgenus',
@@ -242,11 +238,11 @@ def _build_taxon_hierarchy(
             -- partition key.
             QUALIFY ROW_NUMBER() OVER (
                 PARTITION BY t.taxon_id
-                ORDER BY (t.active = 'true') DESC, t.rank_level ASC
+                ORDER BY t.active DESC, t.rank_level ASC
             ) = 1
         ) lp
         WHERE lp.lineage_path LIKE '/630955/%'
-    """, [str(taxa_path)])
+    """, [store])
 
     # PASS 2: INSERT INTO out.taxa (bycatch arm).
     # Every occurrence taxon_id NOT already in out.taxa (i.e. not Anthophila) gets
@@ -268,24 +264,20 @@ def _build_taxon_hierarchy(
             t.name,
             NULL AS lineage_path,
             0 AS is_anthophila
-        FROM read_csv(?, """ + _TAXA_READ_CSV_OPTS + """) t
+        FROM read_parquet(?) t
         WHERE t.taxon_id IN (
             SELECT DISTINCT taxon_id
             FROM out.occurrences
             WHERE taxon_id IS NOT NULL
               AND taxon_id NOT IN (SELECT taxon_id FROM out.taxa)
         )
-          AND NOT (
-              t.ancestry LIKE '%/630955/%'
-              OR t.ancestry LIKE '%/630955'
-              OR t.taxon_id = 630955
-          )
+          AND NOT t.is_anthophila
         -- WR-03: deterministic tiebreak (prefer active, then finest rank).
         QUALIFY ROW_NUMBER() OVER (
             PARTITION BY t.taxon_id
-            ORDER BY (t.active = 'true') DESC, t.rank_level ASC
+            ORDER BY t.active DESC, t.rank_level ASC
         ) = 1
-    """, [str(taxa_path)])
+    """, [store])
 
     # ---- Drop temp tables -----------------------------------------------------
     con.execute("DROP TABLE IF EXISTS _bee_seed")
@@ -402,11 +394,602 @@ def _assert_no_orphan_taxon_ids(db_path: Path) -> None:
         )
 
 
+def _build_taxon_ancestors(dst_db: Path) -> None:
+    """Write the taxon_ancestors closure table derived from taxa.lineage_path.
+
+    One row per (ancestor_id, taxon_id) pair on every Anthophila lineage, where
+    depth is the number of edges between them, plus a depth-0 self row for EVERY
+    taxa row (bycatch included). A taxon filter is then a primary-key range:
+
+        o.taxon_id IN (SELECT taxon_id FROM taxon_ancestors WHERE ancestor_id = N)
+
+    which selects exactly what `o.taxon_id = N OR instr(lineage_path, '/N/') > 0`
+    does, without the full taxa scan the instr() form forces. WITHOUT ROWID keeps
+    the PK (ancestor_id, taxon_id) clustered, so the descendant lookup reads one
+    contiguous B-tree range; idx_taxon_ancestors_taxon covers the reverse
+    (ancestors-of) direction.
+
+    Runs after _assert_no_orphan_taxon_ids(), so every lineage_path it parses has
+    already passed the lineage_path well-formedness gate.
+    """
+    with _sqlite3.connect(dst_db) as con:
+        con.execute("""
+            CREATE TABLE taxon_ancestors (
+                ancestor_id INTEGER NOT NULL,
+                taxon_id    INTEGER NOT NULL,
+                depth       INTEGER NOT NULL,
+                PRIMARY KEY (ancestor_id, taxon_id)
+            ) WITHOUT ROWID
+        """)
+        pairs: list[tuple[int, int, int]] = []
+        for taxon_id, lineage_path in con.execute(
+            "SELECT taxon_id, lineage_path FROM taxa"
+        ).fetchall():
+            path = [int(seg) for seg in (lineage_path or "").strip("/").split("/") if seg]
+            if not path or path[-1] != taxon_id:
+                path.append(taxon_id)
+            last = len(path) - 1
+            pairs.extend((anc, taxon_id, last - i) for i, anc in enumerate(path))
+        pairs.sort()
+        con.executemany("INSERT INTO taxon_ancestors VALUES (?, ?, ?)", pairs)
+        con.execute(
+            "CREATE INDEX idx_taxon_ancestors_taxon ON taxon_ancestors(taxon_id, depth)"
+        )
+
+
+# Viewport filter over occurrences_rtree. The R*Tree stores 32-bit floats rounded
+# outward, so the range test returns a superset of candidates and the exact
+# lat/lon BETWEEN recheck stays in the clause. Bind :west/:south/:east/:north.
+OCCURRENCES_RTREE_BBOX_FILTER = (
+    "o.rowid IN (SELECT id FROM occurrences_rtree "
+    "WHERE min_lon <= :east AND max_lon >= :west "
+    "AND min_lat <= :north AND max_lat >= :south) "
+    "AND o.lat BETWEEN :south AND :north AND o.lon BETWEEN :west AND :east"
+)
+
+
+def _build_occurrences_rtree(dst_db: Path) -> bool:
+    """Write the occurrences_rtree R*Tree over every located occurrence.
+
+    One degenerate box (min == max) per occurrence, keyed by occurrences.rowid,
+    so a bounding-box filter walks the R*Tree instead of scanning occurrences
+    (see OCCURRENCES_RTREE_BBOX_FILTER for the query shape). Rows with a NULL
+    lat or lon have no entry and so never match a bounds filter, as before.
+
+    The rowid key is only stable while nothing renumbers occurrences: occurrences
+    has no INTEGER PRIMARY KEY, so a later VACUUM is free to reassign rowids.
+    Build this after any VACUUM of the file, never before.
+
+    Optional: returns False (and writes nothing) when the local SQLite was built
+    without the rtree module. Readers that lack it only lose the fast path; the
+    plain lat/lon filter works on the same file.
+    """
+    with _sqlite3.connect(dst_db) as con:
+        try:
+            con.execute(
+                "CREATE VIRTUAL TABLE occurrences_rtree "
+                "USING rtree(id, min_lon, max_lon, min_lat, max_lat)"
+            )
+        except _sqlite3.OperationalError as e:
+            print(f"WARNING: skipping occurrences_rtree ({e})")  # noqa: T201
+            return False
+        cols = {row[1] for row in con.execute("PRAGMA table_info(occurrences)").fetchall()}
+        if {"lat", "lon"} <= cols:
+            con.execute(
+                "INSERT INTO occurrences_rtree "
+                "SELECT rowid, lon, lon, lat, lat FROM occurrences "
+                "WHERE lat IS NOT NULL AND lon IS NOT NULL"
+            )
+    return True
+
+
+# Header type-ahead over search_fts. Bind :q to search_fts_match(<typed text>);
+# bm25 rank first, then record weight, so "bomb" ranks Bombus (many records)
+# above a rarer taxon matching equally well. Add "AND kind = '<kind>'" to scope.
+SEARCH_FTS_SQL = (
+    "SELECT kind, ref, term, weight FROM search_fts "
+    "WHERE search_fts MATCH :q ORDER BY rank, weight DESC LIMIT :limit"
+)
+
+_SEARCH_TOKEN_RE = re.compile(r"\w+")
+_TRAILING_DIGITS_RE = re.compile(r"(\d+)$")
+
+
+def search_fts_match(text: str) -> str | None:
+    """Turn typed search text into a search_fts MATCH expression.
+
+    Every word becomes a quoted prefix token ('"bomb"* "vos"*'), so FTS5 query
+    syntax in the input (quotes, NEAR, column filters, a stray '-') is inert.
+    Returns None when the text has no word characters — the caller should skip
+    the query rather than MATCH an empty string, which is a syntax error.
+    """
+    tokens = _SEARCH_TOKEN_RE.findall(text.lower())
+    return " ".join(f'"{t}"*' for t in tokens) or None
+
+
+def _catalog_suffix(catalog_number: str) -> str | None:
+    """Trailing digit run of a catalog number without leading zeros.
+
+    The Python twin of filter.ts parseCatalogSuffix applied to a stored value
+    (WSDA_0012345 -> '12345'); None when there is no non-zero digit run.
+    """
+    m = _TRAILING_DIGITS_RE.search(catalog_number.strip())
+    if not m:
+        return None
+    return m.group(1).lstrip("0") or None
+
+
+def _build_search_fts(dst_db: Path) -> bool:
+    """Write the search_fts FTS5 index behind header type-ahead.
+
+    One document per searchable thing, with the thing's record count:
+
+      kind='taxon'  term=taxa.name             ref=taxon_id
+      kind='name'   term=canonical_name        ref=canonical_name
+                    (only names with no taxa row of the same spelling, so a
+                    resolved species is not listed twice)
+      kind='person' term=recordedBy / iNat login  ref=the same string
+      kind='label'  term=catalog number suffix ref=suffix (the normalized form
+                    lookupByCatalogSuffix takes)
+
+    unicode61 with diacritics folded and 2/3-character prefix indexes, so a
+    partial word is an index lookup, not a scan. Query through SEARCH_FTS_SQL
+    with a search_fts_match() expression. Columns absent from occurrences just
+    contribute no documents.
+
+    Optional: returns False (and writes nothing) when the local SQLite was built
+    without FTS5.
+    """
+    with _sqlite3.connect(dst_db) as con:
+        try:
+            con.execute(
+                "CREATE VIRTUAL TABLE search_fts USING fts5("
+                "term, kind UNINDEXED, ref UNINDEXED, weight UNINDEXED, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            )
+        except _sqlite3.OperationalError as e:
+            print(f"WARNING: skipping search_fts ({e})")  # noqa: T201
+            return False
+        cols = {row[1] for row in con.execute("PRAGMA table_info(occurrences)").fetchall()}
+        docs: list[tuple[str, str, str, int]] = []
+
+        if "taxon_id" in cols:
+            docs += [
+                (name, "taxon", str(taxon_id), n)
+                for taxon_id, name, n in con.execute(
+                    "SELECT t.taxon_id, t.name, count(o.taxon_id) FROM taxa t "
+                    "LEFT JOIN occurrences o ON o.taxon_id = t.taxon_id "
+                    "GROUP BY t.taxon_id, t.name"
+                )
+            ]
+        if "canonical_name" in cols:
+            docs += [
+                (name, "name", name, n)
+                for name, n in con.execute(
+                    "SELECT canonical_name, count(*) FROM occurrences "
+                    "WHERE canonical_name IS NOT NULL AND canonical_name <> '' "
+                    "AND lower(canonical_name) NOT IN (SELECT lower(name) FROM taxa) "
+                    "GROUP BY canonical_name"
+                )
+            ]
+        people: dict[str, int] = {}
+        for col in ("recordedBy", "host_inat_login", "collector_inat_login", "user_login"):
+            if col not in cols:
+                continue
+            for person, n in con.execute(
+                f"SELECT {col}, count(*) FROM occurrences "
+                f"WHERE {col} IS NOT NULL AND {col} <> '' GROUP BY {col}"
+            ):
+                people[person] = people.get(person, 0) + n
+        docs += [(person, "person", person, n) for person, n in people.items()]
+        if "catalog_number" in cols:
+            suffixes: dict[str, int] = {}
+            for catalog_number, n in con.execute(
+                "SELECT catalog_number, count(*) FROM occurrences "
+                "WHERE catalog_number IS NOT NULL GROUP BY catalog_number"
+            ):
+                suffix = _catalog_suffix(str(catalog_number))
+                if suffix is not None:
+                    suffixes[suffix] = suffixes.get(suffix, 0) + n
+            docs += [(suffix, "label", suffix, n) for suffix, n in suffixes.items()]
+
+        docs.sort(key=lambda d: (d[1], d[0], d[2]))
+        con.executemany(
+            "INSERT INTO search_fts(term, kind, ref, weight) VALUES (?, ?, ?, ?)", docs
+        )
+        con.execute("INSERT INTO search_fts(search_fts) VALUES ('optimize')")
+    return True
+
+
+# Facet aggregates (facet_counts). FACET_DIMENSIONS are the filter-panel facets
+# that live on the occurrences row (tier is not one: it is a function of
+# record_type); absent columns are skipped. Place membership is many-to-many
+# (occurrence_places), so place_slug is counted through the bridge.
+FACET_DIMENSIONS = ("taxon_id", "year", "county", "ecoregion_l3", "record_type")
+PLACE_FACET = "place_slug"
+# The facets also stored under one filter. Only low-cardinality ones: crossing
+# taxon_id or year with anything multiplies the table by thousands of values
+# for counts the panel can take from a query on the filtered rows instead.
+FACET_CROSS_DIMENSIONS = ("county", "ecoregion_l3", "record_type", PLACE_FACET)
+
+# One facet's counts under at most one filter; a PRIMARY KEY range read. Bind
+# :facet, plus :given/:given_value ('' and '' for the unfiltered counts).
+FACET_COUNTS_SQL = (
+    "SELECT value, n FROM facet_counts "
+    "WHERE given = :given AND given_value = :given_value AND facet = :facet ORDER BY value"
+)
+
+
+
+def _facet_slices(cols: set[str]) -> list[tuple[str, str]]:
+    """(given, facet) pairs facet_counts holds for an occurrences table with
+    *cols*; given '' is the unfiltered slice."""
+    facets = [d for d in FACET_DIMENSIONS if d in cols]
+    if set(_OCC_ID_COLUMNS) <= cols:
+        facets.append(PLACE_FACET)
+    cross = [d for d in FACET_CROSS_DIMENSIONS if d in facets]
+    return [("", f) for f in facets] + [(g, f) for g in cross for f in cross if g != f]
+
+
+def _build_facet_tables(dst_db: Path) -> None:
+    """Write the facet_counts aggregate behind the filter panel.
+
+    Keyed (given, given_value, facet, value):
+
+      given=''      given_value=''   one row per non-NULL value of each facet
+      given=<dim>   given_value=<v>  that facet's counts among rows where dim = v,
+                                     for FACET_CROSS_DIMENSIONS pairs only
+
+    place_slug is counted through the occurrence_places bridge (a row in two
+    places counts once in each). Read through FACET_COUNTS_SQL. taxon_id is the
+    exact id; a subtree count joins value to taxon_ancestors(taxon_id) WHERE
+    ancestor_id = N, still index-only.
+
+    Ends with _assert_facets_consistent(); raises ValueError if the aggregate
+    disagrees with the base tables.
+    """
+    with _sqlite3.connect(dst_db) as con:
+        cols = {r[1] for r in con.execute("PRAGMA table_info(occurrences)")}
+        slices = _facet_slices(cols)
+        con.execute("""
+            CREATE TABLE facet_counts (
+                given       TEXT    NOT NULL,
+                given_value         NOT NULL,
+                facet       TEXT    NOT NULL,
+                value               NOT NULL,
+                n           INTEGER NOT NULL,
+                PRIMARY KEY (given, given_value, facet, value)
+            ) WITHOUT ROWID
+        """)
+        if any(PLACE_FACET in s for s in slices):
+            con.execute(
+                "CREATE TEMP TABLE _placed AS SELECT p.place_slug"
+                + "".join(f', o."{d}"' for d in FACET_CROSS_DIMENSIONS if d in cols)
+                + " FROM (SELECT DISTINCT occ_id, place_slug FROM occurrence_places) p "
+                f"JOIN occurrences o ON p.occ_id = {OCC_ID_SQL}"
+            )
+        for given, facet in slices:
+            source = "_placed" if PLACE_FACET in (given, facet) else "occurrences"
+            if given:
+                con.execute(
+                    f"INSERT INTO facet_counts SELECT '{given}', \"{given}\", '{facet}', \"{facet}\", "
+                    f'count(*) FROM {source} WHERE "{given}" IS NOT NULL AND "{facet}" IS NOT NULL '
+                    f'GROUP BY "{given}", "{facet}"'
+                )
+            else:
+                con.execute(
+                    f"INSERT INTO facet_counts SELECT '', '', '{facet}', \"{facet}\", count(*) "
+                    f'FROM {source} WHERE "{facet}" IS NOT NULL GROUP BY "{facet}"'
+                )
+        con.execute("DROP TABLE IF EXISTS _placed")
+
+    _assert_facets_consistent(dst_db)
+
+
+def _assert_facets_consistent(db_path: Path) -> None:
+    """Fail the build if facet_counts disagrees with the base tables.
+
+    Recounts every slice straight from occurrences, joining the bridge itself
+    for place slices rather than reusing the builder's staging table, and
+    compares the whole of facet_counts against it. Raises ValueError (message
+    contains "facet").
+    """
+    with _sqlite3.connect(db_path) as con:
+        cols = {r[1] for r in con.execute("PRAGMA table_info(occurrences)")}
+        place_join = (
+            "JOIN (SELECT DISTINCT occ_id, place_slug FROM occurrence_places) p "
+            f"ON p.occ_id = {OCC_ID_SQL}"
+        )
+
+        def column(d: str) -> str:
+            return "p.place_slug" if d == PLACE_FACET else f'o."{d}"'
+
+        expected: set[tuple] = set()
+        for g, f in _facet_slices(cols):
+            join = place_join if PLACE_FACET in (f, g) else ""
+            given = f"'{g}', {column(g)}" if g else "'', ''"
+            where = f"{column(f)} IS NOT NULL" + (f" AND {column(g)} IS NOT NULL" if g else "")
+            group = ", ".join(column(x) for x in (g, f) if x)
+            expected.update(con.execute(
+                f"SELECT {given}, '{f}', {column(f)}, count(*) FROM occurrences o {join} "
+                f"WHERE {where} GROUP BY {group}"
+            ).fetchall())
+        got = set(con.execute("SELECT given, given_value, facet, value, n FROM facet_counts"))
+        if got != expected:
+            wrong = sorted({r[:3] for r in got ^ expected}, key=repr)
+            raise ValueError(f"facet_counts disagrees with occurrences for {len(wrong)} slices, e.g. {wrong[0]}")
+
+
+# geo_blob column order — positionally coupled to features.ts _buildGeoJSONFromRaw
+# (JSON encoding) and to GEO_BIN_COLUMNS below (binary encoding).
+_GEO_COLS = [
+    "lat", "lon", "ecdysis_id", "observation_id", "specimen_observation_id",
+    "year", "tier", "checklist_id",
+]
+
+# Binary geo_blob_bin layout (all integers little-endian):
+#
+#   offset  size  field
+#   0       4     magic b"BAGB"
+#   4       2     uint16 schema version (GEO_BIN_VERSION)
+#   6       2     uint16 column count (len(GEO_BIN_COLUMNS))
+#   8       4     uint32 row count
+#   12      4     uint32 byte offset of the tier dictionary (UTF-8 JSON array)
+#   16      4     uint32 byte length of the tier dictionary
+#   20      4*n   uint32 byte offset of each column, in GEO_BIN_COLUMNS order
+#
+# Every column starts on a 4-byte boundary so `new Float32Array(buf, off, rows)`
+# (and friends) can view it in place. NULL encodes as 0 in the id, year and tier
+# columns — ids are positive, no record has year 0, and tier code k>0 names
+# dictionary entry k-1. Bump GEO_BIN_VERSION on any change to this layout.
+GEO_BIN_MAGIC = b"BAGB"
+GEO_BIN_VERSION = 1
+GEO_BIN_COLUMNS: list[tuple[str, str]] = [
+    ("lat", "<f4"),
+    ("lon", "<f4"),
+    ("ecdysis_id", "<i4"),
+    ("observation_id", "<i4"),
+    ("specimen_observation_id", "<i4"),
+    ("year", "<u2"),
+    ("tier", "u1"),
+    ("checklist_id", "<i4"),
+]
+_GEO_BIN_HEADER = struct.Struct("<4sHHIII")
+
+
+def _align4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def encode_geo_columns(rows: list[tuple]) -> bytes:
+    """Encode geo_blob rows (``_GEO_COLS`` order) into the columnar binary layout.
+
+    See the layout comment above GEO_BIN_MAGIC. Raises ValueError if the tier
+    vocabulary outgrows a uint8 code or an id does not fit an int32 — either would
+    silently corrupt the client's typed-array view.
+    """
+    n = len(rows)
+    cols = list(zip(*rows)) if rows else [() for _ in GEO_BIN_COLUMNS]
+
+    tiers = sorted({t for t in cols[_GEO_COLS.index("tier")] if t is not None})
+    if len(tiers) > 255:
+        raise ValueError(f"geo_blob_bin: {len(tiers)} tier values exceed the uint8 code space")
+    tier_code = {t: i + 1 for i, t in enumerate(tiers)}
+    tier_dict = json.dumps(tiers).encode("utf-8")
+
+    arrays: list[np.ndarray] = []
+    for (name, dtype), values in zip(GEO_BIN_COLUMNS, cols):
+        if name == "tier":
+            arr = np.array([tier_code.get(v, 0) for v in values], dtype=dtype)
+        elif dtype == "<f4":
+            arr = np.array(values, dtype=dtype)
+        else:
+            wide = np.array([0 if v is None else int(v) for v in values], dtype=np.int64)
+            info = np.iinfo(np.dtype(dtype))
+            if wide.size and (wide.min() < info.min or wide.max() > info.max):
+                raise ValueError(f"geo_blob_bin: {name} value out of range for {dtype}")
+            arr = wide.astype(dtype)
+        arrays.append(arr)
+
+    header_len = _GEO_BIN_HEADER.size + 4 * len(GEO_BIN_COLUMNS)
+    dict_offset = header_len
+    pos = _align4(dict_offset + len(tier_dict))
+    col_offsets: list[int] = []
+    for arr in arrays:
+        col_offsets.append(pos)
+        pos = _align4(pos + arr.nbytes)
+
+    buf = bytearray(pos)
+    _GEO_BIN_HEADER.pack_into(
+        buf, 0, GEO_BIN_MAGIC, GEO_BIN_VERSION, len(GEO_BIN_COLUMNS), n,
+        dict_offset, len(tier_dict),
+    )
+    struct.pack_into(f"<{len(col_offsets)}I", buf, _GEO_BIN_HEADER.size, *col_offsets)
+    buf[dict_offset:dict_offset + len(tier_dict)] = tier_dict
+    for off, arr in zip(col_offsets, arrays):
+        buf[off:off + arr.nbytes] = arr.tobytes()
+    return bytes(buf)
+
+
+def decode_geo_columns(data: bytes) -> list[tuple]:
+    """Reference decoder for :func:`encode_geo_columns` — the inverse, for tests and audits.
+
+    Returns rows in ``_GEO_COLS`` order with NULLs restored and lat/lon widened from
+    float32 (so they round-trip to ~1e-5 degrees, not exactly).
+    """
+    magic, version, ncols, n, dict_offset, dict_len = _GEO_BIN_HEADER.unpack_from(data, 0)
+    if magic != GEO_BIN_MAGIC:
+        raise ValueError(f"geo_blob_bin: bad magic {magic!r}")
+    if version != GEO_BIN_VERSION or ncols != len(GEO_BIN_COLUMNS):
+        raise ValueError(f"geo_blob_bin: unsupported schema version {version} ({ncols} columns)")
+    col_offsets = struct.unpack_from(f"<{ncols}I", data, _GEO_BIN_HEADER.size)
+    tiers = json.loads(data[dict_offset:dict_offset + dict_len].decode("utf-8"))
+
+    cols: list[list] = []
+    for (name, dtype), off in zip(GEO_BIN_COLUMNS, col_offsets):
+        values = np.frombuffer(data, dtype=dtype, count=n, offset=off).tolist()
+        if name == "tier":
+            values = [tiers[v - 1] if v else None for v in values]
+        elif dtype != "<f4":
+            values = [v or None for v in values]
+        cols.append(values)
+    return list(zip(*cols))
+
+
+def _geo_rows(con: _sqlite3.Connection) -> list[tuple]:
+    """The located occurrences' _GEO_COLS, NULL for columns the table lacks."""
+    actual = {row[1] for row in con.execute("PRAGMA table_info(occurrences)").fetchall()}
+    select_expr = ", ".join(c if c in actual else f"NULL AS {c}" for c in _GEO_COLS)
+    return con.execute(
+        f"SELECT {select_expr} "
+        "FROM occurrences WHERE lat IS NOT NULL AND lon IS NOT NULL"
+    ).fetchall()
+
+
+def _write_geo_blobs(dst_db: Path) -> None:
+    """Write geo_blob (JSON) from located occurrences."""
+    # Pre-serialize geo rows as a single TEXT blob so the browser worker fetches them
+    # with one SQL query and one WASM→JS callback (vs 92K callbacks = ~600 ms in Firefox).
+    # Column order: [lat, lon, ecdysis_id, observation_id, specimen_observation_id,
+    #                year, tier, checklist_id]
+    # Phase 131 NORM-02: dropped scientificName, genus, family (~4 MB transfer-weight win).
+    # source moved from index 9 → 6; features.ts _buildGeoJSONFromRaw decode updated in same commit.
+    # checklist_id appended at index 7; features.ts updated in same commit (positional coupling).
+    # source decomposed → tier rides index 6 (drives symbology). ONLY the
+    # tier facet is carried on the geo_blob (page-weight budget); the per-arm record-type facet
+    # reaches the detail card via the full wa-sqlite row query, NOT map feature properties. THIS
+    # index-6 swap is positionally coupled to features.ts row[6] — ships S3-then-deploy
+    # in lockstep with the features.ts reader.
+    with _sqlite3.connect(dst_db) as idx_con:
+        geo_json = json.dumps(_geo_rows(idx_con))
+        idx_con.execute("CREATE TABLE geo_blob(data TEXT NOT NULL)")
+        idx_con.execute("INSERT INTO geo_blob(data) VALUES (?)", (geo_json,))
+
+
+def _write_geo_blob_bin(dst_db: Path) -> None:
+    """Write geo_blob_bin: geo_blob's rows, columnar and little-endian.
+
+    A reader can wrap each column in a typed array without a JSON.parse. Opt-in
+    (generate_sqlite(geo_blob_bin=True)) until features.ts decodes it: until then
+    it would only ship the geo payload a second time.
+    """
+    with _sqlite3.connect(dst_db) as idx_con:
+        idx_con.execute("CREATE TABLE geo_blob_bin(data BLOB NOT NULL)")
+        idx_con.execute(
+            "INSERT INTO geo_blob_bin(data) VALUES (?)", (encode_geo_columns(_geo_rows(idx_con)),)
+        )
+
+
+# Tables whose rows content_digest() hashes, in hashing order: the base tables a
+# delta patch carries (db_patch.PATCHED_TABLES). Everything else in the file
+# (taxon_ancestors, geo_blob, the R*Tree, search_fts, facet_counts, db_meta) is
+# derived from these, so an applier that is not this module — wa-sqlite in the
+# browser — can reach a patch's to_digest without reproducing the Python
+# builders byte for byte; it rebuilds (or drops) the derived tables itself.
+DIGEST_TABLES = ["occurrences", "occurrence_places", "taxa"]
+
+
+def content_digest(db_path: Path) -> str:
+    """Order-independent sha256 of an occurrences.db's logical content.
+
+    Hashes each DIGEST_TABLES table's column names and declared types, then its
+    rows as a sorted multiset, so two files holding the same data in a different
+    physical order (a patched DB vs. a fresh export — see db_patch.py) digest
+    equal. Tables absent from the file hash as absent, not as empty.
+    """
+    h = hashlib.sha256()
+    with _sqlite3.connect(db_path) as con:
+        present = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in DIGEST_TABLES:
+            h.update(f"\x00table {table}\x00".encode())
+            if table not in present:
+                h.update(b"absent")
+                continue
+            cols = [(r[1], r[2]) for r in con.execute(f"PRAGMA table_info({table})")]
+            h.update(repr(cols).encode())
+            col_list = ", ".join(f'"{c}"' for c, _t in cols)
+            rows = con.execute(f"SELECT {col_list} FROM {table}").fetchall()
+            for line in sorted(repr(r) for r in rows):
+                h.update(line.encode())
+                h.update(b"\n")
+    return h.hexdigest()
+
+
+def _write_db_meta(dst_db: Path) -> None:
+    """Stamp db_meta(key, value) with the file's content_digest.
+
+    A returning client reads its cached copy's digest from here to pick the
+    delta-patch chain that starts at it (db_patch.py).
+    """
+    digest = content_digest(dst_db)
+    with _sqlite3.connect(dst_db) as con:
+        con.execute("DROP TABLE IF EXISTS db_meta")
+        con.execute("CREATE TABLE db_meta(key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        con.execute("INSERT INTO db_meta VALUES ('content_digest', ?)", (digest,))
+
+
+def _occurrences_select_sql(
+    con: duckdb.DuckDBPyConnection, src_parquet: Path, clustered: bool
+) -> str:
+    """SELECT that feeds out.occurrences, in Hilbert order when *clustered*.
+
+    SQLite stores a rowid table in insertion order, so inserting along a
+    Hilbert curve over (lon, lat) puts neighbouring points on neighbouring pages.
+    The curve is scaled to the data's own bounding box (so the full 32-bit key
+    range covers Washington, not the globe). Un-located rows go last; ties keep
+    the parquet's own row order, so the layout is deterministic build to build.
+
+    The mart's materialized occ_id is a parquet-side join key only: the client
+    derives it from the identity columns (occIdFromRow), so it is dropped here
+    and the SQLite schema stays what the frontend and db_patch expect.
+    """
+    cols = {r[0] for r in con.execute(f"DESCRIBE SELECT * FROM read_parquet('{src_parquet}')").fetchall()}
+    dropped = ", occ_id" if "occ_id" in cols else ""
+    if not clustered:
+        if dropped:
+            return f"SELECT * EXCLUDE (occ_id) FROM read_parquet('{src_parquet}')"
+        return f"SELECT * FROM read_parquet('{src_parquet}')"
+    src = f"read_parquet('{src_parquet}', file_row_number = true)"
+    bounds = None
+    if {"lat", "lon"} <= cols:
+        bounds = con.execute(
+            f"SELECT min(lon), min(lat), max(lon), max(lat) FROM {src} "
+            "WHERE lat IS NOT NULL AND lon IS NOT NULL"
+        ).fetchone()
+    if bounds is None or bounds[0] is None:
+        return f"SELECT * EXCLUDE (file_row_number{dropped}) FROM {src} ORDER BY file_row_number"
+    min_x, min_y, max_x, max_y = bounds
+    box = f"{{'min_x': {min_x!r}, 'min_y': {min_y!r}, 'max_x': {max_x!r}, 'max_y': {max_y!r}}}::BOX_2D"
+    return (
+        f"SELECT * EXCLUDE (file_row_number{dropped}) FROM {src} "
+        f"ORDER BY ST_Hilbert(lon::DOUBLE, lat::DOUBLE, {box}) NULLS LAST, file_row_number"
+    )
+
+
+def _compact(dst_db: Path) -> None:
+    """Rewrite the file with VACUUM: contiguous tables, no free pages.
+
+    VACUUM copies each table in rowid order, which for occurrences is the
+    Hilbert order it was inserted in. The page size stays SQLite's default
+    (4 KiB).
+    """
+    con = _sqlite3.connect(dst_db, isolation_level=None)
+    try:
+        con.execute("VACUUM")
+    finally:
+        con.close()
+
+
 def generate_sqlite(
     src_parquet: Path,
     dst_db: Path,
     taxa_path: Path | None = None,
     db_path: str | None = None,
+    spatial_index: bool = False,
+    search_index: bool = False,
+    clustered: bool = False,
+    facet_tables: bool = True,
+    geo_blob_bin: bool = False,
 ) -> None:
     """Export *src_parquet* into a SQLite database at *dst_db*.
 
@@ -420,6 +1003,19 @@ def generate_sqlite(
         taxa_path: Path to taxa.csv.gz (defaults to _TAXA_PATH). Injectable for tests.
         db_path: Path to beeatlas.duckdb for checklist join (defaults to DB_PATH).
                  Injectable for tests.
+        spatial_index: Also write the occurrences_rtree bounding-box index
+                 (skipped with a warning if SQLite lacks the rtree module).
+                 Off by default: no client query reads it yet, and it adds
+                 about a third to the compressed download.
+        search_index: Also write the search_fts type-ahead index (skipped with
+                 a warning if SQLite lacks FTS5). Off by default until the
+                 client's search reads it.
+        clustered: Range-read layout — insert occurrences in Hilbert order,
+                 rewrite the file with VACUUM, then ANALYZE
+                 (see _occurrences_select_sql and _compact).
+        facet_tables: Write the facet_counts aggregate.
+        geo_blob_bin: Also write the columnar geo_blob_bin beside the JSON
+                 geo_blob. Off until the client decodes it.
     """
     taxa_path = taxa_path or _TAXA_PATH
     db_path = db_path or DB_PATH
@@ -432,8 +1028,10 @@ def generate_sqlite(
     try:
         con.execute("INSTALL sqlite; LOAD sqlite;")
         con.execute(f"ATTACH '{dst_db}' AS out (TYPE sqlite)")
+        if clustered:
+            con.execute("INSTALL spatial; LOAD spatial;")
         con.execute(
-            f"CREATE TABLE out.occurrences AS SELECT * FROM read_parquet('{src_parquet}')"
+            f"CREATE TABLE out.occurrences AS {_occurrences_select_sql(con, src_parquet, clustered)}"
         )
         # ship the many-to-many occurrence_places bridge as a second table.
         # The bridge parquet is a sibling of occurrences.parquet in the same directory
@@ -467,40 +1065,56 @@ def generate_sqlite(
             dst_db.unlink()
         raise
 
-    # Pre-serialize geo rows as a single TEXT blob so the browser worker fetches them
-    # with one SQL query and one WASM→JS callback (vs 92K callbacks = ~600 ms in Firefox).
-    # Column order: [lat, lon, ecdysis_id, observation_id, specimen_observation_id,
-    #                year, tier, checklist_id]
-    # Phase 131 NORM-02: dropped scientificName, genus, family (~4 MB transfer-weight win).
-    # source moved from index 9 → 6; features.ts _buildGeoJSONFromRaw decode updated in same commit.
-    # checklist_id appended at index 7; features.ts updated in same commit (positional coupling).
-    # source decomposed → tier rides index 6 (drives symbology). ONLY the
-    # tier facet is carried on the geo_blob (page-weight budget); the per-arm record-type facet
-    # reaches the detail card via the full wa-sqlite row query, NOT map feature properties. THIS
-    # index-6 swap is positionally coupled to features.ts row[6] — ships S3-then-deploy
-    # in lockstep with the features.ts reader.
-    _GEO_COLS = [
-        "lat", "lon", "ecdysis_id", "observation_id", "specimen_observation_id",
-        "year", "tier", "checklist_id",
-    ]
-    with _sqlite3.connect(dst_db) as idx_con:
-        actual = {row[1] for row in idx_con.execute("PRAGMA table_info(occurrences)").fetchall()}
-        select_expr = ", ".join(c if c in actual else f"NULL AS {c}" for c in _GEO_COLS)
-        cur = idx_con.execute(
-            f"SELECT {select_expr} "
-            "FROM occurrences WHERE lat IS NOT NULL AND lon IS NOT NULL"
-        )
-        geo_json = json.dumps(cur.fetchall())
-        idx_con.execute("CREATE TABLE geo_blob(data TEXT NOT NULL)")
-        idx_con.execute("INSERT INTO geo_blob(data) VALUES (?)", (geo_json,))
+    # Closure table for indexed taxon filters (descendant lookups by ancestor_id).
+    _build_taxon_ancestors(dst_db)
+
+    _write_geo_blobs(dst_db)
+    if geo_blob_bin:
+        _write_geo_blob_bin(dst_db)
+
+    # Compaction renumbers occurrences rowids, so it must precede the rowid-keyed
+    # R*Tree below.
+    if clustered:
+        _compact(dst_db)
+
+    if spatial_index:
+        _build_occurrences_rtree(dst_db)
+    if search_index:
+        _build_search_fts(dst_db)
+    if facet_tables:
+        # Gate like the orphan check: never leave a file with wrong facet counts.
+        try:
+            _build_facet_tables(dst_db)
+        except Exception:
+            if dst_db.exists():
+                dst_db.unlink()
+            raise
+
+    # Last: db_meta is stamped once the file is complete (see content_digest).
+    _write_db_meta(dst_db)
+    if clustered:
+        with _sqlite3.connect(dst_db) as con:
+            con.execute("ANALYZE")
 
 
 def main() -> None:
-    """Read occurrences.parquet from _DBT_SANDBOX and write occurrences.db to _EXPORT_DIR."""
+    """Read occurrences.parquet from _DBT_SANDBOX and write occurrences.db to _EXPORT_DIR.
+
+    SQLITE_LAYOUT=clustered selects the Hilbert-ordered, range-read layout;
+    SQLITE_SPATIAL_INDEX=1, SQLITE_SEARCH_INDEX=1 and SQLITE_GEO_BIN=1 opt in to
+    occurrences_rtree, search_fts and geo_blob_bin.
+    """
     _EXPORT_DIR.mkdir(parents=True, exist_ok=True)
     src = _DBT_SANDBOX / "occurrences.parquet"
     dst = _EXPORT_DIR / "occurrences.db"
-    generate_sqlite(src, dst)
+    generate_sqlite(
+        src,
+        dst,
+        spatial_index=os.environ.get("SQLITE_SPATIAL_INDEX") == "1",
+        search_index=os.environ.get("SQLITE_SEARCH_INDEX") == "1",
+        geo_blob_bin=os.environ.get("SQLITE_GEO_BIN") == "1",
+        clustered=os.environ.get("SQLITE_LAYOUT") == "clustered",
+    )
     size_mb = dst.stat().st_size / (1024 * 1024)
     print(f"occurrences.db written to {dst} ({size_mb:.1f} MB)")  # noqa: T201
 
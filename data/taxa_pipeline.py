@@ -8,13 +8,19 @@ Replaces the live /v2/taxa API enricher (removed in Phase 110) with an offline
 walk over all active Anthophila taxa,
 eliminating API rate-limit risk and supporting Phase 111 (Checklist) lineage
 lookup for species not yet observed in WABA.
+
+The archive is parsed ONCE per upstream version into a typed, taxon_id-sorted
+Parquet store (ensure_taxa_store); every Python consumer of the taxonomy reads
+that store instead of re-decompressing and re-parsing the 37 MB gzip.
 """
 
+import hashlib
 import json
 import os
 from pathlib import Path
 
 import duckdb
+import pyarrow.parquet as pq
 import requests
 
 DB_PATH = os.environ.get("DB_PATH", str(Path(__file__).parent / "beeatlas.duckdb"))
@@ -24,6 +30,18 @@ TAXA_PATH = RAW_DIR / "taxa.csv.gz"
 TAXA_CACHE_PATH = RAW_DIR / "taxa_cache.json"
 ANTHOPHILA_ID = 630955
 
+# Where ensure_taxa_store() writes the parsed store. Unset = beside the archive
+# (raw/taxa.csv.gz -> raw/taxa.parquet). The test suite points it at a tmp dir so
+# the committed fixture archives never grow a sibling cache file.
+TAXA_STORE_DIR: Path | None = (
+    Path(os.environ["TAXA_STORE_DIR"]) if os.environ.get("TAXA_STORE_DIR") else None
+)
+
+# Bump when the store's columns or their derivation change, so a store built by an
+# older release is rebuilt even though the upstream archive did not move.
+_TAXA_STORE_VERSION = "1"
+_TAXA_STORE_KEY = b"beeatlas.taxa_source_key"
+
 
 def download_taxa_csv() -> None:
     """Download taxa.csv.gz from iNat AWS Open Data with ETag/Last-Modified caching.
@@ -32,7 +50,13 @@ def download_taxa_csv() -> None:
     JSON at TAXA_CACHE_PATH with the server's ETag and Last-Modified values.
 
     On subsequent runs: sends If-None-Match + If-Modified-Since headers; if the
-    server returns 304 Not Modified, returns immediately without touching the file.
+    server returns 304 Not Modified, the archive is not re-downloaded.
+
+    Either way it ends with ensure_taxa_store(), so the parsed store is current
+    for the archive on disk: after a 304 it is reused when its recorded source key
+    (ETag + size) still matches, and rebuilt when it is missing, torn, or from an
+    older _TAXA_STORE_VERSION; after a download the new ETag changes the key and
+    the store is rebuilt.
 
     Uses atomic write (download to .gz.tmp, then rename) to avoid partial files.
     """
@@ -50,6 +74,7 @@ def download_taxa_csv() -> None:
 
     if resp.status_code == 304:
         print("taxa.csv.gz: unchanged (304), using cached copy")  # noqa: T201
+        ensure_taxa_store()
         return
 
     resp.raise_for_status()
@@ -81,12 +106,116 @@ def download_taxa_csv() -> None:
 
     size_mb = TAXA_PATH.stat().st_size / 1024**2
     print(f"taxa.csv.gz: downloaded {size_mb:.1f} MB")  # noqa: T201
+    ensure_taxa_store()
+
+
+def _taxa_source_key(taxa_path: Path) -> str:
+    """Identify the archive version a store was built from.
+
+    The server ETag recorded by download_taxa_csv() when the archive is the one it
+    manages (plus the size, so a hand-restored file under a stale sidecar still
+    mismatches); otherwise a content hash, which is what fixtures and ad-hoc
+    archives get.
+    """
+    size = taxa_path.stat().st_size
+    if taxa_path == TAXA_PATH and TAXA_CACHE_PATH.exists():
+        etag = json.loads(TAXA_CACHE_PATH.read_text()).get("etag")
+        if etag:
+            return f"v{_TAXA_STORE_VERSION}:etag:{etag}:{size}"
+    digest = hashlib.sha256()
+    with open(taxa_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return f"v{_TAXA_STORE_VERSION}:sha256:{digest.hexdigest()}"
+
+
+def taxa_store_path(taxa_path: Path | str | None = None) -> Path:
+    """Return where the parsed store for *taxa_path* lives (it may not exist yet)."""
+    taxa_path = Path(taxa_path) if taxa_path is not None else TAXA_PATH
+    name = taxa_path.name.removesuffix(".gz").removesuffix(".csv") + ".parquet"
+    return (TAXA_STORE_DIR or taxa_path.parent) / name
+
+
+def ensure_taxa_store(taxa_path: Path | str | None = None) -> Path:
+    """Materialize the parsed taxonomy store for *taxa_path* and return its path.
+
+    The store is one Parquet file, sorted by taxon_id (row-group statistics make
+    point and IN-list lookups prune), with the columns every consumer needs:
+
+        taxon_id BIGINT, ancestry VARCHAR, ancestor_ids INTEGER[] (root -> parent,
+        self excluded — same order as the archive's slash-joined ancestry),
+        rank_level BIGINT, rank VARCHAR, name VARCHAR, active BOOLEAN,
+        is_anthophila BOOLEAN (630955 itself or any descendant)
+
+    Duplicate taxon_ids in the archive are kept (consumers own their tiebreak).
+    The archive version is recorded in the Parquet key-value metadata; a store
+    whose key still matches is reused as-is, so each archive version is
+    decompressed and parsed once, not once per consumer.
+    """
+    taxa_path = Path(taxa_path) if taxa_path is not None else TAXA_PATH
+    store_path = taxa_store_path(taxa_path)
+    key = _taxa_source_key(taxa_path)
+
+    if store_path.exists():
+        try:
+            metadata = pq.read_schema(store_path).metadata or {}
+        except Exception:  # noqa: BLE001 — a torn/corrupt store is simply rebuilt
+            metadata = {}
+        if metadata.get(_TAXA_STORE_KEY) == key.encode():
+            return store_path
+
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = store_path.with_suffix(".parquet.tmp")
+    # COPY cannot bind ? for its target or options; both are trusted local values
+    # (a path we derived, a key we built), quote-escaped for the SQL literal.
+    target = str(tmp_path).replace("'", "''")
+    kv_key = _TAXA_STORE_KEY.decode()
+    kv_value = key.replace("'", "''")
+    con = duckdb.connect(":memory:")
+    try:
+        con.execute(
+            f"""
+            COPY (
+                SELECT
+                    taxon_id,
+                    ancestry,
+                    -- TRY_CAST: a non-numeric segment becomes NULL rather than
+                    -- failing the whole parse; ancestry keeps the raw string.
+                    CASE WHEN ancestry IS NULL OR ancestry = '' THEN []::INTEGER[]
+                         ELSE list_transform(string_split(ancestry, '/'),
+                                             x -> TRY_CAST(x AS INTEGER))
+                    END                                        AS ancestor_ids,
+                    rank_level,
+                    rank,
+                    name,
+                    active = 'true'                            AS active,
+                    taxon_id = 630955
+                        OR ancestry LIKE '%/630955/%'
+                        OR ancestry LIKE '%/630955'            AS is_anthophila
+                FROM read_csv(?, delim='\t', header=true, compression='gzip',
+                              columns={{'taxon_id':'BIGINT','ancestry':'VARCHAR',
+                                       'rank_level':'BIGINT','rank':'VARCHAR',
+                                       'name':'VARCHAR','active':'VARCHAR'}})
+                ORDER BY taxon_id, rank_level
+            ) TO '{target}' (
+                FORMAT parquet, COMPRESSION zstd, ROW_GROUP_SIZE 131072,
+                KV_METADATA {{'{kv_key}': '{kv_value}'}}
+            )
+            """,
+            [str(taxa_path)],
+        )
+        (rows,) = con.execute("SELECT count(*) FROM read_parquet(?)", [str(tmp_path)]).fetchone()
+    finally:
+        con.close()
+    tmp_path.replace(store_path)
+    print(f"taxa store: {rows} rows -> {store_path.name}")  # noqa: T201
+    return store_path
 
 
 def load_taxon_lineage_extended(db_path: str | None = None) -> None:
     """Populate inaturalist_data.taxon_lineage_extended from local taxa.csv.gz.
 
-    Reads TAXA_PATH (gzip-compressed TSV), filters to active Anthophila taxa,
+    Reads the parsed store for TAXA_PATH, filters to active Anthophila taxa,
     walks the ancestry column via unnest(string_split(ancestry, '/')), and
     pivots the result into one column per rank:
       (taxon_id, family, subfamily, tribe, genus, subgenus)
@@ -112,17 +241,12 @@ def load_taxon_lineage_extended(db_path: str | None = None) -> None:
             """
             CREATE OR REPLACE TABLE inaturalist_data.taxon_lineage_extended AS
             WITH all_active_bees AS (
-                -- All active taxa descended from Anthophila (taxon_id=630955).
+                -- All active taxa descended from Anthophila (taxon_id=630955),
+                -- from the parsed store (is_anthophila precomputed at parse time).
                 -- ancestry column is /-separated ancestor IDs, NOT including self.
-                -- active column is string 'true'/'false', not a SQL boolean.
                 SELECT taxon_id, ancestry, rank, name
-                FROM read_csv(?, delim='\t', header=true, compression='gzip',
-                              columns={'taxon_id':'BIGINT','ancestry':'VARCHAR',
-                                       'rank_level':'INTEGER','rank':'VARCHAR',
-                                       'name':'VARCHAR','active':'VARCHAR'})
-                WHERE active = 'true'
-                  AND (ancestry LIKE '%/630955/%' OR ancestry LIKE '%/630955'
-                       OR taxon_id = 630955)
+                FROM read_parquet(?)
+                WHERE active AND is_anthophila
             ),
             -- Unnest ancestor IDs from the ancestry string
             ancestor_ids AS (
@@ -158,7 +282,7 @@ def load_taxon_lineage_extended(db_path: str | None = None) -> None:
             SELECT target_taxon_id AS taxon_id, family, subfamily, tribe, genus, subgenus
             FROM pivoted
             """,
-            [str(TAXA_PATH)],
+            [str(ensure_taxa_store(TAXA_PATH))],
         )
         count = con.execute(
             "SELECT count(*) FROM inaturalist_data.taxon_lineage_extended"
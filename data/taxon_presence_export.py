@@ -1,7 +1,8 @@
 """Export per-geography taxon presence for the static /species/ tree (beeatlas-0of.2).
 
 Writes EXPORT_DIR/taxon_presence.json — which taxa occur in each county and each
-level-3 ecoregion, with the evidence that backs each one.
+level-3 ecoregion, with the evidence that backs each one — and, only when asked
+(TAXON_PRESENCE_BIN=1), the packed taxon_presence.bin described below.
 
 WHY AN ARTIFACT AND NOT THE DATABASE. /species/ is a build-time-rendered page whose
 only client JS is species-tree.ts; it loads no data artifact at all today.
@@ -35,8 +36,31 @@ NO ELEVATION. Elevation is not expressible at county granularity and must not
 be faked here; /species/ offers no elevation control. Anything richer than
 county/ecoregion deep-links into the atlas with the filter in the URL.
 
+PACKED ENCODING. taxon_presence.bin is the same payload packed for when the
+budget has to make room for more dimensions (Level IV ecoregions, places) or
+per-pair counts. encode_presence() is the writer and decode_presence() the
+reference reader a frontend decoder must agree with. Nothing reads the file and
+artifacts.toml does not declare it, so main() writes it only with packed=True
+(TAXON_PRESENCE_BIN=1 from the command line) and otherwise removes a stale
+copy; the JSON stays the published artifact until src/species-presence.ts
+grows a decoder.
+Layout (all integers unsigned LEB128 varints unless noted):
+
+    b"TPB" + u8 PACKED_VERSION
+    taxa:        n, then the sorted taxon ids as deltas (first from 0)
+    evidence:    n, then the distinct masks, most frequent first; a pair stores
+                 its mask's index in this table in `bits` = bit_length(n - 1)
+                 bits (3 when all seven unions occur — 2 cannot hold them)
+    dimensions:  n, then per dimension (sorted):
+                   name (varint length + UTF-8), n places, per place (sorted):
+                     name, n pairs,
+                     taxon-table indices as gaps (first from 0, then from the
+                       previous index + 1, so consecutive taxa cost 0),
+                     evidence codes, `bits` each, LSB-first, padded to a byte
+
 Usage:
     cd data && uv run python taxon_presence_export.py
+    cd data && TAXON_PRESENCE_BIN=1 uv run python taxon_presence_export.py  # + .bin
 """
 
 import json
@@ -45,6 +69,11 @@ from pathlib import Path
 
 import duckdb
 
+from export_context import occurrences_source
+
+PACKED_MAGIC = b"TPB"
+PACKED_VERSION = 1
+
 _default_assets = str(Path(__file__).parent.parent / "public" / "data")
 ASSETS_DIR = Path(os.environ.get("EXPORT_DIR", _default_assets))
 
@@ -74,7 +103,7 @@ _QUERY = f"""
         {{dimension}} AS place,
         o.taxon_id,
         CAST(BIT_OR({_EVIDENCE_CASE}) AS INTEGER) AS evidence
-    FROM read_parquet(?) o
+    FROM {{occ}} o
     WHERE o.taxon_id IS NOT NULL
       AND {{dimension}} IS NOT NULL
     GROUP BY 1, 2
@@ -95,7 +124,7 @@ def _collect(con: duckdb.DuckDBPyConnection, parquet: str, dimension: str) -> di
     """
     out: dict[str, dict[str, int]] = {}
     for place, taxon_id, evidence in con.execute(
-        _QUERY.format(dimension=dimension), [parquet]
+        _QUERY.format(dimension=dimension, occ=occurrences_source(con, parquet))
     ).fetchall():
         # String keys: JSON object keys are strings anyway, and the frontend looks
         # them up with String(taxonId) from the tree.
@@ -103,7 +132,134 @@ def _collect(con: duckdb.DuckDBPyConnection, parquet: str, dimension: str) -> di
     return out
 
 
-def main(export_dir: Path | None = None) -> Path:
+def _put_varint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _put_str(buf: bytearray, s: str) -> None:
+    raw = s.encode("utf-8")
+    _put_varint(buf, len(raw))
+    buf += raw
+
+
+def encode_presence(payload: dict[str, dict[str, dict[str, int]]]) -> bytes:
+    """Pack {dimension: {place: {taxon_id: evidence_mask}}} (see PACKED ENCODING).
+
+    Deterministic: dimensions, places and taxa are written in sorted order and
+    the evidence table breaks frequency ties by mask value.
+    """
+    taxa = sorted({int(t) for places in payload.values() for pairs in places.values() for t in pairs})
+    taxon_index = {t: i for i, t in enumerate(taxa)}
+    frequency: dict[int, int] = {}
+    for places in payload.values():
+        for pairs in places.values():
+            for mask in pairs.values():
+                frequency[mask] = frequency.get(mask, 0) + 1
+    masks = sorted(frequency, key=lambda m: (-frequency[m], m))
+    code_of = {m: i for i, m in enumerate(masks)}
+    bits = max(1, (len(masks) - 1).bit_length())
+
+    buf = bytearray(PACKED_MAGIC)
+    buf.append(PACKED_VERSION)
+    _put_varint(buf, len(taxa))
+    previous = 0
+    for t in taxa:
+        _put_varint(buf, t - previous)
+        previous = t
+    _put_varint(buf, len(masks))
+    for m in masks:
+        _put_varint(buf, m)
+
+    _put_varint(buf, len(payload))
+    for dimension in sorted(payload):
+        _put_str(buf, dimension)
+        places = payload[dimension]
+        _put_varint(buf, len(places))
+        for place in sorted(places):
+            _put_str(buf, place)
+            pairs = sorted((taxon_index[int(t)], mask) for t, mask in places[place].items())
+            _put_varint(buf, len(pairs))
+            next_index = 0
+            for index, _mask in pairs:
+                _put_varint(buf, index - next_index)
+                next_index = index + 1
+            packed = 0
+            for k, (_index, mask) in enumerate(pairs):
+                packed |= code_of[mask] << (k * bits)
+            buf += packed.to_bytes((len(pairs) * bits + 7) // 8, "little")
+    return bytes(buf)
+
+
+def decode_presence(data: bytes) -> dict[str, dict[str, dict[str, int]]]:
+    """Reference decoder: encode_presence's bytes back to the JSON payload shape
+    (string taxon_id keys, as taxon_presence.json has them)."""
+    pos = 0
+
+    def varint() -> int:
+        nonlocal pos
+        n = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            n |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    def string() -> str:
+        nonlocal pos
+        length = varint()
+        pos += length
+        return data[pos - length:pos].decode("utf-8")
+
+    if data[:3] != PACKED_MAGIC or data[3] != PACKED_VERSION:
+        raise ValueError(f"not a version-{PACKED_VERSION} packed taxon presence file")
+    pos = 4
+    taxa = []
+    previous = 0
+    for _ in range(varint()):
+        previous += varint()
+        taxa.append(previous)
+    masks = [varint() for _ in range(varint())]
+    bits = max(1, (len(masks) - 1).bit_length())
+
+    payload: dict[str, dict[str, dict[str, int]]] = {}
+    for _ in range(varint()):
+        places = payload.setdefault(string(), {})
+        for _ in range(varint()):
+            place = string()
+            n = varint()
+            indices = []
+            next_index = 0
+            for _ in range(n):
+                next_index += varint()
+                indices.append(next_index)
+                next_index += 1
+            width = (n * bits + 7) // 8
+            packed = int.from_bytes(data[pos:pos + width], "little")
+            pos += width
+            places[place] = {
+                str(taxa[index]): masks[(packed >> (k * bits)) & ((1 << bits) - 1)]
+                for k, index in enumerate(indices)
+            }
+    if pos != len(data):
+        raise ValueError(f"{len(data) - pos} trailing bytes after packed taxon presence")
+    return payload
+
+
+def main(
+    export_dir: Path | None = None,
+    con: duckdb.DuckDBPyConnection | None = None,
+    packed: bool = False,
+) -> Path:
+    """Write taxon_presence.json, plus taxon_presence.bin when `packed`.
+
+    `con` (optional) is the connection to query on; without one a private
+    in-memory DuckDB is used.
+    """
     assets = Path(export_dir) if export_dir is not None else ASSETS_DIR
     occ_parquet = assets / "occurrences.parquet"
     if not occ_parquet.exists():
@@ -111,20 +267,29 @@ def main(export_dir: Path | None = None) -> Path:
             f"{occ_parquet} not found — run the dbt build and place-marts first"
         )
 
-    con = duckdb.connect()
+    owned = con is None
+    if owned:
+        con = duckdb.connect()
     try:
         payload = {
             "counties": _collect(con, str(occ_parquet), "o.county"),
             "ecoregions": _collect(con, str(occ_parquet), "o.ecoregion_l3"),
         }
     finally:
-        con.close()
+        if owned:
+            con.close()
 
     out_path = assets / "taxon_presence.json"
     # Compact separators: this is a wire artifact, not something anyone reads by
     # hand, and the whitespace is a third of the payload.
     out_path.write_text(json.dumps(payload, separators=(",", ":"), sort_keys=True) + "\n")
 
+    packed_path = assets / "taxon_presence.bin"
+    if packed:
+        packed_path.write_bytes(encode_presence(payload))
+    else:
+        packed_path.unlink(missing_ok=True)
+
     pairs = sum(len(v) for v in payload["counties"].values()) + sum(
         len(v) for v in payload["ecoregions"].values()
     )
@@ -132,9 +297,10 @@ def main(export_dir: Path | None = None) -> Path:
         f"taxon-presence-export: {len(payload['counties'])} counties, "
         f"{len(payload['ecoregions'])} ecoregions, {pairs} pairs -> "
         f"{out_path.name} ({out_path.stat().st_size:,} bytes)"
+        + (f", {packed_path.name} ({packed_path.stat().st_size:,} bytes)" if packed else "")
     )
     return out_path
 
 
 if __name__ == "__main__":
-    main()
+    main(packed=os.environ.get("TAXON_PRESENCE_BIN") == "1")
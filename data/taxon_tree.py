@@ -0,0 +1,197 @@
+"""In-memory iNat taxonomy tree for lowest-common-ancestor queries.
+
+The checklist helpers (resolve_checklist_names.compute_lca and
+checklist_pipeline._compute_lca) used to find the LCA of two names by splitting
+and zipping their slash-delimited `ancestry` strings. TaxonTree parses the
+lineages once into flat numpy arrays and answers with integer work:
+
+  - parent / depth: one int32 slot per node (parent = -1 at a root).
+  - LCA: binary-lifting table up[k][i] = 2**k-th ancestor of i. O(log depth).
+
+Nodes are stored in ascending taxon_id order so an id -> index lookup is a
+`np.searchsorted`. lca() goes through the vectorized lca_array().
+
+Built with TaxonTree.from_lineages() from (taxon_id, ancestor_ids) pairs;
+ancestors that have no row of their own become implicit nodes, so a handful of
+species lineages is enough (that is how the checklist helpers use it, through
+from_ancestry_map()).
+"""
+
+from collections.abc import Iterable, Mapping
+
+import numpy as np
+
+# Binary lifting cannot need more levels than this for any tree that fits in
+# int32 indices; hitting the cap means the parent links contain a cycle.
+_MAX_LEVELS = 32
+
+
+def parse_ancestry(ancestry: str | None) -> list[int]:
+    """Split an iNat `ancestry` string ("48460/1/47120/...") into ints.
+
+    Empty segments and non-numeric junk are skipped. This differs from the
+    store's ancestor_ids (taxa_pipeline.ensure_taxa_store), where TRY_CAST keeps
+    a junk segment as a NULL element: a lineage here only needs the real
+    ancestors, in order.
+    """
+    if not ancestry:
+        return []
+    return [int(p) for p in ancestry.split("/") if p.isdigit()]
+
+
+class TaxonTree:
+    """Array-backed taxonomy forest keyed by iNat taxon_id.
+
+    Unknown taxon_ids are never an error: lca() returns None and lca_array()
+    returns -1 for them.
+    """
+
+    def __init__(self, taxon_ids, parent_ids) -> None:
+        """Build from parallel taxon_id / parent taxon_id sequences.
+
+        A parent id < 0 (or None) marks a root. Duplicate taxon_ids keep their
+        first parent; parent ids with no row of their own become roots.
+        """
+        child = np.asarray(taxon_ids, dtype=np.int64)
+        parent = np.asarray(
+            [-1 if p is None else p for p in parent_ids], dtype=np.int64
+        )
+        if child.shape != parent.shape:
+            raise ValueError("taxon_ids and parent_ids must have the same length")
+
+        child, first = np.unique(child, return_index=True)
+        parent = parent[first]
+        implicit = np.setdiff1d(parent[parent >= 0], child)
+        ids = np.concatenate([child, implicit])
+        parents = np.concatenate([parent, np.full(len(implicit), -1, dtype=np.int64)])
+        order = np.argsort(ids, kind="stable")
+        self._ids = ids[order]
+        parents = parents[order]
+
+        parent_idx = np.full(len(self._ids), -1, dtype=np.int32)
+        has_parent = parents >= 0
+        parent_idx[has_parent] = np.searchsorted(self._ids, parents[has_parent])
+        if np.any(parent_idx == np.arange(len(parent_idx))):
+            raise ValueError("taxonomy contains a taxon that is its own parent")
+
+        self._up = self._lifting_table(parent_idx)
+        self._depth = self._depths(self._up)
+
+    # ------------------------------------------------------------------
+    # Constructors
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_lineages(cls, lineages: Iterable[tuple[int, Iterable[int]]]) -> "TaxonTree":
+        """Build from (taxon_id, root-first ancestor_ids) pairs.
+
+        Every ancestor on every lineage becomes a node whose parent is the
+        entry before it, so the lineages alone define the tree.
+        """
+        parent_of: dict[int, int] = {}
+        for taxon_id, ancestors in lineages:
+            path = [*ancestors, taxon_id]
+            prev = -1
+            for node in path:
+                node = int(node)
+                parent_of.setdefault(node, prev)
+                prev = node
+        return cls(list(parent_of.keys()), list(parent_of.values()))
+
+    @classmethod
+    def from_ancestry_map(cls, taxa: Mapping[str, Mapping]) -> "TaxonTree":
+        """Build from a {name: {"taxon_id", "ancestry"}} dict (checklist helpers)."""
+        return cls.from_lineages(
+            (row["taxon_id"], parse_ancestry(row["ancestry"])) for row in taxa.values()
+        )
+
+    # ------------------------------------------------------------------
+    # Array construction
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _lifting_table(parent_idx: np.ndarray) -> np.ndarray:
+        """up[k][i] = 2**k-th ancestor index of i, or -1 past the root."""
+        levels = [parent_idx]
+        while np.any(levels[-1] >= 0):
+            if len(levels) >= _MAX_LEVELS:
+                raise ValueError("taxonomy parent links contain a cycle")
+            prev = levels[-1]
+            nxt = np.full_like(prev, -1)
+            ok = prev >= 0
+            nxt[ok] = prev[prev[ok]]
+            levels.append(nxt)
+        return np.stack(levels)
+
+    @staticmethod
+    def _depths(up: np.ndarray) -> np.ndarray:
+        n = up.shape[1]
+        depth = np.zeros(n, dtype=np.int32)
+        cur = np.arange(n, dtype=np.int32)
+        for k in range(up.shape[0] - 1, -1, -1):
+            nxt = up[k][cur]
+            ok = nxt >= 0
+            depth[ok] += 1 << k
+            cur = np.where(ok, nxt, cur)
+        return depth
+
+    # ------------------------------------------------------------------
+    # Vectorized queries (index level)
+    # ------------------------------------------------------------------
+
+    def index_of(self, taxon_ids) -> np.ndarray:
+        """Map taxon_ids to internal node indices; -1 where unknown."""
+        ids = np.asarray(taxon_ids, dtype=np.int64)
+        pos = np.searchsorted(self._ids, ids)
+        pos = np.minimum(pos, max(len(self._ids) - 1, 0))
+        if len(self._ids) == 0:
+            return np.full(ids.shape, -1, dtype=np.int64)
+        return np.where(self._ids[pos] == ids, pos, -1)
+
+    def _lca_idx(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        ok = (a >= 0) & (b >= 0)
+        a = np.where(ok, a, 0)
+        b = np.where(ok, b, 0)
+        # Lift the deeper node to the shallower node's depth.
+        swap = self._depth[a] < self._depth[b]
+        a, b = np.where(swap, b, a), np.where(swap, a, b)
+        diff = self._depth[a] - self._depth[b]
+        for k in range(self._up.shape[0]):
+            step = ((diff >> k) & 1).astype(bool)
+            a = np.where(step, self._up[k][a], a)
+        # Climb both while their 2**k-th ancestors differ.
+        for k in range(self._up.shape[0] - 1, -1, -1):
+            ua = self._up[k][a]
+            ub = self._up[k][b]
+            move = (a != b) & (ua != ub)
+            a = np.where(move, ua, a)
+            b = np.where(move, ub, b)
+        result = np.where(a == b, a, self._up[0][a])
+        return np.where(ok, result, -1)
+
+    # ------------------------------------------------------------------
+    # Vectorized queries (taxon_id level)
+    # ------------------------------------------------------------------
+
+    def lca_array(self, a_ids, b_ids) -> np.ndarray:
+        """LCA taxon_id per pair; -1 for unknown ids or disjoint roots."""
+        idx = self._lca_idx(self.index_of(a_ids), self.index_of(b_ids))
+        return np.where(idx >= 0, self._ids[np.maximum(idx, 0)], -1)
+
+    # ------------------------------------------------------------------
+    # Scalar queries
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, taxon_id: object) -> bool:
+        return isinstance(taxon_id, (int, np.integer)) and self._scalar_index(taxon_id) >= 0
+
+    def _scalar_index(self, taxon_id: int) -> int:
+        return int(self.index_of([taxon_id])[0])
+
+    def lca(self, a: int, b: int) -> int | None:
+        """Lowest common ancestor taxon_id, or None for unknown ids / disjoint roots."""
+        result = int(self.lca_array([a], [b])[0])
+        return None if result < 0 else result
@@ -643,6 +643,45 @@ def _guard_real_db_path(request, monkeypatch, tmp_path):
             monkeypatch.setattr(mod, "DB_PATH", empty, raising=False)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _taxa_store_dir(tmp_path_factory):
+    """Keep parsed taxonomy stores out of the source tree.
+
+    ensure_taxa_store() writes its Parquet store beside the archive by default, which
+    for the committed tests/fixtures/*.csv.gz would litter the fixtures dir. Both the
+    env var (survives importlib.reload(taxa_pipeline)) and the already-imported
+    module attribute are pointed at a session tmp dir.
+    """
+    import os
+
+    store_dir = tmp_path_factory.mktemp("taxa_store")
+    old_env = os.environ.get("TAXA_STORE_DIR")
+    os.environ["TAXA_STORE_DIR"] = str(store_dir)
+    import taxa_pipeline
+
+    old_attr = taxa_pipeline.TAXA_STORE_DIR
+    taxa_pipeline.TAXA_STORE_DIR = store_dir
+    yield store_dir
+    taxa_pipeline.TAXA_STORE_DIR = old_attr
+    if old_env is None:
+        os.environ.pop("TAXA_STORE_DIR", None)
+    else:
+        os.environ["TAXA_STORE_DIR"] = old_env
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _geometry_cache_dir(tmp_path_factory):
+    """Keep the map generators' geometry cache (geometry_cache.CACHE_DIR) out of
+    data/. Entries are keyed by source version, so sharing one session dir
+    across tests is safe."""
+    import geometry_cache
+
+    old = geometry_cache.CACHE_DIR
+    geometry_cache.CACHE_DIR = tmp_path_factory.mktemp("geometry_cache")
+    yield geometry_cache.CACHE_DIR
+    geometry_cache.CACHE_DIR = old
+
+
 @pytest.fixture
 def export_dir(tmp_path):
     """Temporary directory for export output files."""
@@ -922,3 +922,40 @@ def test_tied_events_have_deterministic_total_order(tmp_path, monkeypatch):
     assert events_path.read_bytes() == first_bytes, (
         "collectors.events.json must be byte-identical across runs (beeatlas-8td)"
     )
+
+
+def test_sharded_layout_matches_flat(tmp_path, monkeypatch):
+    """EVENT_PAGES_LAYOUT=sharded: index + per-collector files rebuild exactly the flat
+    descriptors, and each layout removes the other's outputs."""
+    mod = _setup_env(tmp_path, monkeypatch)
+    mod.export_collectors_events_step()
+    flat_path = tmp_path / mod.EVENT_PAGES_FILE
+    flat = json.loads(flat_path.read_text())
+    assert flat, "alice should have a page 2"
+
+    con = duckdb.connect(str(tmp_path / "test.duckdb"))
+    try:
+        mod.export_collector_events(con, layout="sharded")
+        index_path = tmp_path / mod.EVENT_PAGES_INDEX
+        index = json.loads(index_path.read_text())
+        assert not flat_path.exists()
+        assert index["format"] == mod.EVENT_PAGES_INDEX_FORMAT
+
+        rebuilt = []
+        for entry in index["collectors"]:
+            pages = json.loads((tmp_path / index["dir"] / entry["file"]).read_text())
+            assert len(pages) == entry["total_pages"] - 1
+            rebuilt.extend(
+                {"login": entry["login"], "page_num": n, "total_pages": entry["total_pages"], "events": events}
+                for n, events in enumerate(pages, start=2)
+            )
+        assert rebuilt == flat
+
+        mod.export_collector_events(con, layout="flat")
+        assert json.loads(flat_path.read_text()) == flat
+        assert not index_path.exists() and not (tmp_path / mod.EVENT_PAGES_DIR).exists()
+
+        with pytest.raises(ValueError, match="EVENT_PAGES_LAYOUT"):
+            mod.export_collector_events(con, layout="nested")
+    finally:
+        con.close()
@@ -0,0 +1,222 @@
+"""Tests for db_patch — occurrences.db delta patches and the patch chain."""
+
+import csv
+import gzip
+import io
+import json
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from db_patch import (
+    PatchError,
+    apply_patch,
+    build_patch,
+    read_patch_meta,
+    update_patch_chain,
+    verify_patch,
+)
+from sqlite_export import content_digest, generate_sqlite
+
+# taxon_id, ancestry, rank_level, rank, name, active
+_TAXA = [
+    (630955, "48460/1/47120", 33, "superfamily", "Anthophila", "true"),
+    (47221, "48460/1/47120/630955", 30, "family", "Apidae", "true"),
+    (52775, "48460/1/47120/630955/47221", 20, "genus", "Bombus", "true"),
+    (52776, "48460/1/47120/630955/47221/52775", 10, "species", "Bombus melanopygus", "true"),
+    (52777, "48460/1/47120/630955/47221/52775", 10, "species", "Bombus vosnesenskii", "true"),
+]
+
+# ecdysis_id, observation_id, lat, lon, year, taxon_id, recordedBy
+_OLD_ROWS = [
+    (1, None, 47.1, -120.1, 2023, 52776, "A. Collector"),
+    (2, None, 47.2, -120.2, 2023, 52776, "A. Collector"),
+    (2, None, 47.2, -120.2, 2023, 52776, "A. Collector"),  # exact mart duplicate
+    (None, 10, 47.3, -120.3, 2024, 52777, None),
+    (3, None, 47.4, -120.4, 2024, 52777, "B. Collector"),
+]
+_NEW_ROWS = [
+    (1, None, 47.1, -120.1, 2023, 52776, "A. Collector"),
+    (2, None, 47.2, -120.2, 2023, 52776, "A. Collector"),  # duplicate collapsed
+    (None, 10, 47.3, -120.3, 2024, 52776, None),           # re-identified
+    (4, None, 47.5, -120.5, 2025, 52777, "C. Collector"),  # new; ecdysis:3 gone
+]
+
+
+@pytest.fixture
+def taxa_path(tmp_path: Path) -> Path:
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter="\t")
+    writer.writerow(["taxon_id", "ancestry", "rank_level", "rank", "name", "active"])
+    writer.writerows(_TAXA)
+    path = tmp_path / "taxa.csv.gz"
+    with gzip.open(path, "wt") as f:
+        f.write(buf.getvalue())
+    return path
+
+
+def _build_db(tmp_path: Path, name: str, rows: list[tuple], places: list[tuple], taxa_path: Path) -> Path:
+    src_dir = tmp_path / name
+    src_dir.mkdir()
+    cols = list(zip(*rows))
+    pq.write_table(
+        pa.table({
+            "ecdysis_id": pa.array(cols[0], pa.int64()),
+            "observation_id": pa.array(cols[1], pa.int64()),
+            "specimen_observation_id": pa.array([None] * len(rows), pa.int64()),
+            "checklist_id": pa.array([None] * len(rows), pa.int64()),
+            "lat": pa.array(cols[2], pa.float64()),
+            "lon": pa.array(cols[3], pa.float64()),
+            "year": pa.array(cols[4], pa.int32()),
+            "taxon_id": pa.array(cols[5], pa.int64()),
+            "recordedBy": pa.array(cols[6], pa.string()),
+        }),
+        src_dir / "occurrences.parquet",
+    )
+    pq.write_table(
+        pa.table({"occ_id": [p[0] for p in places], "place_slug": [p[1] for p in places]}),
+        src_dir / "occurrence_places.parquet",
+    )
+    dst = src_dir / "occurrences.db"
+    generate_sqlite(
+        src_dir / "occurrences.parquet", dst, taxa_path=taxa_path,
+        db_path=str(tmp_path / "absent.duckdb"), spatial_index=True, search_index=True,
+        geo_blob_bin=True,
+    )
+    return dst
+
+
+@pytest.fixture
+def dbs(tmp_path: Path, taxa_path: Path) -> tuple[Path, Path]:
+    old = _build_db(tmp_path, "old", _OLD_ROWS, [("ecdysis:1", "a"), ("ecdysis:3", "a")], taxa_path)
+    new = _build_db(tmp_path, "new", _NEW_ROWS, [("ecdysis:1", "a"), ("ecdysis:1", "b")], taxa_path)
+    return old, new
+
+
+def test_content_digest_ignores_row_order(tmp_path: Path, taxa_path: Path) -> None:
+    a = _build_db(tmp_path, "a", _NEW_ROWS, [], taxa_path)
+    b = _build_db(tmp_path, "b", list(reversed(_NEW_ROWS)), [], taxa_path)
+    assert a.read_bytes() != b.read_bytes()
+    assert content_digest(a) == content_digest(b)
+    with sqlite3.connect(a) as con:
+        assert con.execute("SELECT value FROM db_meta WHERE key = 'content_digest'").fetchone() == (content_digest(a),)
+
+
+def test_patch_holds_only_changed_groups(dbs: tuple[Path, Path], tmp_path: Path) -> None:
+    old, new = dbs
+    patch = tmp_path / "p.patch.db"
+    meta = build_patch(old, new, patch)
+    assert meta["from_digest"] == content_digest(old)
+    assert meta["to_digest"] == content_digest(new)
+    with sqlite3.connect(patch) as con:
+        deleted = {r[0] for r in con.execute("SELECT key FROM occurrences__delete")}
+        upserted = con.execute("SELECT ecdysis_id, observation_id FROM occurrences__upsert ORDER BY 1, 2").fetchall()
+        bridge = {r[0] for r in con.execute("SELECT key FROM occurrence_places__delete")}
+    # ecdysis:1 unchanged -> absent; ecdysis:2 lost its duplicate; inat:10 changed; ecdysis:3 deleted.
+    assert deleted == {"ecdysis:2", "ecdysis:3", "inat:10"}
+    assert upserted == [(None, 10), (2, None), (4, None)]
+    assert bridge == {"ecdysis:1", "ecdysis:3"}
+    assert read_patch_meta(patch)["occurrences.deleted_keys"] == "3"
+
+
+def test_apply_reproduces_new_db(dbs: tuple[Path, Path], tmp_path: Path) -> None:
+    old, new = dbs
+    patch = tmp_path / "p.patch.db"
+    build_patch(old, new, patch)
+    verify_patch(old, patch, new)
+
+    work = tmp_path / "work.db"
+    shutil.copyfile(old, work)
+    apply_patch(work, patch)
+    assert content_digest(work) == content_digest(new)
+    with sqlite3.connect(work) as con:
+        assert con.execute("SELECT count(*) FROM occurrences_rtree").fetchone() == (len(_NEW_ROWS),)
+        assert con.execute("SELECT count(*) FROM search_fts WHERE term = 'C. Collector'").fetchone() == (1,)
+        assert con.execute("SELECT count(*) FROM geo_blob_bin").fetchone() == (1,)
+
+
+def test_digest_covers_only_patched_tables(dbs: tuple[Path, Path]) -> None:
+    """Derived tables are rebuilt by the applier, not compared: a client that
+    rebuilds (or drops) them differently still lands on to_digest."""
+    _old, new = dbs
+    before = content_digest(new)
+    with sqlite3.connect(new) as con:
+        for derived in ("facet_counts", "geo_blob", "search_fts", "taxon_ancestors"):
+            con.execute(f"DROP TABLE IF EXISTS {derived}")
+    assert content_digest(new) == before
+    with sqlite3.connect(new) as con:
+        con.execute("DELETE FROM occurrence_places")
+    assert content_digest(new) != before
+
+
+def test_apply_reports_builder_failure_as_patch_error(
+    dbs: tuple[Path, Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import db_patch
+
+    def broken(_db: Path) -> None:
+        raise ValueError("facet_counts disagrees with occurrences")
+
+    old, new = dbs
+    patch = tmp_path / "p.patch.db"
+    build_patch(old, new, patch)
+    monkeypatch.setitem(db_patch._DERIVED_BUILDERS, "facet_counts", broken)
+    work = tmp_path / "work.db"
+    shutil.copyfile(old, work)
+    with pytest.raises(PatchError, match="rebuilding facet_counts failed"):
+        apply_patch(work, patch)
+
+
+def test_apply_refuses_wrong_base(dbs: tuple[Path, Path], tmp_path: Path) -> None:
+    old, new = dbs
+    patch = tmp_path / "p.patch.db"
+    build_patch(old, new, patch)
+    work = tmp_path / "work.db"
+    shutil.copyfile(new, work)
+    before = work.read_bytes()
+    with pytest.raises(PatchError, match="not this patch's base"):
+        apply_patch(work, patch)
+    assert work.read_bytes() == before
+
+
+def test_schema_change_not_patchable(dbs: tuple[Path, Path], tmp_path: Path) -> None:
+    old, new = dbs
+    with sqlite3.connect(new) as con:
+        con.execute("ALTER TABLE occurrences ADD COLUMN extra TEXT")
+    with pytest.raises(PatchError, match="schema changed"):
+        build_patch(old, new, tmp_path / "p.patch.db")
+    assert not (tmp_path / "p.patch.db").exists()
+
+
+def test_chain_appends_and_prunes(dbs: tuple[Path, Path], tmp_path: Path) -> None:
+    old, new = dbs
+    out = tmp_path / "db-patches"
+    chain = update_patch_chain(old, new, out, keep=1)
+    assert chain["current"] == content_digest(new)
+    [entry] = chain["patches"]
+    assert entry["from"] == content_digest(old)
+    assert (out / entry["file"]).stat().st_size == entry["bytes"]
+    assert json.loads((out / "index.json").read_text()) == chain
+
+    # A no-change night keeps the chain; with keep=1 the next night's patch
+    # displaces this one and its file is deleted.
+    assert update_patch_chain(new, new, out, keep=1) == chain
+    chain2 = update_patch_chain(new, old, out, keep=1)
+    assert [p["to"] for p in chain2["patches"]] == [content_digest(old)]
+    assert not (out / entry["file"]).exists()
+
+
+def test_chain_resets_across_gap(dbs: tuple[Path, Path], tmp_path: Path) -> None:
+    """A chain that does not end at tonight's DB cannot be followed: it is dropped."""
+    old, new = dbs
+    out = tmp_path / "db-patches"
+    first = update_patch_chain(old, new, out)
+    # Tonight's DB is `old` again with no patch built (no change vs. previous),
+    # so the stored chain (ending at `new`) no longer leads anywhere current.
+    chain = update_patch_chain(old, old, out)
+    assert chain == {"current": content_digest(old), "patches": []}
+    assert not (out / first["patches"][0]["file"]).exists()
@@ -306,6 +306,40 @@ def test_occurrences_tier_and_record_type_columns():
     assert null_rt == 0, f"occurrences.parquet has {null_rt} rows with null record_type"
 
 
+@pytest.mark.integration
+@pytest.mark.skipif(
+    not (SANDBOX / "occurrence_places.parquet").exists(),
+    reason="run `bash data/dbt/run.sh build` first to produce sandbox outputs",
+)
+def test_occ_id_materialized_and_sorted():
+    """occurrences.occ_id is the Option-B CASE over the row's own ids, and both
+    marts are written in occ_id order, so each row group's occ_id min/max range
+    follows the previous one's (what lets a bridge join prune row groups)."""
+    from export_context import OCC_ID_SQL
+
+    con = duckdb.connect()
+    for name in ("occurrences.parquet", "occurrence_places.parquet"):
+        path = str(SANDBOX / name)
+        if name == "occurrences.parquet":
+            mismatched = con.execute(
+                f"SELECT count(*) FROM read_parquet('{path}') WHERE occ_id IS DISTINCT FROM ({OCC_ID_SQL})"
+            ).fetchone()[0]
+            assert mismatched == 0, f"{mismatched} occurrences rows carry a stale occ_id"
+        unsorted = con.execute(f"""
+            SELECT count(*) FROM (
+                SELECT occ_id, lag(occ_id) OVER (ORDER BY file_row_number) AS prev
+                FROM read_parquet('{path}', file_row_number = true)
+            ) WHERE occ_id < prev
+        """).fetchone()[0]
+        assert unsorted == 0, f"{name} is not sorted on occ_id"
+        ranges = con.execute(f"""
+            SELECT stats_min_value, stats_max_value FROM parquet_metadata('{path}')
+            WHERE path_in_schema = 'occ_id' ORDER BY row_group_id
+        """).fetchall()
+        assert len(ranges) > 1, f"{name} was written as a single row group"
+        assert all(a[1] <= b[0] for a, b in zip(ranges, ranges[1:]))
+
+
 @pytest.mark.integration
 @_OCCURRENCES_GUARD
 def test_inat_expert_rows_in_occurrences():
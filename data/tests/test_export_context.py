@@ -0,0 +1,106 @@
+"""Tests for export_context — the exporters' shared FROM-item builders."""
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import collectors_export
+import places_export
+import taxon_presence_export
+from export_context import occurrences_source, parquet_source
+
+
+def _write_inputs(assets):
+    assets.mkdir(exist_ok=True)
+    pq.write_table(
+        pa.table({
+            "ecdysis_id": pa.array([1, None, None, None, 2], pa.int64()),
+            "observation_id": pa.array([None, 10, None, None, None], pa.int64()),
+            "specimen_observation_id": pa.array([None, None, 20, None, None], pa.int64()),
+            "checklist_id": pa.array([None, None, None, 30, None], pa.int64()),
+            "collector_inat_login": ["ann", "ann", None, None, "ben"],
+            "recordedBy": ["Ann A", None, None, None, "Ben B"],
+            "host_inat_login": ["ann", "ann", None, None, "ben"],
+            "record_type": ["specimen", "provisional_sample", "inat_expert", "checklist", "specimen"],
+            "sample_id": pa.array([5, None, None, None, 6], pa.int64()),
+            "sample_host": [None, None, None, None, None],
+            "taxon_id": pa.array([100, 100, 101, 101, 101], pa.int64()),
+            "year": pa.array([2021, 2022, 2023, 2024, 2024], pa.int32()),
+            "month": pa.array([5, 6, 7, 8, 6], pa.int32()),
+            "county": ["King", "King", "Yakima", "Yakima", "Chelan"],
+            "ecoregion_l3": ["Cascades", None, "Columbia Plateau", "Columbia Plateau", "Cascades"],
+            "tier": ["atlas", "atlas", "other", "other", "atlas"],
+        }),
+        assets / "occurrences.parquet",
+    )
+    pq.write_table(
+        pa.table({
+            "occ_id": ["ecdysis:1", "inat:10", "inat_obs:20", "checklist:30", "ecdysis:2", "ecdysis:2"],
+            "place_slug": ["a", "a", "b", "b", "a", "b"],
+        }),
+        assets / "occurrence_places.parquet",
+    )
+    _write_species(assets, ["Bombus", "Andrena"])
+
+
+def _write_species(assets, genera):
+    pq.write_table(
+        pa.table({
+            "taxon_id": pa.array([100, 101], pa.int64()),
+            "specific_epithet": ["one", "two"],
+            "genus": genera,
+            "canonical_name": [f"{g.lower()} x" for g in genera],
+            "scientificName": [f"{g} x" for g in genera],
+            "slug": [f"{g}/x" for g in genera],
+        }),
+        assets / "species.parquet",
+    )
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA geographies")
+    con.execute("CREATE TABLE geographies.places (slug VARCHAR, name VARCHAR, kind VARCHAR)")
+    con.execute("INSERT INTO geographies.places VALUES ('b', '9a. B', 'ecoregion_l4')")
+    yield con
+    con.close()
+
+
+def test_exporters_join_the_bridge_on_occ_id(tmp_path, monkeypatch, con):
+    """occurrences.parquet without an occ_id column still joins the bridge:
+    occurrences_source derives the key for every exporter that reads it."""
+    assets = tmp_path / "assets"
+    _write_inputs(assets)
+    monkeypatch.setattr(collectors_export, "ASSETS_DIR", assets)
+    occ, bridge, species = (
+        assets / n for n in ("occurrences.parquet", "occurrence_places.parquet", "species.parquet")
+    )
+
+    collectors_export.export_collectors(con)
+    taxon_presence_export.main(assets, con)
+    assert (assets / "collectors.json").exists()
+    assert (assets / "taxon_presence.json").exists()
+    assert places_export._query_counts(con, occ, bridge) == {
+        "a": {"specimen_count": 2, "sample_count": 2}, "b": {"specimen_count": 1, "sample_count": 1},
+    }
+    by_place = places_export._query_species_by_place(con, occ, bridge, species)
+    assert {g["genus"] for g in by_place["a"]} == {"Bombus", "Andrena"}
+    assert parquet_source(con, species).startswith("read_parquet(")
+
+
+def test_occurrences_source_adds_occ_id_only_when_needed(tmp_path, con):
+    _write_inputs(tmp_path)
+    occ = tmp_path / "occurrences.parquet"
+    ids = con.execute(f"SELECT occ_id FROM {occurrences_source(con, occ)} ORDER BY occ_id").fetchall()
+    assert ids == [("checklist:30",), ("ecdysis:1",), ("ecdysis:2",), ("inat:10",), ("inat_obs:20",)]
+
+    # A file that already carries occ_id keeps its own; a fixture without the
+    # identity columns is scanned as-is.
+    pq.write_table(pa.table({"occ_id": ["x"], "ecdysis_id": [1], "observation_id": [None],
+                             "specimen_observation_id": [None], "checklist_id": [None]}), occ)
+    assert con.execute(f"SELECT occ_id FROM {occurrences_source(con, occ)}").fetchall() == [("x",)]
+    pq.write_table(pa.table({"taxon_id": [1]}), occ)
+    assert con.execute(f"SELECT * FROM {occurrences_source(con, occ)}").fetchall() == [(1,)]
+
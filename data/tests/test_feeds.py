@@ -293,3 +293,184 @@ def test_index_json(fixture_con, export_dir):
         assert 'filename' in entry, f"Entry missing 'filename': {entry}"
         assert 'url' in entry, f"Entry missing 'url': {entry}"
         assert 'filter_value' in entry, f"Entry missing 'filter_value': {entry}"
+
+
+# ---------------------------------------------------------------------------
+# One-pass generation: one window query, streamed output identical to the
+# former per-value queries + ElementTree rendering
+# ---------------------------------------------------------------------------
+
+def _reference_feed(title: str, feed_id: str, updated: str, rows: list) -> str:
+    """The ElementTree rendering feeds.py used before the streaming writer.
+
+    Needs ATOM_NS registered as the default namespace (see _atom_default_ns).
+    """
+    feed = ET.Element(_atom('feed'))
+    feed.set('xml:lang', 'en')
+    ET.SubElement(feed, _atom('title')).text = title
+    ET.SubElement(feed, _atom('id')).text = feed_id
+    link_el = ET.SubElement(feed, _atom('link'))
+    link_el.set('rel', 'self')
+    link_el.set('href', feed_id)
+    ET.SubElement(feed, _atom('updated')).text = updated
+    for modified, taxon_name, determiner, uuid, ecdysis_id, collector, coll_date, _genus in rows:
+        entry = ET.SubElement(feed, _atom('entry'))
+        ET.SubElement(entry, _atom('id')).text = f'urn:ecdysis:{uuid}'
+        ET.SubElement(entry, _atom('title')).text = f'{taxon_name} — determined by {determiner}'
+        ET.SubElement(entry, _atom('updated')).text = modified.astimezone(datetime.timezone.utc).isoformat()
+        ET.SubElement(entry, _atom('link')).set(
+            'href', f'https://ecdysis.org/collections/individual/index.php?occid={ecdysis_id}'
+        )
+        summary = ET.SubElement(entry, _atom('summary'))
+        summary.set('type', 'text')
+        summary.text = f'Collected by {collector} on {coll_date}. Specimen: ecdysis:{ecdysis_id}'
+    ET.indent(ET.ElementTree(feed), space='  ')
+    return ET.tostring(feed, xml_declaration=True, encoding='unicode')
+
+
+@pytest.fixture
+def _atom_default_ns(monkeypatch):
+    """Register ATOM_NS as the default namespace for this test only.
+
+    register_namespace is process-wide; left in place it would rename the
+    default namespace species_maps serializes SVG under.
+    """
+    monkeypatch.setattr(ET, '_namespace_map', dict(ET._namespace_map))
+    ET.register_namespace('', ATOM_NS)
+
+
+class _CountingCon:
+    """Pass-through connection that counts execute() calls."""
+
+    def __init__(self, con):
+        self._con = con
+        self.queries = 0
+
+    def execute(self, *args, **kwargs):
+        self.queries += 1
+        return self._con.execute(*args, **kwargs)
+
+
+def _window_db():
+    """In-memory Ecdysis tables: two busy collectors, an unknown one, and an idle
+    one whose only determination is outside the 90-day window."""
+    import duckdb
+
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA ecdysis_data")
+    con.execute("""
+        CREATE TABLE ecdysis_data.identifications (
+            coreid VARCHAR, scientific_name VARCHAR, identified_by VARCHAR, modified TIMESTAMPTZ
+        )
+    """)
+    con.execute("""
+        CREATE TABLE ecdysis_data.occurrences (
+            id VARCHAR, occurrence_id VARCHAR, recorded_by VARCHAR, genus VARCHAR, event_date VARCHAR
+        )
+    """)
+    con.execute("""
+        INSERT INTO ecdysis_data.occurrences VALUES
+            ('1', 'u-1', 'Ann O''Brien & <Co>', 'Bombus', '2024-06-01'),
+            ('2', 'u-2', 'Ann O''Brien & <Co>', 'Andrena', '2024-06-02'),
+            ('3', 'u-3', 'Björn "B" Ek', 'Bombus', '2024-06-03'),
+            ('4', 'u-4', NULL, NULL, NULL),
+            ('5', 'u-5', 'Idle Collector', 'Osmia', '2019-05-05')
+    """)
+    con.execute("""
+        INSERT INTO ecdysis_data.identifications VALUES
+            ('1', 'Bombus vosnesenskii', 'Det > One', NOW() - INTERVAL '1 day'),
+            ('2', 'Andrena sp.', 'Det Two', NOW() - INTERVAL '2 days'),
+            ('3', 'Bombus mixtus', 'Det Three', NOW() - INTERVAL '3 days'),
+            ('1', 'Bombus flavifrons', 'Det\tFour', NOW() - INTERVAL '4 days'),
+            ('4', 'Osmia lignaria', 'Det Five', NOW() - INTERVAL '5 days'),
+            ('5', 'Osmia lignaria', 'Det Six', NOW() - INTERVAL '200 days')
+    """)
+    return con
+
+
+def test_one_pass_matches_per_value_rendering(tmp_path, _atom_default_ns):
+    con = _window_db()
+    run_time = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    counting = _CountingCon(con)
+    feeds_mod.write_determinations_feed(con, tmp_path)
+    entries = write_all_variants(counting, tmp_path, run_time)
+    # Two enumerations plus the one window query, however many feeds.
+    assert counting.queries == 3
+    assert len(entries) == 6
+
+    window = f"SELECT * FROM ({feeds_mod._QUERY}) WHERE {{}} = ? ORDER BY modified DESC"
+    for entry in entries:
+        column = 'collector' if entry['filter_type'] == 'collector' else 'genus'
+        rows = con.execute(window.format(column), [entry['filter_value']]).fetchall()
+        updated = rows[0][0].astimezone(datetime.timezone.utc).isoformat() if rows else run_time.isoformat()
+        expected = _reference_feed(entry['title'], f"https://beeatlas.org{entry['url']}", updated, rows)
+        assert (tmp_path / 'feeds' / entry['filename']).read_text(encoding='utf-8') == expected
+        assert entry['entry_count'] == len(rows)
+    assert {e['filter_value']: e['entry_count'] for e in entries}['Idle Collector'] == 0
+
+    rows = con.execute(feeds_mod._QUERY).fetchall()
+    expected = _reference_feed(
+        feeds_mod._FEED_TITLE, feeds_mod._FEED_ID,
+        rows[0][0].astimezone(datetime.timezone.utc).isoformat(), rows,
+    )
+    assert (tmp_path / 'feeds' / 'determinations.xml').read_text(encoding='utf-8') == expected
+    con.close()
+
+
+def _run_incremental(con, out_dir, run_time):
+    digests = feeds_mod._FeedDigests(out_dir / feeds_mod.FEED_DIGESTS_NAME)
+    rows = feeds_mod._recent_rows(con)
+    feeds_mod.write_determinations_feed(con, out_dir, rows, digests)
+    entries = write_all_variants(con, out_dir, run_time, rows, digests)
+    write_index_json(out_dir, entries, digests)
+    digests.save()
+    return digests
+
+
+def _feed_updated(path):
+    return ET.parse(str(path)).getroot().find(_atom('updated')).text
+
+
+def test_incremental_rewrites_only_changed_feeds(tmp_path):
+    con = _window_db()
+    feeds_dir = tmp_path / 'feeds'
+    first_run = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    first = _run_incremental(con, tmp_path, first_run)
+    # determinations.xml, 4 collector + 2 genus feeds (Osmia only via the idle
+    # collector's occurrence), index.json.
+    assert (first.rewritten, first.skipped) == (8, 0)
+    before = {p.name: p.read_bytes() for p in feeds_dir.iterdir()}
+
+    # Same window, later run: nothing is rewritten — not even the empty feed,
+    # whose <updated> stays the run time it was written at.
+    again = _run_incremental(con, tmp_path, first_run + datetime.timedelta(days=1))
+    assert (again.rewritten, again.skipped) == (0, 8)
+    assert {p.name: p.read_bytes() for p in feeds_dir.iterdir()} == before
+    assert _feed_updated(feeds_dir / 'collector-idle-collector.xml') == first_run.isoformat()
+
+    # Björn's only determination is re-dated: his feed, the Bombus feed and
+    # determinations.xml change; index.json does not (entry counts unchanged).
+    con.execute("UPDATE ecdysis_data.identifications SET modified = NOW() WHERE coreid = '3'")
+    changed = _run_incremental(con, tmp_path, first_run)
+    assert changed.rewritten == 3
+    rewritten = {p.name for p in feeds_dir.iterdir() if p.read_bytes() != before[p.name]}
+    assert rewritten == {'determinations.xml', 'collector-bjorn-b-ek.xml', 'genus-bombus.xml'}
+
+    # The window drops Ann's OLDER Bombus determination: her feed is rewritten
+    # (one entry fewer) with its <updated> still her newest determination.
+    ann = feeds_dir / 'collector-ann-obrien-co.xml'
+    ann_updated = _feed_updated(ann)
+    con.execute(
+        "UPDATE ecdysis_data.identifications SET modified = NOW() - INTERVAL '120 days' "
+        "WHERE scientific_name = 'Bombus flavifrons'"
+    )
+    dropped = _run_incremental(con, tmp_path, first_run)
+    assert len(ET.parse(str(ann)).getroot().findall(_atom('entry'))) == 2
+    assert _feed_updated(ann) == ann_updated
+    assert 'index.json' in dropped.current and dropped.rewritten == 4  # + index.json
+
+    # A deleted file is rewritten even though its digest matches.
+    ann.unlink()
+    restored = _run_incremental(con, tmp_path, first_run)
+    assert (restored.rewritten, ann.exists()) == (1, True)
+    con.close()
@@ -0,0 +1,125 @@
+"""Tests for geometry_cache — persisted simplified/projected boundary layers."""
+
+import json
+import pickle
+
+import duckdb
+import pytest
+
+import geometry_cache
+import species_maps
+
+_VIEWPORT = geometry_cache.Viewport(species_maps.WA_BBOX, species_maps.SVG_WIDTH, species_maps.SVG_HEIGHT)
+_SQL = "SELECT name, geom FROM geographies.us_counties WHERE state_fips = ?"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(geometry_cache, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute("LOAD spatial")
+    con.execute("CREATE SCHEMA geographies")
+    con.execute(
+        "CREATE TABLE geographies.us_counties AS SELECT * FROM (VALUES "
+        "('Chelan', '53', ST_GeomFromText('POLYGON((-121 47, -120 47, -120.0001 47.5, -120 48, -121 48, -121 47))')), "
+        "('King', '53', ST_GeomFromText('MULTIPOLYGON(((-122.5 47, -121.5 47, -121.5 48, -122.5 47)))')), "
+        "('Multnomah', '41', ST_GeomFromText('POLYGON((-122.8 45.4, -122 45.4, -122 45.7, -122.8 45.4))'))"
+        ") t(name, state_fips, geom)"
+    )
+    yield con
+    con.close()
+
+
+def test_table_layer_hit_skips_recompute(con, cache_dir):
+    calls = []
+
+    def to_d(geom):
+        calls.append(geom)
+        return species_maps._polygon_d(geom)
+
+    first = geometry_cache.table_layer(con, "counties", _SQL, ["53"], 0.005, _VIEWPORT, to_d)
+    assert [s.name for s in first] == ["Chelan", "King"]
+    # Simplified at the requested tolerance: the 0.0001° notch is gone.
+    assert len(first[0].geom["coordinates"][0]) == 5
+    assert first[0].d == species_maps._polygon_d(first[0].geom)
+    assert len(calls) == 2
+
+    again = geometry_cache.table_layer(con, "counties", _SQL, ["53"], 0.005, _VIEWPORT, to_d)
+    assert again == first
+    assert len(calls) == 2
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # Another tolerance is another entry; the first stays valid.
+    geometry_cache.table_layer(con, "counties", _SQL, ["53"], 0.0, _VIEWPORT, to_d)
+    assert len(calls) == 4
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_path_function_change_invalidates(con, cache_dir):
+    """Same qualname, different body: the edited to_d's output is not served
+    from the old entry."""
+    def to_d(geom):
+        return species_maps._polygon_d(geom)
+    first = geometry_cache.table_layer(con, "counties", _SQL, ["53"], 0.005, _VIEWPORT, to_d)
+
+    def to_d(geom):  # noqa: F811 — the edit under test
+        return species_maps._polygon_d(geom) + "Z"
+    edited = geometry_cache.table_layer(con, "counties", _SQL, ["53"], 0.005, _VIEWPORT, to_d)
+    assert [s.d for s in edited] == [s.d + "Z" for s in first]
+
+
+def test_code_hash_follows_same_module_callees(monkeypatch):
+    before = geometry_cache._code_hash(species_maps._polygon_d)
+    assert geometry_cache._code_hash(species_maps._polygon_d) == before
+    monkeypatch.setattr(species_maps, "_ring_to_path", lambda ring: "M0 0Z")
+    assert geometry_cache._code_hash(species_maps._polygon_d) != before
+
+
+def test_table_change_invalidates(con, cache_dir):
+    before = geometry_cache.table_layer(con, "counties", _SQL, ["53"], 0.005, _VIEWPORT, species_maps._polygon_d)
+    con.execute(
+        "UPDATE geographies.us_counties SET geom = ST_GeomFromText("
+        "'POLYGON((-121 47, -119 47, -119 48, -121 48, -121 47))') WHERE name = 'Chelan'"
+    )
+    after = geometry_cache.table_layer(con, "counties", _SQL, ["53"], 0.005, _VIEWPORT, species_maps._polygon_d)
+    before, after = ({s.name: s for s in shapes} for shapes in (before, after))
+    assert after["Chelan"].d != before["Chelan"].d and after["King"] == before["King"]
+    # Overwritten in place, not accumulated.
+    [entry] = cache_dir.iterdir()
+    assert {n: d for n, _g, d in json.loads(entry.read_text())["shapes"]}["Chelan"] == after["Chelan"].d
+
+
+def test_geojson_layer_keeps_duplicates_and_failures(con, cache_dir, tmp_path):
+    square = {"type": "Polygon", "coordinates": [[[-121, 47], [-120, 47], [-120, 48], [-121, 48], [-121, 47]]]}
+    path = tmp_path / "eco.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"name": "A"}, "geometry": square},
+        {"type": "Feature", "properties": {"name": "A"}, "geometry": square},
+        {"type": "Feature", "properties": {"name": "B"}, "geometry": {"type": "Bogus"}},
+    ]}))
+    shapes = geometry_cache.geojson_layer(con, "eco", path, "name", 0.02, _VIEWPORT, species_maps._polygon_d)
+    assert [(s.name, s.geom is not None) for s in shapes] == [("A", True), ("A", True), ("B", False)]
+    assert geometry_cache.geojson_layer(con, "eco", path, "name", 0.02, _VIEWPORT, species_maps._polygon_d) == shapes
+
+
+def test_species_backdrop_unchanged_by_cache(con, cache_dir):
+    """_load_county_geojsons hands back a Layer whose cached paths reproduce the
+    uncached backdrop byte for byte, and that survives a trip to a pool worker."""
+    layer = species_maps._load_county_geojsons(con)
+    assert isinstance(layer, geometry_cache.Layer)
+    plain = dict(layer)
+    assert not hasattr(plain, "paths")
+
+    def svg(counties):
+        backdrop = species_maps._build_county_backdrop(counties)
+        template = species_maps._template(backdrop)
+        return template.empty, template.county_path("King", counties, "checklist-county")
+
+    assert svg(layer) == svg(plain)
+    revived = pickle.loads(pickle.dumps(layer))
+    assert revived == layer and revived.paths == layer.paths
@@ -0,0 +1,73 @@
+"""Tests for json_stream — streamed JSON artifacts, byte-identical to json.dumps."""
+
+import json
+
+import pytest
+
+from json_stream import write_json
+
+_RECORDS = [
+    {
+        "login": "ann",
+        "display_name": "Ann Ångström — \"quoted\"\nnewline",
+        "count": 3,
+        "ratio": 0.1,
+        "missing": None,
+        "flag": True,
+        "events": [{"event_type": "Collected", "months": [0] * 12}, {}],
+        "species_by_genus": [],
+        "nested": {"b": [1, [2, []]], "a": {}},
+    },
+    {"login": "bob", "events": [], "nested": {"z": 1.5e300, "y": -0}},
+    {},
+]
+_VALUES = [
+    _RECORDS,
+    [],
+    {},
+    {"type": "FeatureCollection", "features": _RECORDS},
+    {"b": _RECORDS, "a": {"x": [1, 2]}, 3: "int key", 1.5: "float key", None: "null key"},
+    "just a string",
+    42,
+]
+_MODES = [
+    ({"indent": 2}, {"indent": 2}),
+    ({"compact": True}, {"separators": (",", ":")}),
+    ({}, {}),
+]
+
+
+@pytest.mark.parametrize("depth", [0, 1, 2, 3])
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("mode", _MODES, ids=["indent", "compact", "default"])
+@pytest.mark.parametrize("value", range(len(_VALUES)))
+def test_byte_identical_to_json_dumps(tmp_path, value, mode, sort_keys, depth):
+    value = _VALUES[value]
+    if sort_keys and isinstance(value, dict) and any(not isinstance(k, str) for k in value):
+        pytest.skip("mixed key types are unsortable for json.dumps too")
+    ours, theirs = mode
+    out = tmp_path / "out.json"
+    write_json(out, value, sort_keys=sort_keys, depth=depth, **ours)
+    expected = json.dumps(value, sort_keys=sort_keys, **theirs).encode("utf-8")
+    assert out.read_bytes() == expected
+
+
+def test_streams_generators_and_replaces_atomically(tmp_path):
+    out = tmp_path / "out.json"
+    write_json(out, (r for r in _RECORDS), indent=2)
+    assert out.read_text(encoding="utf-8") == json.dumps(_RECORDS, indent=2)
+    write_json(out, {"features": iter(_RECORDS[:1])}, compact=True, depth=2)
+    assert json.loads(out.read_text(encoding="utf-8")) == {"features": _RECORDS[:1]}
+
+    def failing():
+        yield {"ok": 1}
+        raise RuntimeError("export failed mid-stream")
+
+    with pytest.raises(RuntimeError):
+        write_json(out, failing(), indent=2)
+    # The previous artifact is untouched and no temp file is left behind.
+    assert json.loads(out.read_text(encoding="utf-8")) == {"features": _RECORDS[:1]}
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+    with pytest.raises(ValueError):
+        write_json(out, [], indent=2, compact=True)
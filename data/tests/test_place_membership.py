@@ -0,0 +1,218 @@
+"""Tests for the incremental int_place_membership model behind occurrence_places.
+
+After a day of moved, new and vanished points and edited, added and removed
+places, it must hold exactly what a full rebuild does — and its weekly
+full-rebuild check (dbt/tests/assert_place_membership_matches_full_rebuild.sql)
+must say so. Fixtures put points on polygon edges and vertices, in overlapping
+places, holes and multipolygons, in an invalid polygon, and at NULL coordinates.
+"""
+
+import math
+import random
+from pathlib import Path
+
+import duckdb
+import jinja2
+import pyarrow as pa
+import pytest
+
+# Squares with shared and overlapping edges, a hole, a multipolygon and an
+# invalid one.
+_PLACES = {
+    "square-a": "POLYGON((-121.0 47.0, -120.9 47.0, -120.9 47.1, -121.0 47.1, -121.0 47.0))",
+    "square-b": "POLYGON((-120.95 47.0, -120.85 47.0, -120.85 47.1, -120.95 47.1, -120.95 47.0))",
+    "holed": (
+        "POLYGON((-120.8 47.0, -120.6 47.0, -120.6 47.2, -120.8 47.2, -120.8 47.0),"
+        " (-120.75 47.05, -120.65 47.05, -120.65 47.15, -120.75 47.15, -120.75 47.05))"
+    ),
+    "multi": (
+        "MULTIPOLYGON(((-121.2 47.3, -121.1 47.3, -121.1 47.4, -121.2 47.4, -121.2 47.3)),"
+        " ((-121.05 47.3, -121.0 47.3, -121.0 47.35, -121.05 47.3)))"
+    ),
+    # Self-intersecting bowtie: fails ST_IsValid.
+    "bowtie": "POLYGON((-120.5 47.0, -120.4 47.1, -120.4 47.0, -120.5 47.1, -120.5 47.0))",
+}
+
+
+def _circle(cx: float, cy: float, r: float, n: int) -> str:
+    ring = [(cx + r * math.cos(k * math.tau / n), cy + r * math.sin(k * math.tau / n)) for k in range(n)]
+    return "POLYGON((" + ", ".join(f"{x!r} {y!r}" for x, y in ring + ring[:1]) + "))"
+
+
+def _points() -> list[tuple[float | None, float | None]]:
+    pts: list[tuple[float | None, float | None]] = []
+    # Every vertex, edge midpoint and interior point of a 0.005° lattice over the
+    # fixtures: lands on polygon edges and polygon vertices alike.
+    for i in range(0, 161):
+        for j in range(0, 81):
+            pts.append((round(-121.25 + i * 0.005, 6), round(46.98 + j * 0.005, 6)))
+    rng = random.Random(7)
+    pts += [(rng.uniform(-121.3, -120.3), rng.uniform(46.9, 47.5)) for _ in range(5000)]
+    pts += [(None, 47.05), (-120.92, None), (None, None)]
+    return pts
+
+
+# The model is rendered with jinja2 and materialized the way dbt-duckdb's
+# delete+insert incremental strategy does: delete the batch's coord_keys, insert
+# the batch, run the post-hook.
+
+_DBT = Path(__file__).parent.parent / "dbt"
+_MACROS = (_DBT / "macros" / "coord_key.sql").read_text()
+
+
+def _render(model: str, incremental: bool, this: str) -> tuple[str, dict]:
+    config: dict = {}
+
+    def _config(**kwargs):
+        config.update(kwargs)
+        return ""
+
+    env = jinja2.Environment()
+    env.globals.update(
+        config=_config,
+        ref=lambda name: name,
+        source=lambda _schema, name: name,
+        is_incremental=lambda: incremental,
+        this=this,
+    )
+    sql = env.from_string(_MACROS + (_DBT / "models" / "intermediate" / f"{model}.sql").read_text()).render()
+    hooks = config.get("post_hook", [])
+    hooks = [env.from_string(h).render() for h in ([hooks] if isinstance(hooks, str) else hooks)]
+    return sql, hooks
+
+
+def _build(con, this: str, incremental: bool) -> int:
+    """Materialize int_place_membership as `this`; returns the batch's tested coordinates."""
+    sql, hooks = _render("int_place_membership", incremental, this)
+    if incremental:
+        con.execute(f"CREATE OR REPLACE TEMP TABLE batch AS {sql}")
+        con.execute(f"DELETE FROM {this} WHERE coord_key IN (SELECT coord_key FROM batch)")
+        con.execute(f"INSERT INTO {this} SELECT * FROM batch")
+    else:
+        con.execute(f"CREATE OR REPLACE TABLE {this} AS {sql}")
+        con.execute(f"CREATE OR REPLACE TEMP TABLE batch AS SELECT * FROM {this}")
+    for hook in hooks:
+        con.execute(hook)
+    (tested,) = con.execute("SELECT count(*) FROM batch WHERE coord_key <> 0 AND place_slug IS NULL").fetchone()
+    return tested
+
+
+@pytest.fixture
+def bridge_con():
+    con = duckdb.connect()
+    con.execute("INSTALL spatial")
+    con.execute("LOAD spatial")
+    con.execute("CREATE TABLE places (slug VARCHAR, geom GEOMETRY)")
+    for slug, wkt in dict(_PLACES, dense=_circle(-120.9, 47.4, 0.07, 720)).items():
+        con.execute("INSERT INTO places VALUES (?, ST_GeomFromText(?))", [slug, wkt])
+    pts = _points()
+    int_combined = pa.table({
+        "i": pa.array(range(len(pts)), pa.int64()),
+        "lon": pa.array([p[0] for p in pts], pa.float64()),
+        "lat": pa.array([p[1] for p in pts], pa.float64()),
+        "record_type": ["checklist" if i % 50 == 0 else "specimen" for i in range(len(pts))],
+    })
+    con.execute("CREATE TABLE int_combined AS SELECT * FROM int_combined")
+    con.execute(f"CREATE VIEW int_place_coords AS {_render('int_place_coords', False, 'int_place_coords')[0]}")
+    yield con
+    con.close()
+
+
+def _day_of_edits(con) -> None:
+    """One night's worth of change to both inputs."""
+    # Moved, vanished and new occurrences (and a point moved onto another's spot).
+    con.execute("UPDATE int_combined SET lon = lon + 0.0031 WHERE i % 97 = 1")
+    con.execute("DELETE FROM int_combined WHERE i % 89 = 2")
+    con.execute("INSERT INTO int_combined VALUES (-1, -120.97, 47.05, 'specimen'), (-2, -120.7, 47.1, 'specimen')")
+    con.execute("INSERT INTO int_combined SELECT -i, lon + 0.001, lat, record_type FROM int_combined WHERE i % 211 = 3")
+    # An edited boundary, a removed place, an added one.
+    con.execute("""
+        UPDATE places SET geom = ST_GeomFromText(
+            'POLYGON((-121.0 47.0, -120.88 47.0, -120.88 47.12, -121.0 47.1, -121.0 47.0))')
+        WHERE slug = 'square-a'
+    """)
+    con.execute("DELETE FROM places WHERE slug = 'multi'")
+    con.execute("INSERT INTO places VALUES ('new-site', ST_GeomFromText(?))", [_circle(-120.55, 47.3, 0.04, 300)])
+
+
+def _table_diff(con, a: str, b: str) -> list:
+    return con.execute(f"""
+        (SELECT * FROM {a} EXCEPT ALL SELECT * FROM {b})
+        UNION ALL
+        (SELECT * FROM {b} EXCEPT ALL SELECT * FROM {a})
+    """).fetchall()
+
+
+def test_incremental_build_matches_full_rebuild(bridge_con):
+    con = bridge_con
+    full_tested = _build(con, "int_place_membership", incremental=False)
+    (coords,) = con.execute("SELECT count(*) FROM int_place_coords").fetchone()
+    assert full_tested == coords
+
+    _day_of_edits(con)
+    tested = _build(con, "int_place_membership", incremental=True)
+    _build(con, "rebuilt", incremental=False)
+
+    assert _table_diff(con, "int_place_membership", "rebuilt") == []
+    # Only the day's changes were re-tested, not every coordinate.
+    assert 0 < tested < coords / 3
+
+
+def test_incremental_build_with_no_changes_tests_nothing(bridge_con):
+    con = bridge_con
+    _build(con, "int_place_membership", incremental=False)
+    before = con.execute("SELECT * FROM int_place_membership").fetchall()
+    assert _build(con, "int_place_membership", incremental=True) == 0
+    assert sorted(con.execute("SELECT * FROM int_place_membership").fetchall(), key=repr) == sorted(before, key=repr)
+
+
+def test_full_rebuild_check_passes_and_catches_staleness(bridge_con):
+    """dbt/tests/assert_place_membership_matches_full_rebuild.sql returns no rows for
+    a correct table, and names the row a missed change leaves behind."""
+    con = bridge_con
+    env = jinja2.Environment()
+    env.globals.update(
+        config=lambda **_kw: "",
+        var=lambda _name, default=None: default,
+        ref=lambda name: name,
+        source=lambda _schema, name: name,
+    )
+    check = env.from_string(
+        _MACROS + (_DBT / "tests" / "assert_place_membership_matches_full_rebuild.sql").read_text()
+    ).render()
+
+    _build(con, "int_place_membership", incremental=False)
+    _day_of_edits(con)
+    _build(con, "int_place_membership", incremental=True)
+    assert con.execute(check).fetchall() == []
+
+    # A place edit the change detection "missed": the stored version row and the
+    # memberships still describe the old boundary.
+    con.execute("""
+        UPDATE places SET geom = ST_GeomFromText(
+            'POLYGON((-120.95 47.0, -120.8 47.0, -120.8 47.1, -120.95 47.1, -120.95 47.0))')
+        WHERE slug = 'square-b'
+    """)
+    problems = {row[0] for row in con.execute(check).fetchall()}
+    assert {"missing membership", "stale membership", "place version out of date"} <= problems
+
+
+def _plan(con, sql: str) -> str:
+    return "\n".join(row[1] for row in con.execute(f"EXPLAIN {sql}").fetchall())
+
+
+def test_membership_join_is_planned_as_spatial_join(bridge_con):
+    """The point-in-polygon joins run as DuckDB's SPATIAL_JOIN (an R-tree over the
+    place bboxes), not a nested loop testing every point against every place —
+    why the model needs no index of its own."""
+    con = bridge_con
+    full_sql, _hooks = _render("int_place_membership", False, "int_place_membership")
+    full = _plan(con, full_sql)
+    assert full.count("SPATIAL_JOIN") == 1, full
+    _build(con, "int_place_membership", incremental=False)
+    # Incremental: the re-test join and the added-places probe.
+    incremental_sql, _hooks = _render("int_place_membership", True, "int_place_membership")
+    incremental = _plan(con, incremental_sql)
+    assert incremental.count("SPATIAL_JOIN") == 2, incremental
+    for plan in (full, incremental):
+        assert "NESTED_LOOP_JOIN" not in plan and "BLOCKWISE_NL_JOIN" not in plan, plan
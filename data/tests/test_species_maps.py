@@ -740,3 +740,287 @@ def test_generate_group_maps_colors_specimenless_species_that_plots(tmp_path, mo
     assert fills[0] != fills[1], "Two mapped species must not collide on one hue"
     for fill in fills:
         assert fill != '#aaaaaa', "A species that plots must not be drawn grey"
+
+
+def test_parallel_rendering_byte_identical_to_serial(tmp_path, monkeypatch):
+    """workers=2 renders the group maps and species maps through a process pool;
+    every file matches the serial (workers=1) run byte for byte, and the clipped
+    counts come back in job order.
+    """
+    monkeypatch.setattr(species_maps_module, 'ASSETS_DIR', tmp_path)
+    _write_test_species_parquet(tmp_path)
+    con = duckdb.connect()
+    county = {"type": "Polygon", "coordinates": [[[-121, 47], [-120, 47], [-120, 48], [-121, 47]]]}
+    counties = {"Chelan": county, "Kittitas": county}
+    backdrop = species_maps_module._build_county_backdrop(counties)
+    WA_IN, WA_OUT = (-120.5, 47.5), (-100.0, 40.0)
+    occ_by_canon = {
+        'Andrena milwaukeensis': [WA_IN, WA_OUT],
+        'Andrena prunorum': [WA_IN, (-121.2, 46.1)],
+        'Bombus mixtus': [WA_IN, WA_OUT, WA_OUT],
+        'Apis mellifera': [(-117.5, 48.2)],
+    }
+
+    outputs = {}
+    for workers in (1, 2):
+        maps_dir = tmp_path / f"maps-{workers}"
+        maps_dir.mkdir()
+        _generate_group_maps(con, occ_by_canon, backdrop, maps_dir, workers=workers)
+        jobs = [
+            (f"{canon.split()[0]}/{canon.split()[1]}", pts, {"Chelan"} if i % 2 else set(), maps_dir)
+            for i, (canon, pts) in enumerate(sorted(occ_by_canon.items()))
+        ]
+        results = species_maps_module._render_maps(
+            species_maps_module._species_map_job, jobs, backdrop, counties, workers
+        )
+        assert [clipped for clipped, _plain, _written in results] == [1, 0, 0, 2]
+        outputs[workers] = {
+            p.relative_to(maps_dir).as_posix(): p.read_bytes() for p in maps_dir.rglob('*.svg')
+        }
+
+    assert len(outputs[1]) > 10
+    assert outputs[2] == outputs[1]
+
+
+def _legacy_write(root, out_path):
+    """The pre-streaming ElementTree writer: the byte-for-byte contract."""
+    for elem in root.iter():
+        if elem.attrib:
+            elem.attrib = dict(sorted(elem.attrib.items()))
+    out_path.write_text(ET.tostring(root, xml_declaration=True, encoding="unicode"), encoding="utf-8")
+
+
+def test_streaming_writers_match_elementtree_bytes(tmp_path):
+    """_write_species_svg / _write_group_svg stream from a pre-serialized backdrop
+    and must reproduce the deepcopy + ET.tostring output exactly, including the
+    self-closed empty document.
+    """
+    import copy
+    import random
+
+    rng = random.Random(12)
+    square = [[-121.0, 47.0], [-120.0, 47.0], [-120.0, 48.0], [-121.0, 47.0]]
+    counties = {
+        "Chelan": {"type": "Polygon", "coordinates": [square]},
+        "Island": {"type": "MultiPolygon", "coordinates": [[square], [square]]},
+        "Dot": {"type": "Point", "coordinates": [-120.0, 47.0]},
+    }
+    P = species_maps_module
+    backdrops = [P._build_county_backdrop(counties), ET.Element(f"{{{SVG_NS}}}svg")]
+
+    def pts(k):
+        return [(rng.uniform(-126, -116), rng.uniform(45, 50)) for _ in range(k)]
+
+    for b, backdrop in enumerate(backdrops):
+        for k in (0, 1, 25):
+            checklist = {"Chelan", "Island", "Dot"} if k else set()
+            points = pts(k)
+            got = tmp_path / f"s{b}{k}.svg"
+            P._write_species_svg(got.stem, points, checklist, counties, backdrop, tmp_path)
+
+            root = copy.deepcopy(backdrop)
+            for name, geom in counties.items():
+                if name in checklist and P._polygon_d(geom) is not None:
+                    ET.SubElement(root, f"{{{SVG_NS}}}path",
+                                  attrib={"class": "checklist-county", "d": P._polygon_d(geom)})
+            for lon, lat in points:
+                if P._in_bbox(lon, lat):
+                    x, y = P._project(lon, lat)
+                    ET.SubElement(root, f"{{{SVG_NS}}}circle",
+                                  attrib={"class": "occ", "cx": f"{x:.2f}", "cy": f"{y:.2f}", "r": "2.5"})
+            want = tmp_path / f"want-s{b}{k}.svg"
+            _legacy_write(root, want)
+            assert got.read_bytes() == want.read_bytes(), (b, k)
+
+            species_points = {"B sp": pts(k), "A sp": pts(k), "C sp": []}
+            colors = {"A sp": "#112233"}
+            got = tmp_path / f"g{b}{k}.svg"
+            P._write_group_svg(got.stem, species_points, colors, backdrop, tmp_path)
+            root = copy.deepcopy(backdrop)
+            for canon in sorted(species_points):
+                inside = [p for p in species_points[canon] if P._in_bbox(*p)]
+                if not inside:
+                    continue
+                g = ET.SubElement(root, f"{{{SVG_NS}}}g", attrib={"fill": colors.get(canon, "#aaaaaa")})
+                for lon, lat in inside:
+                    x, y = P._project(lon, lat)
+                    ET.SubElement(g, f"{{{SVG_NS}}}circle",
+                                  attrib={"cx": f"{x:.2f}", "cy": f"{y:.2f}", "r": "2.5"})
+            want = tmp_path / f"want-g{b}{k}.svg"
+            _legacy_write(root, want)
+            assert got.read_bytes() == want.read_bytes(), (b, k)
+
+
+def test_incremental_matches_full_rebuild(tmp_path, monkeypatch):
+    """--incremental leaves species-maps/ byte-identical to a wipe-and-rewrite:
+    unchanged maps are not touched, changed ones are rewritten, and maps for
+    species (or groups) that dropped out are deleted.
+    """
+    con = duckdb.connect()
+    con.execute("INSTALL spatial; LOAD spatial;")
+    con.execute("CREATE SCHEMA geographies")
+    con.execute(
+        "CREATE TABLE geographies.us_counties AS SELECT * FROM (VALUES "
+        "('Chelan', ?, ST_GeomFromText('POLYGON((-121 47, -120 47, -120 48, -121 47))')), "
+        "('Yakima', ?, ST_GeomFromText('POLYGON((-121 46, -120 46, -120 47, -121 46))'))"
+        ") t(name, state_fips, geom)",
+        [species_maps_module.STATE_FIPS, species_maps_module.STATE_FIPS],
+    )
+
+    def stage(assets: Path, drop_apis: bool, extra_point: bool) -> None:
+        assets.mkdir(exist_ok=True)
+        species = pq.read_table(_write_test_species_parquet(assets))
+        if drop_apis:
+            keep = [c != 'Apis mellifera' for c in species.column('canonical_name').to_pylist()]
+            pq.write_table(species.filter(pa.array(keep)), assets / "species.parquet")
+        occ = [
+            ('Andrena milwaukeensis', -120.5, 47.5), ('Andrena prunorum', -121.5, 46.5),
+            ('Bombus mixtus', -119.0, 48.0), ('Bombus mixtus', -100.0, 40.0),
+            ('Apis mellifera', -118.0, 47.0),
+        ] + ([('Bombus mixtus', -118.5, 46.2)] if extra_point else [])
+        rows = list(reversed(occ)) if extra_point else occ  # row order must not matter
+        pq.write_table(pa.table({
+            'canonical_name': [r[0] for r in rows],
+            'lon': [r[1] for r in rows],
+            'lat': [r[2] for r in rows],
+        }), assets / "occurrences.parquet")
+        pq.write_table(pa.table({'canonical_name': ['Andrena prunorum'], 'county': ['Chelan']}),
+                       assets / "checklist.parquet")
+
+    def tree(assets: Path) -> dict:
+        d = assets / "species-maps"
+        return {p.relative_to(d).as_posix(): p.read_bytes() for p in d.rglob('*.svg')}
+
+    assets = tmp_path / "assets"
+    stage(assets, drop_apis=False, extra_point=False)
+    monkeypatch.setattr(species_maps_module, 'ASSETS_DIR', assets)
+    species_maps_module.generate_species_maps(con)
+    first = tree(assets)
+    assert "Apis/mellifera.svg" in first and "genus/Apis.svg" in first
+    assert (assets / species_maps_module.MAP_INDEX_NAME).exists()
+
+    # Nothing changed: nothing is rewritten.
+    untouched = assets / "species-maps" / "Andrena" / "prunorum.svg"
+    mtime = untouched.stat().st_mtime_ns
+    species_maps_module.generate_species_maps(con, incremental=True)
+    assert tree(assets) == first
+    assert untouched.stat().st_mtime_ns == mtime
+
+    # Bombus gains a point (rows reordered too); Apis drops out.
+    stage(assets, drop_apis=True, extra_point=True)
+    species_maps_module.generate_species_maps(con, incremental=True)
+    incremental = tree(assets)
+    assert untouched.stat().st_mtime_ns == mtime
+    assert incremental["Bombus/mixtus.svg"] != first["Bombus/mixtus.svg"]
+    assert "Apis/mellifera.svg" not in incremental and "genus/Apis.svg" not in incremental
+    assert not (assets / "species-maps" / "Apis").exists()
+
+    fresh = tmp_path / "fresh"
+    stage(fresh, drop_apis=True, extra_point=True)
+    monkeypatch.setattr(species_maps_module, 'ASSETS_DIR', fresh)
+    species_maps_module.generate_species_maps(con)
+    assert tree(fresh) == incremental
+
+
+def test_vectorized_dots_match_scalar_projection():
+    """_dots_by_key projects, clips and formats in bulk exactly as the scalar
+    _project / _in_bbox loop does, bbox edges included, and keeps per-key order.
+    """
+    import random
+
+    import numpy as np
+
+    P = species_maps_module
+    rng = random.Random(14)
+    minx, miny, maxx, maxy = P.WA_BBOX
+    pts = [(rng.uniform(-126, -115), rng.uniform(44, 50)) for _ in range(3000)]
+    pts += [(minx, miny), (maxx, maxy), (minx - 1e-12, 47.0), (-120.0, maxy + 1e-12)]
+    keys = sorted(rng.choice("abcde") for _ in pts)
+    got = P._dots_by_key(np.array(keys, dtype=object), np.array([p[0] for p in pts]), np.array([p[1] for p in pts]))
+
+    for key in "abcde":
+        mine = [p for k, p in zip(keys, pts) if k == key]
+        inside = [p for p in mine if P._in_bbox(*p)]
+        want = [f'cx="{x:.2f}" cy="{y:.2f}" r="2.5"' for x, y in (P._project(*p) for p in inside)]
+        assert got[key].attrs == want
+        assert got[key].clipped == len(mine) - len(inside)
+        assert np.array_equal(got[key].x, [P._project(*p)[0] for p in inside])
+        again = P._dots(mine)
+        assert again.attrs == want and np.array_equal(again.y, got[key].y)
+    assert P._dots([]).attrs == [] and P._dots([]).clipped == 0
+
+
+def _dense_points(n=400, seed=15):
+    import random
+
+    rng = random.Random(seed)
+    # A tight cluster near Wenatchee (many points per pixel) plus a sparse scatter.
+    pts = [(-120.31 + rng.uniform(-0.01, 0.01), 47.42 + rng.uniform(-0.01, 0.01)) for _ in range(n)]
+    pts += [(rng.uniform(-124, -117.5), rng.uniform(45.8, 48.8)) for _ in range(40)]
+    return pts
+
+
+def test_dot_aggregation_collapses_dense_cells(tmp_path):
+    """DotAggregation snaps dots to the pixel grid: each occupied cell becomes
+    one circle at its centre; radius/opacity encodings grow with the count,
+    and the report's plain_bytes is the size the unaggregated map has.
+    """
+    import re
+
+    P = species_maps_module
+    backdrop = P._build_county_backdrop({})
+    pts = _dense_points()
+    plain_dir, agg_dir = tmp_path / "plain", tmp_path / "agg"
+    plain_dir.mkdir()
+    agg_dir.mkdir()
+
+    stats = {}
+    P._write_species_svg("s", pts, set(), {}, backdrop, plain_dir, stats=stats)
+    plain = (plain_dir / "s.svg").read_bytes()
+    assert stats == {"plain_bytes": len(plain), "bytes": len(plain)}
+    assert plain.count(b"<circle") == len(pts)
+
+    for encode in (None, "radius", "opacity"):
+        stats = {}
+        agg = P.DotAggregation(encode=encode, grid_px=2.0)
+        P._write_species_svg("s", pts, set(), {}, backdrop, agg_dir, agg, stats)
+        text = (agg_dir / "s.svg").read_text()
+        cells = {(int(float(x) // 2), int(float(y) // 2)) for x, y in re.findall(r'cx="([\d.]+)" cy="([\d.]+)"', text)}
+        circles = text.count("<circle")
+        assert circles == len(cells) < len(pts) // 4
+        assert stats == {"plain_bytes": len(plain), "bytes": len(text.encode())}
+        ET.fromstring(text.encode())  # still well-formed
+        if encode == "radius":
+            radii = {float(r) for r in re.findall(r' r="([\d.]+)"', text)}
+            assert min(radii) == P.DOT_RADIUS and max(radii) == P.DOT_RADIUS_MAX
+        if encode == "opacity":
+            assert 'opacity="1"' in text and f'opacity="{P.DOT_MIN_OPACITY}"' in text
+        else:
+            assert ' opacity="' not in text
+
+
+def test_dot_aggregation_size_budget(tmp_path, capsys):
+    """The grid coarsens until each map fits max_bytes (shared across a group
+    map's species), and generate_species_maps reports the bytes saved.
+    """
+    P = species_maps_module
+    backdrop = P._build_county_backdrop({})
+    pts = _dense_points(n=2000)
+    plain_stats, stats = {}, {}
+    P._write_group_svg("g", {"A b": pts, "A c": pts[::3]}, {}, backdrop, tmp_path, stats=plain_stats)
+    budget = plain_stats["plain_bytes"] // 20
+    agg = P.DotAggregation(max_bytes=budget, max_grid_px=64.0)
+    P._write_group_svg("g", {"A b": pts, "A c": pts[::3]}, {}, backdrop, tmp_path, agg, stats)
+    assert stats["bytes"] == (tmp_path / "g.svg").stat().st_size <= budget
+    assert stats["plain_bytes"] == plain_stats["plain_bytes"]
+
+    # An unreachable budget stops at max_grid_px rather than looping.
+    tiny = P.DotAggregation(max_bytes=1, max_grid_px=4.0)
+    P._write_species_svg("t", pts, set(), {}, backdrop, tmp_path, tiny, stats)
+    assert 0 < stats["bytes"] < stats["plain_bytes"]
+
+    index = {"genus/A.svg": ["d", 0, 5000, 1000], "A/b.svg": ["d", 0, 3000, 3000]}
+    P._print_aggregation_report(index, P.DotAggregation(max_bytes=2000))
+    out = capsys.readouterr().out
+    assert "8,000 -> 4,000 bytes (4,000 saved, 50.0%)" in out
+    assert "1 maps exceed 2,000 bytes" in out and "A/b.svg" in out
@@ -124,6 +124,34 @@ def test_column_names_match(src_parquet: Path, tmp_path: Path) -> None:
     )
 
 
+@pytest.mark.parametrize("clustered", [False, True])
+def test_materialized_occ_id_not_shipped(tmp_path: Path, clustered: bool) -> None:
+    """The mart's occ_id join key stays parquet-side; SQLite keeps its schema."""
+    from sqlite_export import generate_sqlite
+
+    path = tmp_path / "occurrences.parquet"
+    pq.write_table(
+        pa.table({
+            "occ_id": ["ecdysis:1", "inat:2"],
+            "ecdysis_id": pa.array([1, None], pa.int64()),
+            "observation_id": pa.array([None, 2], pa.int64()),
+            "lat": [47.0, 47.5],
+            "lon": [-121.0, -120.5],
+        }),
+        path,
+    )
+    _write_bridge_sibling(path)
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(path, dst, clustered=clustered)
+
+    con = sqlite3.connect(dst)
+    cols = [row[1] for row in con.execute("PRAGMA table_info(occurrences)")]
+    count = con.execute("SELECT count(*) FROM occurrences").fetchone()[0]
+    con.close()
+    assert cols == ["ecdysis_id", "observation_id", "lat", "lon"]
+    assert count == 2
+
+
 # ---------------------------------------------------------------------------
 # Test 4: calling generate_sqlite overwrites a pre-existing dst_db
 # ---------------------------------------------------------------------------
@@ -523,3 +551,354 @@ def test_complex_and_bycatch_counts(src_parquet_with_taxon: Path, taxa_csv_gz: P
     assert bycatch_count == 1, f"Expected 1 bycatch taxon in mini fixture, got {bycatch_count}"
     # complex_count just needs to be queryable (0 in mini fixture — no complex rows)
     assert complex_count >= 0, "complex-rank count query should return a non-negative integer"
+
+
+# ---------------------------------------------------------------------------
+# geo_blob_bin: opt-in columnar typed-array encoding beside the JSON geo_blob
+# ---------------------------------------------------------------------------
+
+
+def test_geo_blob_bin_matches_json_geo_blob(src_parquet: Path, tmp_path: Path) -> None:
+    import json
+
+    from sqlite_export import GEO_BIN_MAGIC, decode_geo_columns, generate_sqlite
+
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(src_parquet, dst, geo_blob_bin=True)
+
+    con = sqlite3.connect(dst)
+    (geo_json,) = con.execute("SELECT data FROM geo_blob").fetchone()
+    (geo_bin,) = con.execute("SELECT data FROM geo_blob_bin").fetchone()
+    con.close()
+
+    assert geo_bin[:4] == GEO_BIN_MAGIC
+    json_rows = json.loads(geo_json)
+    bin_rows = decode_geo_columns(geo_bin)
+    assert len(bin_rows) == len(json_rows) == len(PARQUET_ROWS)
+    for j, b in zip(json_rows, bin_rows):
+        assert b[0] == pytest.approx(j[0], abs=1e-5)
+        assert b[1] == pytest.approx(j[1], abs=1e-5)
+        assert list(b[2:]) == j[2:]
+
+
+def test_geo_blob_bin_optional(src_parquet: Path, tmp_path: Path) -> None:
+    """Off unless asked for: no client decodes it yet, and the JSON geo_blob ships."""
+    from sqlite_export import generate_sqlite
+
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(src_parquet, dst)
+    con = sqlite3.connect(dst)
+    names = {r[0] for r in con.execute("SELECT name FROM sqlite_master").fetchall()}
+    con.close()
+    assert "geo_blob" in names
+    assert "geo_blob_bin" not in names
+
+
+def test_geo_columns_round_trip_nulls_and_tiers() -> None:
+    """NULL ids/tiers survive the 0-sentinel encoding; every column is 4-byte aligned."""
+    import struct
+
+    from sqlite_export import GEO_BIN_COLUMNS, decode_geo_columns, encode_geo_columns
+
+    rows = [
+        (47.5, -120.8, 5001, None, None, 2024, "atlas", None),
+        (47.6, -121.0, None, 2_000_000_001, None, 2023, "other", None),
+        (48.1, -122.3, None, None, 77, 2019, None, None),
+        (46.9, -119.5, None, None, None, 1998, "other", 42),
+    ]
+    data = encode_geo_columns(rows)
+
+    offsets = struct.unpack_from(f"<{len(GEO_BIN_COLUMNS)}I", data, 20)
+    assert all(off % 4 == 0 for off in offsets)
+
+    decoded = decode_geo_columns(data)
+    for orig, got in zip(rows, decoded):
+        assert got[0] == pytest.approx(orig[0], abs=1e-5)
+        assert got[1] == pytest.approx(orig[1], abs=1e-5)
+        assert got[2:] == orig[2:]
+
+    assert decode_geo_columns(encode_geo_columns([])) == []
+
+
+def test_geo_columns_rejects_out_of_range_id() -> None:
+    from sqlite_export import encode_geo_columns
+
+    with pytest.raises(ValueError, match="observation_id"):
+        encode_geo_columns([(47.5, -120.8, None, 2**31, None, 2024, "atlas", None)])
+
+
+def test_taxon_ancestors_matches_lineage_path_filter(
+    src_parquet_with_taxon: Path, taxa_csv_gz: Path, tmp_path: Path
+) -> None:
+    """The closure-table descendant lookup selects exactly the taxa the frontend's
+    `taxon_id = N OR instr(lineage_path, '/N/') > 0` clause does, for every taxon,
+    and resolves through the (ancestor_id, taxon_id) primary key rather than a scan.
+    """
+    from sqlite_export import ANTHOPHILA_ID, generate_sqlite
+
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(src_parquet_with_taxon, dst, taxa_path=taxa_csv_gz)
+
+    con = sqlite3.connect(dst)
+    taxon_ids = [r[0] for r in con.execute("SELECT taxon_id FROM taxa").fetchall()]
+    for n in taxon_ids + [ANTHOPHILA_ID]:
+        via_instr = {
+            r[0] for r in con.execute(
+                "SELECT taxon_id FROM taxa WHERE taxon_id = ? OR instr(lineage_path, ?) > 0",
+                (n, f"/{n}/"),
+            ).fetchall()
+        }
+        via_closure = {
+            r[0] for r in con.execute(
+                "SELECT taxon_id FROM taxon_ancestors WHERE ancestor_id = ?", (n,)
+            ).fetchall()
+        }
+        assert via_closure == via_instr, f"taxon {n}: {via_closure} != {via_instr}"
+
+    # Depth counts edges: 0 for the self row, Apis mellifera is two below Apidae.
+    assert con.execute(
+        "SELECT depth FROM taxon_ancestors WHERE ancestor_id = 47221 AND taxon_id = 47219"
+    ).fetchone() == (2,)
+    assert con.execute(
+        "SELECT count(*) FROM taxon_ancestors WHERE depth = 0"
+    ).fetchone() == (len(taxon_ids),)
+
+    plan = " ".join(
+        r[-1] for r in con.execute(
+            "EXPLAIN QUERY PLAN SELECT taxon_id FROM taxon_ancestors WHERE ancestor_id = 47221"
+        ).fetchall()
+    )
+    con.close()
+    assert "PRIMARY KEY" in plan, plan
+
+
+def test_occurrences_rtree_bbox_matches_scan(src_parquet: Path, tmp_path: Path) -> None:
+    """The documented R*Tree bounds filter returns exactly the rows of the plain
+    lat/lon BETWEEN scan, and SQLite plans it through the virtual table.
+    """
+    from sqlite_export import OCCURRENCES_RTREE_BBOX_FILTER, generate_sqlite
+
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(src_parquet, dst, spatial_index=True)
+
+    con = sqlite3.connect(dst)
+    assert con.execute("SELECT count(*) FROM occurrences_rtree").fetchone() == (len(PARQUET_ROWS),)
+    boxes = [
+        {"west": -123.0, "south": 47.0, "east": -122.0, "north": 48.5},
+        {"west": -120.0, "south": 46.9, "east": -119.5, "north": 47.0},  # edges inclusive
+        {"west": -118.0, "south": 45.0, "east": -117.0, "north": 46.0},  # empty
+    ]
+    for box in boxes:
+        scan = con.execute(
+            "SELECT rowid FROM occurrences o "
+            "WHERE lat BETWEEN :south AND :north AND lon BETWEEN :west AND :east ORDER BY rowid",
+            box,
+        ).fetchall()
+        indexed = con.execute(
+            f"SELECT rowid FROM occurrences o WHERE {OCCURRENCES_RTREE_BBOX_FILTER} ORDER BY rowid",
+            box,
+        ).fetchall()
+        assert indexed == scan, box
+    plan = " ".join(
+        r[-1] for r in con.execute(
+            f"EXPLAIN QUERY PLAN SELECT count(*) FROM occurrences o WHERE {OCCURRENCES_RTREE_BBOX_FILTER}",
+            boxes[0],
+        ).fetchall()
+    )
+    con.close()
+    assert "occurrences_rtree VIRTUAL TABLE" in plan, plan
+
+
+def test_occurrences_rtree_optional(src_parquet: Path, tmp_path: Path) -> None:
+    """Off unless asked for: no client query reads it yet."""
+    from sqlite_export import generate_sqlite
+
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(src_parquet, dst)
+    con = sqlite3.connect(dst)
+    names = {r[0] for r in con.execute("SELECT name FROM sqlite_master").fetchall()}
+    con.close()
+    assert "occurrences_rtree" not in names
+
+
+def test_search_fts_type_ahead(taxa_csv_gz: Path, tmp_path: Path) -> None:
+    """search_fts answers prefix type-ahead for taxa, unresolved names, people and
+    catalog suffixes, ranked by match then record weight.
+    """
+    from sqlite_export import SEARCH_FTS_SQL, generate_sqlite, search_fts_match
+
+    table = pa.table({
+        "lat": pa.array([47.5, 47.6, 47.7, 47.8], type=pa.float64()),
+        "lon": pa.array([-120.8, -121.0, -121.1, -121.2], type=pa.float64()),
+        "taxon_id": pa.array([47219, 47219, 52747, None], type=pa.int64()),
+        "canonical_name": ["apis mellifera", "apis mellifera", "vespula squamosa", "bombus vosnesenskii"],
+        "recordedBy": ["Jürgen Müller", "Jürgen Müller", None, "Ann Smith"],
+        "host_inat_login": [None, None, "bee_watcher", None],
+        "catalog_number": ["WSDA_0012345", "WSDA_0012346", None, "WSDA_5012345"],
+    })
+    path = tmp_path / "occurrences.parquet"
+    pq.write_table(table, path)
+    _write_bridge_sibling(path)
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(path, dst, taxa_path=taxa_csv_gz, search_index=True)
+
+    con = sqlite3.connect(dst)
+
+    def search(text: str) -> list[tuple]:
+        return con.execute(SEARCH_FTS_SQL, {"q": search_fts_match(text), "limit": 10}).fetchall()
+
+    # Prefix, case-insensitive; the resolved canonical name is not duplicated as kind='name'.
+    assert [(k, r) for k, r, _t, _w in search("apis mel")] == [("taxon", "47219")]
+    assert {r for _k, r, _t, _w in search("ap")} >= {"52775", "47219", "47221"}
+    # Unresolved name survives as its own document.
+    assert ("name", "bombus vosnesenskii") in [(k, r) for k, r, _t, _w in search("vosn")]
+    # Diacritics folded; logins split on '_'.
+    assert ("person", "Jürgen Müller", "Jürgen Müller", 2) in search("muller")
+    assert ("person", "bee_watcher") in [(k, r) for k, r, _t, _w in search("bee_wat")]
+    # Catalog suffix: leading zeros dropped, digit-prefix type-ahead.
+    assert sorted(r for k, r, _t, _w in search("1234") if k == "label") == ["12345", "12346"]
+    # Query syntax in the input is inert.
+    assert search_fts_match('"NEAR(') == '"near"*'
+    assert search_fts_match("  -- ") is None
+    con.close()
+
+
+def test_search_fts_optional(src_parquet: Path, tmp_path: Path) -> None:
+    """Off unless asked for: the client's search does not read it yet."""
+    from sqlite_export import generate_sqlite
+
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(src_parquet, dst)
+    con = sqlite3.connect(dst)
+    names = {r[0] for r in con.execute("SELECT name FROM sqlite_master").fetchall()}
+    con.close()
+    assert "search_fts" not in names
+
+
+def test_clustered_layout(tmp_path: Path) -> None:
+    """clustered=True stores occurrences along a Hilbert curve, leaves no free pages, ships sqlite_stat1, and keeps the content (and the
+    rowid-keyed R*Tree) identical to the default layout.
+    """
+    import random
+
+    from sqlite_export import OCCURRENCES_RTREE_BBOX_FILTER, content_digest, generate_sqlite
+
+    rng = random.Random(8)
+    n = 2000
+    lat = [rng.uniform(45.6, 49.0) for _ in range(n)]
+    lon = [rng.uniform(-124.7, -117.0) for _ in range(n)]
+    path = tmp_path / "occurrences.parquet"
+    pq.write_table(
+        pa.table({
+            "lat": pa.array(lat + [None], pa.float64()),
+            "lon": pa.array(lon + [None], pa.float64()),
+            "year": pa.array(list(range(n + 1)), pa.int32()),
+        }),
+        path,
+    )
+    _write_bridge_sibling(path)
+
+    plain = tmp_path / "plain.db"
+    clustered = tmp_path / "clustered.db"
+    generate_sqlite(path, plain, spatial_index=True)
+    generate_sqlite(path, clustered, clustered=True, spatial_index=True)
+    assert content_digest(plain) == content_digest(clustered)
+
+    con = sqlite3.connect(clustered)
+    assert con.execute("PRAGMA freelist_count").fetchone() == (0,)
+    assert con.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0] > 0
+    rows = con.execute("SELECT lat, lon FROM occurrences ORDER BY rowid").fetchall()
+    assert rows[-1] == (None, None), "un-located rows sort last"
+
+    # Consecutive rows are spatial neighbours: the mean step along rowid order is
+    # far shorter than in the source's random order.
+    def mean_step(pts: list[tuple]) -> float:
+        return sum(abs(a[0] - b[0]) + abs(a[1] - b[1]) for a, b in zip(pts, pts[1:])) / (len(pts) - 1)
+
+    assert mean_step(rows[:-1]) < mean_step(list(zip(lat, lon))) / 10
+
+    box = {"west": -122.0, "south": 47.0, "east": -121.0, "north": 47.5}
+    indexed = con.execute(
+        f"SELECT count(*) FROM occurrences o WHERE {OCCURRENCES_RTREE_BBOX_FILTER}", box
+    ).fetchone()
+    scan = con.execute(
+        "SELECT count(*) FROM occurrences WHERE lat BETWEEN :south AND :north AND lon BETWEEN :west AND :east",
+        box,
+    ).fetchone()
+    con.close()
+    assert indexed == scan
+
+
+def test_facet_tables_match_base_counts(tmp_path: Path) -> None:
+    """facet_counts answers unfiltered facet counts, and low-cardinality facets
+    under one low-cardinality filter (place included), exactly as GROUP BYs over
+    occurrences would, by primary-key range; high-cardinality facets are not
+    crossed; a corrupted aggregate fails the gate.
+    """
+    import random
+
+    from sqlite_export import FACET_COUNTS_SQL, _assert_facets_consistent, generate_sqlite
+
+    rng = random.Random(10)
+    n = 500
+    path = tmp_path / "occurrences.parquet"
+    pq.write_table(
+        pa.table({
+            "ecdysis_id": pa.array(range(1, n + 1), pa.int64()),
+            "observation_id": pa.array([None] * n, pa.int64()),
+            "specimen_observation_id": pa.array([None] * n, pa.int64()),
+            "checklist_id": pa.array([None] * n, pa.int64()),
+            "lat": pa.array([47.0] * n, pa.float64()),
+            "lon": pa.array([-120.0] * n, pa.float64()),
+            "year": pa.array([rng.choice([2022, 2023, 2024, None]) for _ in range(n)], pa.int32()),
+            "county": [rng.choice(["Chelan", "Kittitas", None]) for _ in range(n)],
+            "record_type": [rng.choice(["specimen", "sample"]) for _ in range(n)],
+        }),
+        path,
+    )
+    places = [(f"ecdysis:{i}", slug) for i in range(1, n + 1) for slug in ("park-a", "park-b") if rng.random() < 0.4]
+    pq.write_table(
+        pa.table({"occ_id": [p[0] for p in places], "place_slug": [p[1] for p in places]}),
+        tmp_path / "occurrence_places.parquet",
+    )
+    dst = tmp_path / "occurrences.db"
+    generate_sqlite(path, dst)
+
+    con = sqlite3.connect(dst)
+
+    def lookup(facet: str, given: str = "", given_value: object = "") -> list[tuple]:
+        return con.execute(FACET_COUNTS_SQL, {"given": given, "given_value": given_value, "facet": facet}).fetchall()
+
+    assert lookup("county") == con.execute(
+        "SELECT county, count(*) FROM occurrences WHERE county IS NOT NULL GROUP BY county ORDER BY county"
+    ).fetchall()
+    assert lookup("year") == con.execute(
+        "SELECT year, count(*) FROM occurrences WHERE year IS NOT NULL GROUP BY year ORDER BY year"
+    ).fetchall()
+    assert lookup("record_type", "county", "Chelan") == con.execute(
+        "SELECT record_type, count(*) FROM occurrences WHERE county = 'Chelan' "
+        "GROUP BY record_type ORDER BY record_type"
+    ).fetchall()
+    assert con.execute(
+        "SELECT count(*) FROM facet_counts WHERE given = 'year' OR (given <> '' AND facet = 'year')"
+    ).fetchone() == (0,)
+    in_park_a = {int(occ.split(":")[1]) for occ, slug in places if slug == "park-a"}
+    assert lookup("record_type", "place_slug", "park-a") == con.execute(
+        f"SELECT record_type, count(*) FROM occurrences WHERE ecdysis_id IN ({','.join(map(str, in_park_a))}) "
+        "GROUP BY record_type ORDER BY record_type"
+    ).fetchall()
+    assert dict(lookup("place_slug")) == {
+        slug: sum(1 for _o, s in places if s == slug) for slug in ("park-a", "park-b")
+    }
+    plan = " ".join(
+        r[-1] for r in con.execute(
+            f"EXPLAIN QUERY PLAN {FACET_COUNTS_SQL}", {"given": "", "given_value": "", "facet": "year"}
+        )
+    )
+    assert "PRIMARY KEY" in plan, plan
+
+    con.execute("UPDATE facet_counts SET n = n + 1 WHERE given = 'county' AND facet = 'record_type'")
+    con.commit()
+    con.close()
+    with pytest.raises(ValueError, match="facet_counts disagrees"):
+        _assert_facets_consistent(dst)
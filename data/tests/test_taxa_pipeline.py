@@ -6,6 +6,7 @@ Tests cover:
   - test_lineage_schema: load_taxon_lineage_extended produces 6-col schema
   - test_lineage_null_ranks: absent ranks emit NULL (not empty string)
   - test_lineage_includes_self: genus taxon appears with genus column populated
+  - test_taxa_store_*: parsed Parquet store — typed columns, reuse, rebuild on ETag
 
 All HTTP calls are patched via unittest.mock.patch — no live network access.
 """
@@ -16,6 +17,7 @@ import json
 from unittest.mock import MagicMock, patch
 
 import duckdb
+import pyarrow.parquet as pq
 import pytest
 
 # ---------------------------------------------------------------------------
@@ -92,9 +94,15 @@ def test_download_uses_304(tmp_path, monkeypatch):
     mock_resp = MagicMock()
     mock_resp.status_code = 304
 
-    with patch("taxa_pipeline.requests.get", return_value=mock_resp) as mock_get:
+    with (
+        patch("taxa_pipeline.requests.get", return_value=mock_resp) as mock_get,
+        patch("taxa_pipeline.ensure_taxa_store") as mock_store,
+    ):
         taxa_pipeline.download_taxa_csv()
 
+    # A 304 still guarantees the parsed store exists for downstream consumers.
+    mock_store.assert_called_once_with()
+
     # Verify If-None-Match and If-Modified-Since were sent.
     _, kwargs = mock_get.call_args
     assert kwargs["headers"]["If-None-Match"] == "abc"
@@ -125,9 +133,14 @@ def test_download_writes_sidecar(tmp_path, monkeypatch):
     # Code now uses resp.raw.stream(chunk_size, decode_content=False).
     mock_resp.raw.stream = MagicMock(return_value=iter([payload]))
 
-    with patch("taxa_pipeline.requests.get", return_value=mock_resp):
+    with (
+        patch("taxa_pipeline.requests.get", return_value=mock_resp),
+        patch("taxa_pipeline.ensure_taxa_store") as mock_store,
+    ):
         taxa_pipeline.download_taxa_csv()
 
+    mock_store.assert_called_once_with()
+
     # Archive file must contain the raw (compressed) bytes.
     assert taxa_path.exists()
     assert taxa_path.read_bytes() == payload
@@ -271,3 +284,45 @@ def test_lineage_includes_self(tmp_path, monkeypatch, mini_taxa_gz):
     assert taxon_id == 84734
     assert genus == "Bombus", f"genus column should be 'Bombus', got {genus!r}"
     assert family == "Apidae", f"family column should be 'Apidae', got {family!r}"
+
+
+# ---------------------------------------------------------------------------
+# Parsed taxonomy store (ensure_taxa_store)
+# ---------------------------------------------------------------------------
+
+
+def test_taxa_store_typed_and_sorted(taxa_db, mini_taxa_gz):
+    """The store is sorted by taxon_id with parsed ancestry and an Anthophila flag."""
+    _, taxa_pipeline = taxa_db
+    store = taxa_pipeline.ensure_taxa_store(mini_taxa_gz)
+
+    rows = duckdb.execute(
+        "SELECT taxon_id, ancestor_ids, active, is_anthophila FROM read_parquet(?)",
+        [str(store)],
+    ).fetchall()
+    assert [r[0] for r in rows] == sorted(r[0] for r in rows)
+    by_id = {r[0]: r for r in rows}
+    assert by_id[84734][1] == [48460, 1, 47120, 372739, 47158, 184884, 47219, 630955, 52775]
+    assert by_id[84734][2] is True
+    assert by_id[630955][3] is True  # the root itself counts
+    assert by_id[52776][3] is True
+    assert by_id[52850][3] is False  # the wasp
+
+
+def test_taxa_store_reused_until_etag_changes(taxa_db, mini_taxa_gz, monkeypatch):
+    """Same ETag: the store is not rebuilt. New ETag: it is."""
+    _, taxa_pipeline = taxa_db
+    monkeypatch.setattr(taxa_pipeline, "TAXA_PATH", mini_taxa_gz)
+    cache_path = mini_taxa_gz.parent / "taxa_cache.json"
+    monkeypatch.setattr(taxa_pipeline, "TAXA_CACHE_PATH", cache_path)
+    cache_path.write_text(json.dumps({"etag": "v1"}))
+
+    store = taxa_pipeline.ensure_taxa_store()
+    mtime = store.stat().st_mtime_ns
+    assert taxa_pipeline.ensure_taxa_store() == store
+    assert store.stat().st_mtime_ns == mtime
+
+    cache_path.write_text(json.dumps({"etag": "v2"}))
+    taxa_pipeline.ensure_taxa_store()
+    metadata = pq.read_schema(store).metadata
+    assert b":etag:v2:" in metadata[b"beeatlas.taxa_source_key"]
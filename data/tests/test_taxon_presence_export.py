@@ -7,14 +7,25 @@ Covers:
   - NULL county / NULL taxon_id rows are dropped, not crashed on
   - taxa are not split across synonym spellings (grouping is by id, not name)
   - the payload carries no elevation dimension
+  - taxon_presence.bin is written only on request, and decodes back to exactly
+    the JSON payload
 """
 
+import gzip
 import json
+import random
 
 import duckdb
 import pytest
 
-from taxon_presence_export import EV_CHECKLIST, EV_COMMUNITY, EV_SPECIMEN, main
+from taxon_presence_export import (
+    EV_CHECKLIST,
+    EV_COMMUNITY,
+    EV_SPECIMEN,
+    decode_presence,
+    encode_presence,
+    main,
+)
 
 # (taxon_id, county, ecoregion_l3, record_type)
 ROWS = [
@@ -112,3 +123,63 @@ def test_rerun_is_byte_identical(export_dir):
     first = (main(export_dir)).read_bytes()
     second = (main(export_dir)).read_bytes()
     assert first == second
+
+
+def test_packed_file_only_on_request(export_dir):
+    """Nothing reads the .bin yet: a default run writes none and clears a stale one."""
+    main(export_dir, packed=True)
+    assert (export_dir / "taxon_presence.bin").exists()
+    main(export_dir)
+    assert not (export_dir / "taxon_presence.bin").exists()
+
+
+def test_packed_file_round_trips_to_the_json(export_dir):
+    """taxon_presence.bin is the same payload: the reference decoder gives back the JSON."""
+    payload = json.loads(main(export_dir, packed=True).read_text())
+    packed = (export_dir / "taxon_presence.bin").read_bytes()
+    assert decode_presence(packed) == payload
+    assert encode_presence(payload) == packed
+
+
+def _synthetic_payload(seed: int) -> dict:
+    """Atlas-shaped: ~600 taxa, 39 counties and 10 ecoregions, evidence skewed to specimens."""
+    rng = random.Random(seed)
+    taxa = sorted(rng.sample(range(1, 2_000_000), 600))
+    masks = [1, 1, 1, 3, 3, 5, 7, 4, 2, 6]
+
+    def places(names):
+        return {
+            name: {str(t): rng.choice(masks) for t in rng.sample(taxa, rng.randint(0, 300))}
+            for name in names
+        }
+
+    return {
+        "counties": places([f"County {i}" for i in range(39)] + ["Pend Oreille", "Ñ"]),
+        "ecoregions": places([f"Ecoregion {i}" for i in range(10)]),
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_packed_round_trip_and_size(seed):
+    payload = _synthetic_payload(seed)
+    packed = encode_presence(payload)
+    assert decode_presence(packed) == payload
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    # The point of the format: smaller than the JSON both raw and as served.
+    assert len(packed) < len(raw) / 3
+    assert len(gzip.compress(packed)) < len(gzip.compress(raw))
+
+
+def test_packed_edge_cases():
+    for payload in (
+        {},
+        {"counties": {}},
+        {"counties": {"Empty": {}}, "ecoregions": {"One": {"5": 4}}},
+        {"counties": {"All": {str(t): m for t, m in zip(range(1, 8), range(1, 8))}}},
+    ):
+        assert decode_presence(encode_presence(payload)) == payload
+    packed = encode_presence({"counties": {"King": {"1": 1}}})
+    with pytest.raises(ValueError, match="trailing"):
+        decode_presence(packed + b"\0")
+    with pytest.raises(ValueError):
+        decode_presence(b"XYZ" + packed[3:])
@@ -0,0 +1,76 @@
+"""Unit tests for taxon_tree.TaxonTree — array-backed LCA.
+
+Small hand-built lineages for the scalar API and a randomized cross-check
+against naive parent-walking.
+"""
+
+import random
+
+import pytest
+
+from taxon_tree import TaxonTree, parse_ancestry
+
+# Agapostemon fixture from the RCN-05 compute_lca test, plus a disjoint root.
+_LINEAGES = [
+    (270393, [48460, 1, 47120, 372739, 630955, 52747, 50086, 606634]),            # angelicus
+    (1581468, [48460, 1, 47120, 372739, 630955, 52747, 50086, 606634, 1581466]),  # texanus
+    (52775, [48460, 1, 47120, 372739, 630955]),                                   # Apidae
+    (99, [7]),                                                                    # unrelated root
+]
+
+
+@pytest.fixture
+def tree():
+    return TaxonTree.from_lineages(_LINEAGES)
+
+
+def test_parse_ancestry_skips_empty_and_junk_segments():
+    assert parse_ancestry("48460/1//47120/...") == [48460, 1, 47120]
+    assert parse_ancestry(None) == []
+
+
+def test_implicit_ancestors_become_nodes(tree):
+    assert 606634 in tree and 7 in tree
+    assert 12345 not in tree
+    assert tree.lca(1581468, 1581466) == 1581466
+    assert tree.lca(48460, 7) is None
+
+
+def test_lca(tree):
+    assert tree.lca(270393, 1581468) == 606634
+    assert tree.lca(270393, 52775) == 630955
+    assert tree.lca(606634, 1581468) == 606634
+    assert tree.lca(270393, 270393) == 270393
+    assert tree.lca(270393, 99) is None      # disjoint roots
+    assert tree.lca(270393, 12345) is None   # unknown id
+
+
+def test_matches_naive_walk_on_random_tree():
+    rng = random.Random(76)
+    n = 2000
+    parent = {0: -1}
+    for i in range(1, n):
+        parent[i] = rng.randrange(i)
+    ids = rng.sample(range(1, 10**7), n)  # unsorted, sparse taxon_ids
+    t = TaxonTree([ids[i] for i in range(n)], [ids[parent[i]] if parent[i] >= 0 else -1 for i in range(n)])
+
+    def lineage(x):
+        out = [x]
+        while parent[x] >= 0:
+            x = parent[x]
+            out.append(x)
+        return out
+
+    for _ in range(500):
+        a, b = rng.randrange(n), rng.randrange(n)
+        on_a = set(lineage(a))
+        expected = next(x for x in lineage(b) if x in on_a)
+        assert t.lca(ids[a], ids[b]) == ids[expected]
+
+
+def test_cycle_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        TaxonTree([1, 2, 3], [3, 1, 2])
+    with pytest.raises(ValueError, match="own parent"):
+        TaxonTree([1], [1])
+
@@ -39,7 +39,8 @@
  * place (the repo's public/data, not the export). So this step replaces
  * _site/data wholesale: the hashed runtime binaries, the stable-URL dirs pages
  * reference in place (feeds/, species-maps/, place-maps/ — e.g.
- * /data/species-maps/<slug>.svg, the Atom feed), and manifest.json.
+ * /data/species-maps/<slug>.svg, the Atom feed), the occurrences.db delta-patch
+ * chain (db-patches/index.json + its patches, data/db_patch.py), and manifest.json.
  * A missing stable dir is a warning, not an error — `npm run pull-published`
  * historically fetched feeds/ only, and a dev build without the map SVGs is
  * usable.
@@ -216,7 +217,7 @@ try {
   console.warn(`! collector_pages: not derived (${err.message}) — search will show people without links`);
 }
 
-const STABLE_DIRS = ['feeds', 'species-maps', 'place-maps'];
+const STABLE_DIRS = ['feeds', 'species-maps', 'place-maps', 'db-patches'];
 for (const dir of STABLE_DIRS) {
   const src = join(dataDir, dir);
   if (!existsSync(src)) {
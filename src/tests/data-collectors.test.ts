@@ -3,11 +3,12 @@
 // Phase 171 Plan 02 — loader-contract assertion: collectorEventPages Array.
 
 import { describe, test, expect, beforeAll } from 'vitest';
-import { readFileSync } from 'node:fs';
-import { resolve, dirname } from 'node:path';
+import { readFileSync, writeFileSync, mkdirSync, mkdtempSync } from 'node:fs';
+import { tmpdir } from 'node:os';
+import { resolve, dirname, join } from 'node:path';
 import { fileURLToPath } from 'node:url';
 // @ts-expect-error -- _data/*.js is plain ESM consumed by Eleventy; no .d.ts
-import collectors from '../../_data/collectors.js';
+import collectors, { loadShardedEventPages } from '../../_data/collectors.js';
 
 const ROOT = resolve(dirname(fileURLToPath(import.meta.url)), '../..');
 
@@ -329,3 +330,35 @@ describe('Phase 172 — accomplishment fields (ACCOM-01..04)', () => {
     expect(hasMultiGenus, 'at least one fixture entry must have multiple genus groups').toBe(true);
   });
 });
+
+// ---------------------------------------------------------------------------
+// Sharded collector event pages (EVENT_PAGES_LAYOUT=sharded): the index + per-collector
+// files must yield exactly the flat collector_event_pages.json descriptors.
+// ---------------------------------------------------------------------------
+
+describe('loadShardedEventPages', () => {
+  test('rebuilds the flat descriptors from the index and per-collector files', () => {
+    const flat: any[] = JSON.parse(
+      readFileSync(resolve(ROOT, 'src/tests/fixtures/collector_event_pages.fixture.json'), 'utf-8'),
+    );
+    // Shard the fixture the way collectors_events_export.py does.
+    const dir = mkdtempSync(join(tmpdir(), 'event-pages-'));
+    mkdirSync(join(dir, 'collector-event-pages'));
+    const byLogin = new Map<string, any[]>();
+    for (const page of flat) {
+      if (!byLogin.has(page.login)) byLogin.set(page.login, []);
+      byLogin.get(page.login)!.push(page);
+    }
+    const index = { format: 1, dir: 'collector-event-pages', collectors: [] as any[] };
+    [...byLogin.values()].forEach((pages, i) => {
+      const file = `${String(i).padStart(5, '0')}.json`;
+      writeFileSync(join(dir, 'collector-event-pages', file), JSON.stringify(pages.map((p) => p.events)));
+      index.collectors.push({ login: pages[0].login, total_pages: pages[0].total_pages, file });
+    });
+    const indexPath = join(dir, 'collector_event_pages.index.json');
+    writeFileSync(indexPath, JSON.stringify(index));
+
+    const sharded = loadShardedEventPages(indexPath);
+    expect(sharded.map((p: any) => ({ ...p }))).toEqual(flat);
+  });
+});